@@ -8,8 +8,11 @@ from sqlalchemy import engine_from_config, pool
 
 from job_finder.db.models.base import Base  # noqa: F401
 from job_finder.db.models.company import Company  # noqa: F401
+from job_finder.db.models.fx_rate import FxRate  # noqa: F401
+from job_finder.db.models.ingest_generation import IngestGeneration  # noqa: F401
 from job_finder.db.models.job import Job  # noqa: F401
 from job_finder.db.models.job_benefit import JobBenefit  # noqa: F401
+from job_finder.db.models.job_facet import JobFacet  # noqa: F401
 from job_finder.db.models.job_skill import JobSkill  # noqa: F401
 from job_finder.db.models.scraping_log import ScrapingLog  # noqa: F401
 from job_finder.db.models.skill import Skill  # noqa: F401
@@ -26,6 +29,13 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Objetos só de Postgres criados por migração manual (fora do modelo ORM)
+UNMAPPED_OBJECTS = {("column", "search_vector"), ("index", "ix_jobs_search_vector")}
+
+
+def include_object(obj, name, type_, reflected, compare_to):  # type: ignore[no-untyped-def]
+    return not (reflected and compare_to is None and (type_, name) in UNMAPPED_OBJECTS)
+
 
 def run_migrations_offline() -> None:
     context.configure(
@@ -34,6 +44,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -50,6 +61,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
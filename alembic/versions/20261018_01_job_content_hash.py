@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_01_job_content_hash"
+down_revision = "20251028_01_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Coluna nullable: linhas antigas ficam NULL até o backfill
+    # (python -m job_finder.scripts.backfill content-hash)
+    # A leitura do dedupe por fonte usa `uq_jobs_source_external`; um índice cobrindo
+    # `content_hash` só pouparia o heap fetch e custaria escrita em toda ingestão
+    op.add_column("jobs", sa.Column("content_hash", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "content_hash")
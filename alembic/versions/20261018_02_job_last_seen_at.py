@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_02_job_last_seen_at"
+down_revision = "20261018_01_job_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable e sem default: só metadado, não reescreve a tabela
+    op.add_column("jobs", sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "last_seen_at")
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_03_job_search_vector"
+down_revision = "20261018_02_job_last_seen_at"
+branch_labels = None
+depends_on = None
+
+# Mesma expressão de job_finder.db.search.SEARCH_VECTOR_SQL (congelada aqui)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description_text, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Coluna gerada STORED: o ADD COLUMN reescreve `jobs` uma vez (rodar em janela)
+    op.execute(
+        f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_search_vector",
+            "jobs",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_search_vector",
+            table_name="jobs",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_04_filter_indexes"
+down_revision = "20261018_03_job_search_vector"
+branch_labels = None
+depends_on = None
+
+# (nome, tabela, coluna, using, ops)
+INDEXES = (
+    ("ix_companies_name_trgm", "companies", "name", "gin", "gin_trgm_ops"),
+    ("ix_jobs_location_trgm", "jobs", "location", "gin", "gin_trgm_ops"),
+    ("ix_jobs_location", "jobs", "location", "btree", None),
+)
+# o filtro de senioridade usa `seniority_level` (índice em 20261018_11)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column, using, ops in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using=using,
+                postgresql_ops={column: ops} if ops else {},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, *_ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_05_job_feed_index"
+down_revision = "20261018_04_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ordem do feed + desempate por id: cursor de /jobs vira range scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_feed",
+            "jobs",
+            ["posted_at", "scraped_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_feed", table_name="jobs", postgresql_concurrently=True, if_exists=True
+        )
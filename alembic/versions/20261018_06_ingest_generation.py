@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_06_ingest_generation"
+down_revision = "20261018_05_job_feed_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_generation",
+        sa.Column("id", sa.SmallInteger(), primary_key=True),
+        sa.Column("generation", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute("INSERT INTO ingest_generation (id, generation) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table("ingest_generation")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_07_job_export_index"
+down_revision = "20261018_06_ingest_generation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /jobs/export lê em ordem de (updated_at, id) e retoma a partir da marca d'água
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_updated",
+            "jobs",
+            ["updated_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_updated", table_name="jobs", postgresql_concurrently=True, if_exists=True
+        )
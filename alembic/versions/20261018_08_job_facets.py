@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_08_job_facets"
+down_revision = "20261018_07_job_export_index"
+branch_labels = None
+depends_on = None
+
+
+# Carga inicial (mesma extração de `facet_values`): os deltas da ingestão partem
+# dela, e uma tabela vazia serviria contagens erradas (ou negativas) até um reparo
+_SEED_FACETS = """
+INSERT INTO job_facets (facet, value, count)
+SELECT 'source', source, count(*) FROM jobs GROUP BY source
+UNION ALL
+SELECT 'remote', CASE WHEN remote THEN 'true' ELSE 'false' END, count(*) FROM jobs GROUP BY remote
+UNION ALL
+SELECT 'seniority', seniority, count(*) FROM jobs WHERE seniority <> '' GROUP BY seniority
+UNION ALL
+SELECT 'company', CAST(company_id AS text), count(*)
+FROM jobs WHERE company_id IS NOT NULL GROUP BY company_id
+UNION ALL
+SELECT 'posted_day', CAST(CAST(posted_at AT TIME ZONE 'UTC' AS date) AS text), count(*)
+FROM jobs WHERE posted_at IS NOT NULL GROUP BY 2
+UNION ALL
+SELECT 'skill', s.name, count(*)
+FROM job_skills js JOIN skills s ON s.id = js.skill_id GROUP BY s.name
+"""
+
+
+def upgrade() -> None:
+    # Rollup de /jobs/facets e /stats/*; mantido por deltas da ingestão.
+    # Reparo de deriva: python -m job_finder.scripts.backfill facets
+    op.create_table(
+        "job_facets",
+        sa.Column("facet", sa.String(32), primary_key=True),
+        sa.Column("value", sa.String(255), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_job_facets_top", "job_facets", ["facet", "count"])
+    # escritas em `jobs` esperam o commit: nenhuma vaga fica fora da carga e dos deltas
+    op.execute("LOCK TABLE jobs IN SHARE MODE")
+    op.execute(_SEED_FACETS)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_facets_top", table_name="job_facets")
+    op.drop_table("job_facets")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_09_salary_usd"
+down_revision = "20261018_08_job_facets"
+branch_labels = None
+depends_on = None
+
+SALARY_INDEXES = (
+    ("ix_jobs_salary_min_usd", "salary_min_usd"),
+    ("ix_jobs_salary_max_usd", "salary_max_usd"),
+)
+
+
+def upgrade() -> None:
+    # Cotações locais para normalizar salários em USD; USD entra com 1.
+    # Outras moedas + preenchimento das vagas existentes:
+    #   python -m job_finder.scripts.backfill salary-usd --rates cotacoes.csv
+    fx_rates = op.create_table(
+        "fx_rates",
+        sa.Column("currency", sa.String(3), primary_key=True),
+        sa.Column("usd_rate", sa.Numeric(18, 8), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.bulk_insert(fx_rates, [{"currency": "USD", "usd_rate": 1}])
+    # colunas NULL sem default: só catálogo, sem reescrever a tabela
+    op.add_column("jobs", sa.Column("salary_min_usd", sa.Numeric(12, 2), nullable=True))
+    op.add_column("jobs", sa.Column("salary_max_usd", sa.Numeric(12, 2), nullable=True))
+    with op.get_context().autocommit_block():
+        for name, column in SALARY_INDEXES:
+            op.create_index(
+                name, "jobs", [column], postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in SALARY_INDEXES:
+            op.drop_index(name, table_name="jobs", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("jobs", "salary_max_usd")
+    op.drop_column("jobs", "salary_min_usd")
+    op.drop_table("fx_rates")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_10_job_feed_filter_indexes"
+down_revision = "20261018_09_salary_usd"
+branch_labels = None
+depends_on = None
+
+# (nome, colunas, predicado parcial). Mesma ordem de `ix_jobs_feed` depois da
+# igualdade: o feed filtrado vira range scan com LIMIT, sem sort sobre o filtro todo.
+# Planos verificados em tests/test_query_plans.py (TEST_POSTGRES_URL).
+INDEXES = (
+    ("ix_jobs_source_feed", ["source", "posted_at", "scraped_at", "id"], None),
+    ("ix_jobs_company_feed", ["company_id", "posted_at", "scraped_at", "id"], None),
+    ("ix_jobs_remote_feed", ["posted_at", "scraped_at", "id"], "remote IS true"),
+)
+# Prefixos de índices existentes (`ix_jobs_feed`; `uq_jobs_source_external`): só custam
+# escrita na ingestão. `ix_jobs_source_external_hash` pode existir de uma versão anterior
+# de 20261018_01.
+REDUNDANT = ("ix_jobs_posted_at", "ix_jobs_source_external_hash")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                "jobs",
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name in REDUNDANT:
+            op.drop_index(name, table_name="jobs", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_posted_at",
+            "jobs",
+            ["posted_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, *_ in reversed(INDEXES):
+            op.drop_index(name, table_name="jobs", postgresql_concurrently=True, if_exists=True)
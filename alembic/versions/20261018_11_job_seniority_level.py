@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_11_job_seniority_level"
+down_revision = "20261018_10_job_feed_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # `seniority` volta a guardar o valor cru da fonte; o normalizado (filtro e
+    # facetas) fica em `seniority_level`. A faceta contava `seniority`: recomeça
+    # vazia, como a coluna nova, e o preenchimento das vagas existentes aplica os
+    # deltas dela:
+    #   python -m job_finder.scripts.backfill seniority
+    op.add_column("jobs", sa.Column("seniority_level", sa.String(16), nullable=True))
+    op.execute("DELETE FROM job_facets WHERE facet = 'seniority'")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_seniority_level",
+            "jobs",
+            ["seniority_level"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_seniority_level",
+            table_name="jobs",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("jobs", "seniority_level")
+    op.execute("DELETE FROM job_facets WHERE facet = 'seniority'")
+    op.execute(
+        "INSERT INTO job_facets (facet, value, count) "
+        "SELECT 'seniority', seniority, count(*) FROM jobs WHERE seniority <> '' GROUP BY seniority"
+    )
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import sys
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from typing import Any, Final
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from job_finder.obs import metrics as m
+
+# Acima desse OFFSET a paginação legada lê (e descarta) linhas demais: conta como pesada
+HEAVY_OFFSET: Final[int] = 200
+
+# SQLSTATE do Postgres para query cancelada (statement_timeout)
+QUERY_CANCELED: Final[str] = "57014"
+
+# `asyncio.timeout` cancela o próprio `Semaphore.acquire`, que devolve a vaga se o
+# cancelamento chegar junto com ela; antes do 3.11 só há `wait_for` (ver `_wait_shielded`)
+HAS_ASYNCIO_TIMEOUT: Final[bool] = sys.version_info >= (3, 11)
+
+
+class Overloaded(Exception):
+    """Request recusada pelo limitador; vira 503 com `Retry-After`."""
+
+    def __init__(self, pool: str, reason: str, retry_after_secs: float) -> None:
+        super().__init__(f"{pool}: {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after_secs = retry_after_secs
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after_secs)))}
+
+
+class AdmissionGate:
+    """Limite de concorrência de um tipo de request, com fila curta e prazo de espera.
+
+    Até `limit` requests executam ao mesmo tempo; as demais esperam no máximo
+    `max_wait_secs` e, com `max_queue` já esperando, são recusadas na hora. Recusar
+    rápido (503 + Retry-After) mantém a latência de quem entrou em vez de deixar
+    todo mundo preso atrás das queries caras.
+    """
+
+    def __init__(
+        self,
+        pool: str,
+        limit: int,
+        max_wait_secs: float,
+        max_queue: int,
+        statement_timeout_ms: int = 0,
+        retry_after_secs: float = 1.0,
+    ) -> None:
+        self.pool = pool
+        self.limit = max(1, limit)
+        self.max_wait_secs = max_wait_secs
+        self.max_queue = max_queue
+        self.statement_timeout_ms = statement_timeout_ms
+        self.retry_after_secs = retry_after_secs
+        self._sem = asyncio.Semaphore(self.limit)
+        self.waiting = 0
+
+    def _shed(self, reason: str) -> Overloaded:
+        m.API_ADMISSION_SHED.labels(pool=self.pool, reason=reason).inc()
+        return Overloaded(self.pool, reason, self.retry_after_secs)
+
+    async def acquire(self) -> None:
+        """Ocupa uma vaga ou levanta `Overloaded` (fila cheia ou prazo estourado)."""
+        if self._sem.locked() and self.waiting >= self.max_queue:
+            raise self._shed("queue_full")
+        started = time.perf_counter()
+        self.waiting += 1
+        m.API_ADMISSION_QUEUE.labels(pool=self.pool).inc()
+        try:
+            if HAS_ASYNCIO_TIMEOUT:
+                async with asyncio.timeout(self.max_wait_secs):
+                    await self._sem.acquire()
+            else:
+                await self._wait_shielded()
+        except asyncio.TimeoutError:
+            raise self._shed("deadline") from None
+        finally:
+            self.waiting -= 1
+            m.API_ADMISSION_QUEUE.labels(pool=self.pool).dec()
+            m.API_ADMISSION_WAIT_MS.labels(pool=self.pool).observe(
+                (time.perf_counter() - started) * 1000
+            )
+        m.API_ADMISSION_IN_FLIGHT.labels(pool=self.pool).inc()
+
+    async def _wait_shielded(self) -> None:
+        # No 3.10, `wait_for` pode estourar o prazo depois de o acquire já ter tomado a
+        # vaga, que nunca seria devolvida: o acquire roda blindado e, se o prazo (ou um
+        # cancelamento) vencer, é cancelado e devolve a vaga caso tenha chegado a tomá-la.
+        acquire = asyncio.ensure_future(self._sem.acquire())
+        try:
+            await asyncio.wait_for(asyncio.shield(acquire), timeout=self.max_wait_secs)
+        except BaseException:
+            acquire.cancel()
+            acquire.add_done_callback(self._give_back)
+            raise
+
+    def _give_back(self, acquire: asyncio.Task[Any]) -> None:
+        if not acquire.cancelled() and acquire.exception() is None:
+            self._sem.release()
+
+    def release(self) -> None:
+        self._sem.release()
+        m.API_ADMISSION_IN_FLIGHT.labels(pool=self.pool).dec()
+
+    @asynccontextmanager
+    async def slot(self, db: AsyncSession | None = None) -> AsyncIterator[None]:
+        """Vaga no limitador; com `db`, aplica o `statement_timeout` do pool à transação."""
+        await self.acquire()
+        try:
+            if db is not None:
+                await apply_statement_timeout(db, self.statement_timeout_ms)
+            yield
+        except DBAPIError as exc:
+            if is_statement_timeout(exc):
+                raise self._shed("statement_timeout") from exc
+            raise
+        finally:
+            self.release()
+
+
+async def apply_statement_timeout(db: AsyncSession, timeout_ms: int) -> None:
+    """`SET LOCAL statement_timeout` (via `set_config`) na transação da sessão; só Postgres."""
+    bind = db.bind
+    if timeout_ms <= 0 or bind is None or bind.dialect.name != "postgresql":
+        return
+    await db.execute(select(func.set_config("statement_timeout", f"{timeout_ms}ms", True)))
+
+
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED
+
+
+def is_heavy(params: Mapping[str, Any]) -> bool:
+    """Busca textual, OFFSET alto e contagem de total vão para o orçamento pesado."""
+    return bool(
+        params.get("q")
+        or params.get("offset", 0) > HEAVY_OFFSET
+        or params.get("include_total")
+        or params.get("sort") == "relevance"
+    )
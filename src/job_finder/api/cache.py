@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Final, Protocol
+
+import structlog
+from starlette.responses import Response
+
+from job_finder.db.generation import Watermark
+from job_finder.obs import metrics as m
+
+log = structlog.get_logger(__name__)
+
+# Entradas vencidas ainda ficam guardadas por STALE_GRACE x TTL para servir
+# respostas antigas quando o banco falha (stale-if-error)
+STALE_GRACE: Final[int] = 10
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    generation: int
+    stored_at: float
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def response(self, cache_status: str, extra: Mapping[str, str] | None = None) -> Response:
+        headers = {**self.headers, **(extra or {}), "X-Cache": cache_status}
+        return Response(self.body, media_type="application/json", headers=headers)
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            {
+                "generation": self.generation,
+                "stored_at": self.stored_at,
+                "headers": self.headers,
+                "body": self.body.decode("utf-8"),
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def loads(cls, raw: bytes) -> CachedResponse:
+        data = json.loads(raw)
+        return cls(
+            generation=int(data["generation"]),
+            stored_at=float(data["stored_at"]),
+            body=data["body"].encode("utf-8"),
+            headers=dict(data["headers"]),
+        )
+
+
+class SharedBackend(Protocol):
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    async def set(self, key: str, value: CachedResponse, ttl_secs: float) -> None: ...
+
+
+class RedisBackend:
+    """Backend compartilhado entre processos/réplicas (requer `pip install -e .[cache]`).
+
+    Falhas do Redis nunca derrubam a request: viram miss.
+    """
+
+    def __init__(self, url: str, prefix: str = "jobhunter:api:") -> None:
+        import redis.asyncio as redis  # dependência opcional
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> CachedResponse | None:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception:
+            log.warning("api_cache_backend_error", op="get")
+            return None
+        return CachedResponse.loads(raw) if raw else None
+
+    async def set(self, key: str, value: CachedResponse, ttl_secs: float) -> None:
+        try:
+            await self.client.set(self.prefix + key, value.dumps(), px=int(ttl_secs * 1000))
+        except Exception:
+            log.warning("api_cache_backend_error", op="set")
+
+
+def cache_key(path: str, params: Mapping[str, Any]) -> str:
+    """Chave normalizada: parâmetros None fora, strings sem espaços nas pontas, ordem fixa."""
+    norm = {k: v.strip() if isinstance(v, str) else v for k, v in params.items() if v is not None}
+    return path + "?" + json.dumps(norm, sort_keys=True, separators=(",", ":"))
+
+
+class QueryCache:
+    """Cache de respostas por chave de query: LRU + TTL em processo e, opcionalmente,
+    um backend compartilhado (Redis) como segundo nível.
+
+    Uma entrada só vale enquanto a geração de ingestão (`ingest_generation`, que o
+    `DbPipeline` incrementa a cada flush com mudanças) for a mesma de quando ela foi
+    calculada. A geração é relida do banco no máximo a cada `poll_secs` por processo,
+    então uma ingestão aparece na API em até `poll_secs`, com uma query trivial por
+    segundo em vez de uma query completa por request. A mesma leitura alimenta os
+    validadores HTTP (ETag/Last-Modified, ver `job_finder.api.conditional`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load_watermark: Callable[[], Awaitable[Watermark]],
+        max_entries: int = 1024,
+        ttl_secs: float = 60.0,
+        poll_secs: float = 1.0,
+        shared: SharedBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.name = name
+        self.load_watermark = load_watermark
+        self.max_entries = max(1, max_entries)
+        self.ttl_secs = ttl_secs
+        self.poll_secs = poll_secs
+        self.shared = shared
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._watermark: Watermark | None = None
+        self._polled_at = float("-inf")
+
+    async def watermark(self) -> Watermark | None:
+        """Geração atual (relida a cada `poll_secs`); None se o banco nunca respondeu."""
+        now = self._clock()
+        if now - self._polled_at < self.poll_secs:
+            return self._watermark
+        self._polled_at = now
+        try:
+            self._watermark = await self.load_watermark()
+        except Exception:
+            # mantém a última conhecida; o próximo poll tenta de novo
+            log.warning("api_cache_generation_unavailable", cache=self.name)
+        return self._watermark
+
+    async def generation(self) -> int | None:
+        wm = await self.watermark()
+        return wm.generation if wm is not None else None
+
+    async def lookup(self, key: str, generation: int | None) -> CachedResponse | None:
+        if generation is None:
+            m.API_CACHE_MISSES.labels(path=self.name).inc()
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and self._fresh(entry, generation):
+            m.API_CACHE_HITS.labels(path=self.name, tier="local").inc()
+            return entry
+        if self.shared is not None:
+            shared = await self.shared.get(key)
+            if shared is not None and self._fresh(shared, generation):
+                self._put(key, shared)
+                m.API_CACHE_HITS.labels(path=self.name, tier="shared").inc()
+                return shared
+        m.API_CACHE_MISSES.labels(path=self.name).inc()
+        return None
+
+    async def stale(self, key: str) -> CachedResponse | None:
+        """Qualquer versão guardada da chave (para servir quando o banco falha)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.shared is not None:
+            entry = await self.shared.get(key)
+        if entry is not None:
+            m.API_CACHE_STALE.labels(path=self.name).inc()
+        return entry
+
+    async def store(
+        self, key: str, generation: int | None, body: bytes, headers: Mapping[str, str]
+    ) -> None:
+        if generation is None:
+            return
+        entry = CachedResponse(generation, self._clock(), body, dict(headers))
+        self._put(key, entry)
+        if self.shared is not None:
+            await self.shared.set(key, entry, self.ttl_secs * STALE_GRACE)
+
+    def _fresh(self, entry: CachedResponse, generation: int) -> bool:
+        return entry.generation == generation and self._clock() - entry.stored_at < self.ttl_secs
+
+    def _put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.responses import Response
+
+from job_finder.db.generation import Watermark
+from job_finder.obs import metrics as m
+
+
+def make_etag(generation: int, key: str) -> str:
+    """ETag fraca: geração de ingestão + digest da query normalizada (`cache_key`)."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{generation}-{digest}"'
+
+
+def validators(watermark: Watermark, key: str) -> dict[str, str]:
+    """Headers `ETag` e `Last-Modified` de uma resposta calculada na geração dada."""
+    headers = {"ETag": make_etag(watermark.generation, key)}
+    if watermark.updated_at is not None:
+        ts = watermark.updated_at
+        # SQLite devolve datetime sem fuso: o banco grava em UTC
+        ts = ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(ts, usegmt=True)
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], headers: Mapping[str, str]) -> bool:
+    """Avalia `If-None-Match` (prioritário, comparação fraca) e `If-Modified-Since`."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"].removeprefix("W/") in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return parsedate_to_datetime(last_modified) <= since
+
+
+def not_modified(path: str, headers: Mapping[str, str]) -> Response:
+    m.API_NOT_MODIFIED.labels(path=path).inc()
+    return Response(status_code=304, headers=dict(headers))
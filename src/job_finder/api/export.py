@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
+from typing import Any, Final, Literal, Protocol
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Row, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from job_finder.db.models.company import Company
+from job_finder.db.models.job import Job
+from job_finder.obs import metrics as m
+
+ExportFormat = Literal["ndjson", "csv", "parquet"]
+ExportCompression = Literal["none", "gzip"]
+
+MEDIA_TYPES: Final[dict[str, str]] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class JobExport(BaseModel):
+    id: UUID
+    title: str
+    company: str | None = None
+    location: str | None = None
+    remote: bool
+    seniority: str | None = None
+    currency: str | None = None
+    salary_min: float | None = None
+    salary_max: float | None = None
+    posted_at: datetime | None = None
+    scraped_at: datetime
+    updated_at: datetime
+    source: str
+    source_url: str
+
+
+EXPORT_FIELDS: Final[tuple[str, ...]] = tuple(JobExport.model_fields)
+
+# Mesma projeção do JobExport; a empresa vem no JOIN
+EXPORT_COLUMNS = tuple(
+    Company.name.label("company") if name == "company" else getattr(Job, name)
+    for name in EXPORT_FIELDS
+)
+
+
+def export_statement(
+    conditions: Sequence[ColumnElement[bool]],
+    since: datetime | None = None,
+    since_id: UUID | None = None,
+    overlap: timedelta = timedelta(0),
+) -> Select[Any]:
+    """Vagas filtradas em ordem de `(updated_at, id)` — a marca d'água do export.
+
+    Cada linha exportada traz `updated_at` e `id`; para retomar um export interrompido
+    (ou buscar só o que mudou), o cliente passa os da última linha recebida como
+    `since`/`since_id`. Sem `since_id`, entram as vagas com `updated_at > since`.
+
+    `updated_at` é o `now()` do início da transação que gravou a vaga, não a ordem de
+    commit: uma escrita que commita depois de o cliente ler pode ficar com marca
+    anterior à que ele já tem. Por isso a marca d'água recua `overlap` e a janela é
+    relida: a entrega é at-least-once (vagas da janela podem repetir; o consumidor
+    deduplica por `id`, ficando com o maior `updated_at`), e nenhuma alteração se
+    perde se a transação que a gravou durou menos que `overlap`.
+    """
+    J = Job
+    stmt = select(*EXPORT_COLUMNS).outerjoin(Company, Company.id == J.company_id).where(*conditions)
+    if since is not None:
+        since = since - overlap
+    if since is not None and since_id is not None:
+        stmt = stmt.where(tuple_(J.updated_at, J.id) > (since, since_id))
+    elif since is not None:
+        stmt = stmt.where(J.updated_at > since)
+    return stmt.order_by(J.updated_at, J.id)
+
+
+class Encoder(Protocol):
+    def header(self) -> bytes: ...
+
+    def encode(self, rows: Sequence[Row[Any]]) -> bytes: ...
+
+    def close(self) -> bytes: ...
+
+
+class NdjsonEncoder:
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Row[Any]]) -> bytes:
+        return b"".join(
+            JobExport.model_validate(r, from_attributes=True).model_dump_json().encode() + b"\n"
+            for r in rows
+        )
+
+    def close(self) -> bytes:
+        return b""
+
+
+class CsvEncoder:
+    def __init__(self) -> None:
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator="\n")
+
+    def header(self) -> bytes:
+        self._writer.writerow(EXPORT_FIELDS)
+        return self._take()
+
+    def encode(self, rows: Sequence[Row[Any]]) -> bytes:
+        for r in rows:
+            self._writer.writerow(_csv_value(getattr(r, name)) for name in EXPORT_FIELDS)
+        return self._take()
+
+    def close(self) -> bytes:
+        return b""
+
+    def _take(self) -> bytes:
+        out = self._buf.getvalue().encode("utf-8")
+        self._buf.seek(0)
+        self._buf.truncate()
+        return out
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino do ParquetWriter: acumula o que foi escrito até o próximo `take()`.
+
+    `tell()` conta o total já escrito — o writer usa essas posições no rodapé.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def take(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+class ParquetEncoder:
+    """Um row group por lote do cursor (requer `pip install -e .[export]`)."""
+
+    def __init__(self, compression: ExportCompression = "none") -> None:
+        import pyarrow as pa  # dependência opcional
+        import pyarrow.parquet as pq
+
+        ts = pa.timestamp("us", tz="UTC")
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("title", pa.string()),
+                ("company", pa.string()),
+                ("location", pa.string()),
+                ("remote", pa.bool_()),
+                ("seniority", pa.string()),
+                ("currency", pa.string()),
+                ("salary_min", pa.float64()),
+                ("salary_max", pa.float64()),
+                ("posted_at", ts),
+                ("scraped_at", ts),
+                ("updated_at", ts),
+                ("source", pa.string()),
+                ("source_url", pa.string()),
+            ]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(
+            self._sink,
+            self._schema,
+            compression="gzip" if compression == "gzip" else "none",
+        )
+
+    def header(self) -> bytes:
+        return self._sink.take()
+
+    def encode(self, rows: Sequence[Row[Any]]) -> bytes:
+        columns: dict[str, list[Any]] = {name: [] for name in EXPORT_FIELDS}
+        for r in rows:
+            for name in EXPORT_FIELDS:
+                value = getattr(r, name)
+                if name == "id":
+                    value = str(value)
+                elif name in ("salary_min", "salary_max") and value is not None:
+                    value = float(value)
+                columns[name].append(value)
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=len(rows))
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.take()
+
+
+def make_encoder(fmt: ExportFormat, compression: ExportCompression) -> Encoder:
+    """Encoder do formato pedido; ImportError se o formato depende de um extra ausente."""
+    if fmt == "parquet":
+        return ParquetEncoder(compression)
+    if fmt == "csv":
+        return CsvEncoder()
+    return NdjsonEncoder()
+
+
+async def stream_export(
+    db: AsyncSession,
+    stmt: Select[Any],
+    encoder: Encoder,
+    *,
+    fmt: ExportFormat,
+    batch_rows: int,
+    gzip: bool,
+) -> AsyncIterator[bytes]:
+    """Corpo do `/jobs/export`, lote a lote de um cursor do servidor (`yield_per`).
+
+    A memória fica limitada a um lote (`batch_rows` linhas) seja qual for o tamanho
+    do resultado. Fecha a sessão ao terminar.
+    """
+    gz = zlib.compressobj(wbits=31) if gzip else None  # 31: formato gzip
+
+    def out(data: bytes) -> bytes:
+        return gz.compress(data) if gz is not None else data
+
+    exported = 0
+    try:
+        if head := out(encoder.header()):
+            yield head
+        result = await db.stream(stmt.execution_options(yield_per=batch_rows))
+        async for rows in result.partitions():
+            exported += len(rows)
+            if chunk := out(encoder.encode(rows)):
+                yield chunk
+        tail = out(encoder.close())
+        if gz is not None:
+            tail += gz.flush()
+        if tail:
+            yield tail
+    finally:
+        m.API_EXPORT_ROWS.labels(format=fmt).inc(exported)
+        await db.close()
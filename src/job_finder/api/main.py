@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Annotated, Any, Literal
+from uuid import UUID
 
-from fastapi import FastAPI, Query
+import structlog
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from prometheus_client import (
     CONTENT_TYPE_LATEST,
     CollectorRegistry,
@@ -12,36 +17,182 @@ from prometheus_client import (
     generate_latest,
     multiprocess,
 )
-from pydantic import BaseModel
-from sqlalchemy import and_, or_, select
-from sqlalchemy.orm import Session
-from starlette.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import ColumnElement, Row, Select, SQLColumnExpression, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
 
+from job_finder.api.admission import (
+    AdmissionGate,
+    Overloaded,
+    apply_statement_timeout,
+    is_heavy,
+)
+from job_finder.api.cache import QueryCache, RedisBackend, cache_key
+from job_finder.api.conditional import is_not_modified, not_modified, validators
+from job_finder.api.export import (
+    MEDIA_TYPES,
+    ExportCompression,
+    ExportFormat,
+    export_statement,
+    make_encoder,
+    stream_export,
+)
+from job_finder.api.pagination import (
+    FEED_ORDER,
+    MAX_OFFSET,
+    FeedKey,
+    InvalidCursor,
+    feed_statement,
+)
+from job_finder.api.totals import Total, count_statement, estimate_rows
+from job_finder.db.facets import FACETS, Facet, top_facets_statement
+from job_finder.db.generation import Watermark, current_watermark
 from job_finder.db.models.company import Company
 from job_finder.db.models.job import Job
-from job_finder.db.session import SessionLocal
+from job_finder.db.search import fts_match, fts_rank, substring_match, supports_fts
+from job_finder.db.session import get_async_session, read_session
+from job_finder.scraping.schemas import Seniority, normalize_seniority
+from job_finder.settings import settings
 
-app = FastAPI(title="JobHunter API", version="0.1.0")
+log = structlog.get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # remove os gauges "live" deste worker; contadores ficam para a agregação
+        multiprocess.mark_process_dead(os.getpid())  # type: ignore[no-untyped-call]
+
+
+app = FastAPI(title="JobHunter API", version="0.1.0", lifespan=lifespan)
 
 REQS = Counter("api_requests_total", "Total API requests", ["path"])
 LAT = Histogram("api_latency_ms", "API latency (ms)", buckets=(10, 25, 50, 100, 250, 500, 1000))
 
 
 class JobOut(BaseModel):
-    id: str
+    id: UUID
     title: str
     company: str | None = None
     location: str | None = None
     remote: bool
     salary_min: float | None = None
     salary_max: float | None = None
+    salary_min_usd: float | None = None
+    salary_max_usd: float | None = None
     posted_at: datetime | None = None
     source: str
     source_url: str
 
 
+JOBS_ADAPTER = TypeAdapter(list[JobOut])
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+    # nome legível (faceta `company`, cujo valor é o id da empresa)
+    label: str | None = None
+
+
+FACETS_ADAPTER = TypeAdapter(dict[str, list[FacetCount]])
+STATS_ADAPTER = TypeAdapter(list[FacetCount])
+
+
+async def _load_watermark() -> Watermark:
+    async with await read_session() as db:
+        return await db.run_sync(current_watermark)
+
+
+def _build_cache(name: str) -> QueryCache | None:
+    if not settings.api_cache_enabled:
+        return None
+    shared = RedisBackend(settings.api_cache_redis_url) if settings.api_cache_redis_url else None
+    return QueryCache(
+        name,
+        _load_watermark,
+        max_entries=settings.api_cache_max_entries,
+        ttl_secs=settings.api_cache_ttl_secs,
+        poll_secs=settings.api_generation_poll_secs,
+        shared=shared,
+    )
+
+
+query_cache = _build_cache("/jobs")
+# contagens exatas do include_total, por filtro normalizado
+total_cache = _build_cache("/jobs:total")
+
+
+def _build_gate(pool: str, limit: int, statement_timeout_ms: int) -> AdmissionGate:
+    return AdmissionGate(
+        pool,
+        limit,
+        max_wait_secs=settings.api_queue_timeout_ms / 1000,
+        max_queue=settings.api_max_queue,
+        statement_timeout_ms=statement_timeout_ms,
+        retry_after_secs=settings.api_retry_after_secs,
+    )
+
+
+# orçamentos separados: buscas caras não ocupam as vagas das leituras baratas
+light_gate = _build_gate(
+    "light", settings.api_light_concurrency, settings.api_light_statement_timeout_ms
+)
+heavy_gate = _build_gate(
+    "heavy", settings.api_heavy_concurrency, settings.api_heavy_statement_timeout_ms
+)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded) -> Response:
+    return JSONResponse(
+        {"detail": "servidor sobrecarregado, tente novamente"},
+        status_code=503,
+        headers=exc.headers,
+    )
+
+
+async def _cached_watermark() -> Watermark | None:
+    """Marca d'água de ingestão do poll do cache (sem query por request); None sem cache."""
+    if query_cache is None:
+        return None
+    return await query_cache.watermark()
+
+
+def _revalidate(
+    request: Request, path: str, key: str, watermark: Watermark
+) -> tuple[dict[str, str], Response | None]:
+    """Validadores da resposta e, se o cliente já tem essa versão, o 304."""
+    valid = validators(watermark, key)
+    if is_not_modified(request.headers, valid):
+        return valid, not_modified(path, valid)
+    return valid, None
+
+
+# Projeção do `/jobs`: colunas de `JobOut` (+ `scraped_at`, usado no cursor)
+JOB_OUT_COLUMNS: tuple[SQLColumnExpression[Any], ...] = (
+    Job.id,
+    Job.title,
+    Company.name.label("company"),
+    Job.location,
+    Job.remote,
+    Job.salary_min,
+    Job.salary_max,
+    Job.salary_min_usd,
+    Job.salary_max_usd,
+    Job.posted_at,
+    Job.scraped_at,
+    Job.source,
+    Job.source_url,
+)
+
+
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     REQS.labels("/health").inc()
     return {"status": "ok"}
 
@@ -49,72 +200,437 @@ def health() -> dict[str, str]:
 @app.get("/metrics")
 def metrics() -> Response:
     if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # vários workers: agrega os arquivos de métricas de todos os processos
         registry = CollectorRegistry()
-        mp_collect = getattr(multiprocess, "MultiProcessCollector", None)
-        if mp_collect is not None:
-            mp_collect(registry)
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        payload = generate_latest(registry)
     else:
         payload = generate_latest()
     return Response(payload, media_type=CONTENT_TYPE_LATEST)
 
 
-@app.get("/jobs", response_model=list[JobOut])
-def list_jobs(
+def _seniority_condition(seniority: str, exact: bool) -> ColumnElement[bool]:
+    level = normalize_seniority(seniority)
+    if level is not None:
+        return Job.seniority_level == level
+    if exact:
+        allowed = ", ".join(s.value for s in Seniority)
+        raise HTTPException(422, f"seniority inválida; use um de: {allowed}")
+    return Job.seniority.ilike(f"%{seniority}%")
+
+
+def job_conditions(
+    *,
     q: str | None = None,
+    fts: bool = False,
+    source: str | None = None,
     company: str | None = None,
     location: str | None = None,
     remote: bool | None = None,
     seniority: str | None = None,
     min_salary: float | None = None,
     max_salary: float | None = None,
+    match: str = "contains",
+) -> list[ColumnElement[bool]]:
+    """Filtros do `/jobs`.
+
+    `match="contains"` usa ILIKE '%x%' (índices trigram em `companies.name` e
+    `jobs.location`); `match="exact"` compara por igualdade (btree). A senioridade é
+    sempre normalizada para `Seniority` e, quando reconhecida, filtrada por igualdade.
+    """
+    J = Job
+    exact = match == "exact"
+    conditions: list[ColumnElement[bool]] = []
+    if q:
+        conditions.append(fts_match(q) if fts else substring_match(q))
+    if source:
+        conditions.append(J.source == source)
+    if company:
+        name = Company.name == company if exact else Company.name.ilike(f"%{company}%")
+        conditions.append(J.company_id.in_(select(Company.id).where(name)))
+    if location:
+        conditions.append(J.location == location if exact else J.location.ilike(f"%{location}%"))
+    if remote is not None:
+        conditions.append(J.remote.is_(remote))
+    if seniority:
+        conditions.append(_seniority_condition(seniority, exact))
+    # salário anual em USD (colunas normalizadas na ingestão, com índice btree)
+    if min_salary is not None:
+        conditions.append(J.salary_min_usd >= min_salary)
+    if max_salary is not None:
+        conditions.append(J.salary_max_usd <= max_salary)
+    return conditions
+
+
+def filter_conditions(
+    *, fts_available: bool, q_mode: str, **filters: Any
+) -> tuple[list[ColumnElement[bool]], bool]:
+    """Condições dos filtros comuns (`job_filters`) e se a busca textual usa FTS."""
+    # sem Postgres (ex.: SQLite nos testes) não há tsvector: cai para substring
+    fts = bool(filters.get("q")) and q_mode == "fts" and fts_available
+    return job_conditions(fts=fts, **filters), fts
+
+
+def jobs_query(
+    *,
+    fts_available: bool,
+    sort: str,
+    limit: int,
+    offset: int,
+    after: FeedKey | None,
+    **filters: Any,
+) -> tuple[Select[Any], bool]:
+    """Monta a consulta do `/jobs`; devolve o statement e se ele é ordenado por relevância."""
+    J = Job
+    conditions, fts = filter_conditions(fts_available=fts_available, **filters)
+
+    # só as colunas do JobOut (sem descrições/TOAST) e a empresa no mesmo JOIN
+    stmt = (
+        select(*JOB_OUT_COLUMNS).outerjoin(Company, Company.id == J.company_id).where(*conditions)
+    )
+    ranked = fts and sort == "relevance"
+    if ranked:
+        if after is not None:
+            raise HTTPException(400, "cursor não suportado com sort=relevance")
+        stmt = stmt.order_by(fts_rank(filters["q"]).desc(), *FEED_ORDER)
+        return stmt.limit(limit).offset(offset), True
+    if after is not None or offset == 0:
+        return feed_statement(stmt, limit, after), False
+    return stmt.order_by(*FEED_ORDER).limit(limit).offset(offset), False
+
+
+def decode_cursor(cursor: str | None) -> FeedKey | None:
+    try:
+        return FeedKey.decode(cursor) if cursor else None
+    except InvalidCursor as exc:
+        raise HTTPException(400, str(exc)) from exc
+
+
+def render_jobs(rows: Sequence[Row[Any]], limit: int, ranked: bool) -> tuple[bytes, dict[str, str]]:
+    """Corpo JSON e headers (X-Next-Cursor) de uma página do `/jobs`."""
+    headers: dict[str, str] = {}
+    if not ranked and len(rows) == limit:
+        headers["X-Next-Cursor"] = FeedKey.of(rows[-1]).encode()
+    body = JOBS_ADAPTER.dump_json([JobOut.model_validate(r, from_attributes=True) for r in rows])
+    return body, headers
+
+
+async def _job_total(db: AsyncSession, generation: int | None, **filters: Any) -> Total:
+    """Total do filtro: exato se o planner estima até `api_exact_count_max` linhas
+    (e guardado por geração em `total_cache`), senão a própria estimativa.
+    """
+    key = cache_key("/jobs:total", filters)
+    if total_cache is not None:
+        cached = await total_cache.lookup(key, generation)
+        if cached is not None:
+            return Total(int(cached.body), exact=True)
+    conditions, _ = filter_conditions(fts_available=supports_fts(db), **filters)
+    estimate = await estimate_rows(db, conditions)
+    if estimate is not None and estimate > settings.api_exact_count_max:
+        return Total(estimate, exact=False)
+    count = await db.scalar(count_statement(conditions)) or 0
+    if total_cache is not None:
+        await total_cache.store(key, generation, str(count).encode(), {})
+    return Total(count, exact=True)
+
+
+async def _fetch_jobs(
+    db: AsyncSession,
+    *,
+    cursor: str | None,
+    include_total: bool = False,
+    generation: int | None = None,
+    **params: Any,
+) -> tuple[bytes, dict[str, str]]:
+    """Executa a consulta do `/jobs`; devolve o corpo JSON e os headers da resposta."""
+    after = decode_cursor(cursor)
+    stmt, ranked = jobs_query(fts_available=supports_fts(db), after=after, **params)
+    rows = (await db.execute(stmt)).all()
+    body, headers = render_jobs(rows, params["limit"], ranked)
+    if include_total:
+        filters = {k: v for k, v in params.items() if k not in ("sort", "limit", "offset")}
+        total = await _job_total(db, generation, **filters)
+        headers.update(total.headers())
+    return body, headers
+
+
+def job_filters(
+    q: str | None = None,
+    q_mode: Literal["fts", "substring"] = Query(
+        "fts", description="fts: busca textual indexada; substring: ILIKE exato (lento)"
+    ),
+    source: str | None = Query(None, description="Fonte, por igualdade (ex.: remoteok)"),
+    company: str | None = None,
+    location: str | None = None,
+    remote: bool | None = None,
+    seniority: str | None = None,
+    min_salary: float | None = Query(None, description="Salário mínimo anual em USD"),
+    max_salary: float | None = Query(None, description="Salário máximo anual em USD"),
+    match: Literal["contains", "exact"] = Query(
+        "contains",
+        description="exact: company/location/seniority por igualdade (índices btree)",
+    ),
+) -> dict[str, Any]:
+    """Filtros comuns do `/jobs` e do `/jobs/export` (dependência FastAPI)."""
+    return dict(
+        q=q,
+        q_mode=q_mode,
+        source=source,
+        company=company,
+        location=location,
+        remote=remote,
+        seniority=normalize_seniority(seniority) or seniority,
+        min_salary=min_salary,
+        max_salary=max_salary,
+        match=match,
+    )
+
+
+JobFilters = Annotated[dict[str, Any], Depends(job_filters)]
+
+
+@app.get("/jobs", response_model=list[JobOut])
+async def list_jobs(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_session)],
+    filters: JobFilters,
+    sort: Literal["recent", "relevance"] = Query(
+        "recent", description="relevance ordena por ts_rank (só com q_mode=fts)"
+    ),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-) -> list[JobOut]:
+    offset: int = Query(0, ge=0, le=MAX_OFFSET, description="Legado: prefira `cursor`"),
+    cursor: str | None = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    include_total: bool = Query(
+        False,
+        description="X-Total-Count: exato para resultados pequenos, estimado (planner) "
+        "para grandes; X-Total-Count-Exact diz qual",
+    ),
+) -> Response:
     REQS.labels("/jobs").inc()
     with LAT.time():
-        db: Session = SessionLocal()
+        params = dict(
+            filters,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        key = cache_key("/jobs", params)
+        gate = heavy_gate if is_heavy(params) else light_gate
+        # polls repetidos sem ingestão nova: 304/HIT antes de qualquer query de vagas.
+        # Sem a marca d'água do cache, até a leitura dela no banco espera a admissão.
+        watermark = await _cached_watermark()
+        if watermark is not None:
+            early = await _jobs_shortcut(request, key, watermark)
+            if early is not None:
+                return early
         try:
-            J = Job
-            conditions = []
-            if q:
-                conditions.append(or_(J.title.ilike(f"%{q}%"), J.description_text.ilike(f"%{q}%")))
-            if company:
-                sub = select(Company.id).where(Company.name.ilike(f"%{company}%"))
-                conditions.append(J.company_id.in_(sub))
-            if location:
-                conditions.append(J.location.ilike(f"%{location}%"))
-            if remote is not None:
-                conditions.append(J.remote.is_(remote))
-            if seniority:
-                conditions.append(J.seniority.ilike(f"%{seniority}%"))
-            if min_salary is not None:
-                conditions.append(J.salary_min >= min_salary)
-            if max_salary is not None:
-                conditions.append(J.salary_max <= max_salary)
-
-            stmt = select(J).where(and_(*conditions)) if conditions else select(J)
-            stmt = (
-                stmt.order_by(J.posted_at.desc().nullslast(), J.scraped_at.desc())
-                .limit(limit)
-                .offset(offset)
-            )
-            rows = db.execute(stmt).scalars().all()
-            out = []
-            for r in rows:
-                out.append(
-                    JobOut(
-                        id=str(r.id),
-                        title=r.title,
-                        company=getattr(r.company, "name", None),
-                        location=r.location,
-                        remote=r.remote,
-                        salary_min=float(r.salary_min) if r.salary_min is not None else None,
-                        salary_max=float(r.salary_max) if r.salary_max is not None else None,
-                        posted_at=r.posted_at,
-                        source=r.source,
-                        source_url=r.source_url,
-                    )
-                )
-            return out
+            async with gate.slot(db):
+                if watermark is None:
+                    watermark = await db.run_sync(current_watermark)
+                    early = await _jobs_shortcut(request, key, watermark)
+                    if early is not None:
+                        return early
+                body, headers = await _fetch_jobs(db, generation=watermark.generation, **params)
+        except (SQLAlchemyError, Overloaded):
+            # banco fora ou request recusada pelo limitador: a última versão serve
+            stale = await query_cache.stale(key) if query_cache is not None else None
+            if stale is None:
+                raise
+            log.warning("api_cache_served_stale", path="/jobs")
+            return stale.response("STALE")
+        valid = validators(watermark, key)
+        if query_cache is None:
+            return Response(body, media_type="application/json", headers={**headers, **valid})
+        await query_cache.store(key, watermark.generation, body, headers)
+        headers = {**headers, **valid, "X-Cache": "MISS"}
+        return Response(body, media_type="application/json", headers=headers)
+
+
+async def _jobs_shortcut(request: Request, key: str, watermark: Watermark) -> Response | None:
+    """304 (o cliente já tem a versão) ou HIT do cache: respostas sem query de vagas."""
+    valid, fresh = _revalidate(request, "/jobs", key, watermark)
+    if fresh is not None:
+        return fresh
+    if query_cache is not None:
+        cached = await query_cache.lookup(key, watermark.generation)
+        if cached is not None:
+            return cached.response("HIT", valid)
+    return None
+
+
+class _ExportLease:
+    """Sessão e vaga pesada de um export, liberadas uma única vez: no fim do streaming
+    ou, se o corpo nunca chegou a ser lido (cliente que desconecta ou envio que falha
+    antes do primeiro chunk), no fim da resposta (`_ExportResponse`)."""
+
+    def __init__(self, db: AsyncSession, gate: AdmissionGate) -> None:
+        self.db = db
+        self.gate = gate
+        self.released = False
+
+    async def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self.gate.release()
+        await self.db.close()
+
+
+class _ExportResponse(StreamingResponse):
+    def __init__(self, body: AsyncIterator[bytes], lease: _ExportLease, **kwargs: Any) -> None:
+        super().__init__(body, **kwargs)
+        self.lease = lease
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
         finally:
-            db.close()
+            await self.lease.release()
+
+
+async def _release_after(body: AsyncIterator[bytes], lease: _ExportLease) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        await lease.release()
+
+
+@app.get("/jobs/export")
+async def export_jobs(
+    filters: JobFilters,
+    fmt: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    compress: Annotated[
+        ExportCompression,
+        Query(description="gzip: Content-Encoding gzip (ndjson/csv) ou codec do Parquet"),
+    ] = "none",
+    since: Annotated[
+        datetime | None,
+        Query(
+            description="Marca d'água: vagas com updated_at posterior, relendo uma janela de "
+            "API_EXPORT_OVERLAP_SECS antes dela (pode repetir vagas; deduplique por id)"
+        ),
+    ] = None,
+    since_id: Annotated[
+        UUID | None,
+        Query(description="id da última vaga recebida (com `since`), para retomar o export"),
+    ] = None,
+) -> StreamingResponse:
+    """Todas as vagas do filtro, em streaming e ordenadas por (updated_at, id)."""
+    REQS.labels("/jobs/export").inc()
+    if since_id is not None and since is None:
+        raise HTTPException(400, "since_id exige since")
+    try:
+        encoder = make_encoder(fmt, compress)
+    except ImportError as exc:
+        raise HTTPException(
+            501, "format=parquet requer pyarrow (pip install -e .[export])"
+        ) from exc
+
+    # sessão própria e vaga pesada: vivem até o fim do streaming (ver `_ExportLease`)
+    db = await read_session()
+    try:
+        await heavy_gate.acquire()
+    except BaseException:
+        await db.close()
+        raise
+    lease = _ExportLease(db, heavy_gate)
+    try:
+        conditions, _ = filter_conditions(fts_available=supports_fts(db), **filters)
+        overlap = timedelta(seconds=settings.api_export_overlap_secs)
+        stmt = export_statement(conditions, since, since_id, overlap)
+        # cada FETCH do cursor é um statement: o limite vale por lote, não pelo export
+        await apply_statement_timeout(db, heavy_gate.statement_timeout_ms)
+        gzip = compress == "gzip" and fmt != "parquet"
+        headers = {"Content-Disposition": f'attachment; filename="jobs.{fmt}"'}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        body = _release_after(
+            stream_export(
+                db, stmt, encoder, fmt=fmt, batch_rows=settings.api_export_batch_rows, gzip=gzip
+            ),
+            lease,
+        )
+        return _ExportResponse(body, lease, media_type=MEDIA_TYPES[fmt], headers=headers)
+    except BaseException:
+        await lease.release()
+        raise
+
+
+async def _facet_counts(
+    db: AsyncSession, facets: Sequence[str], limit: int, order: Literal["count", "value"]
+) -> dict[str, list[FacetCount]]:
+    rows = (await db.execute(top_facets_statement(facets, limit, order))).all()
+    out: dict[str, list[FacetCount]] = {facet: [] for facet in facets}
+    for facet, value, count in rows:
+        out[facet].append(FacetCount(value=value, count=count))
+    companies = out.get("company")
+    if companies:
+        # a faceta guarda o id da empresa; o nome vem numa segunda query (≤ limit ids)
+        ids = [UUID(c.value) for c in companies]
+        stmt = select(Company.id, Company.name).where(Company.id.in_(ids))
+        names = {id_: name for id_, name in await db.execute(stmt)}
+        for c in companies:
+            c.label = names.get(UUID(c.value))
+    return out
+
+
+@app.get("/jobs/facets", response_model=dict[str, list[FacetCount]])
+async def job_facets(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_session)],
+    facet: Annotated[list[Facet] | None, Query(description="Facetas (padrão: todas)")] = None,
+    limit: int = Query(10, ge=1, le=100),
+) -> Response:
+    """Contagens por faceta, lidas do rollup `job_facets` (mantido pela ingestão)."""
+    REQS.labels("/jobs/facets").inc()
+    with LAT.time():
+        facets = list(dict.fromkeys(facet or FACETS))
+        key = cache_key("/jobs/facets", {"facet": facets, "limit": limit})
+        watermark = await _cached_watermark()
+        if watermark is not None:
+            valid, fresh = _revalidate(request, "/jobs/facets", key, watermark)
+            if fresh is not None:
+                return fresh
+        async with light_gate.slot(db):
+            if watermark is None:
+                watermark = await db.run_sync(current_watermark)
+                valid, fresh = _revalidate(request, "/jobs/facets", key, watermark)
+                if fresh is not None:
+                    return fresh
+            counts = await _facet_counts(db, facets, limit, "count")
+        return Response(
+            FACETS_ADAPTER.dump_json(counts), media_type="application/json", headers=valid
+        )
+
+
+@app.get("/stats/{facet}", response_model=list[FacetCount])
+async def facet_stats(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_session)],
+    facet: Facet,
+    limit: int = Query(50, ge=1, le=1000),
+    order: Literal["count", "value"] = Query(
+        "count", description="value: ordem decrescente do valor (ex.: posted_day)"
+    ),
+) -> Response:
+    REQS.labels("/stats").inc()
+    with LAT.time():
+        key = cache_key(f"/stats/{facet}", {"limit": limit, "order": order})
+        watermark = await _cached_watermark()
+        if watermark is not None:
+            valid, fresh = _revalidate(request, "/stats", key, watermark)
+            if fresh is not None:
+                return fresh
+        async with light_gate.slot(db):
+            if watermark is None:
+                watermark = await db.run_sync(current_watermark)
+                valid, fresh = _revalidate(request, "/stats", key, watermark)
+                if fresh is not None:
+                    return fresh
+            counts = (await _facet_counts(db, [facet], limit, order))[facet]
+        return Response(
+            STATS_ADAPTER.dump_json(counts), media_type="application/json", headers=valid
+        )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Final
+from uuid import UUID
+
+from sqlalchemy import Select, select, tuple_, union_all
+
+from job_finder.db.models.job import Job
+
+# Paginação por OFFSET (legado): acima disso, use o cursor
+MAX_OFFSET: Final[int] = 1000
+
+# Ordem do feed: mais recentes primeiro, vagas sem posted_at no fim
+FEED_ORDER: Final = (Job.posted_at.desc().nulls_last(), Job.scraped_at.desc(), Job.id.desc())
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FeedKey:
+    """Posição de uma vaga na ordem do feed — o conteúdo do cursor."""
+
+    posted_at: datetime | None
+    scraped_at: datetime
+    id: UUID
+
+    @classmethod
+    def of(cls, job: Any) -> FeedKey:
+        return cls(job.posted_at, job.scraped_at, job.id)
+
+    def encode(self) -> str:
+        raw = json.dumps(
+            [
+                self.posted_at.isoformat() if self.posted_at else None,
+                self.scraped_at.isoformat(),
+                str(self.id),
+            ],
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> FeedKey:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            posted_at, scraped_at, id_ = json.loads(raw)
+            return cls(
+                datetime.fromisoformat(posted_at) if posted_at else None,
+                datetime.fromisoformat(scraped_at),
+                UUID(id_),
+            )
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+            raise InvalidCursor("cursor inválido") from exc
+
+
+def feed_statement(stmt: Select[Any], limit: int, after: FeedKey | None) -> Select[Any]:
+    """Uma página do feed por keyset (sem OFFSET): custa o mesmo na página 1 ou na 1000.
+
+    A ordem `posted_at DESC NULLS LAST` é lida em duas faixas, cada uma um range
+    scan com LIMIT em `ix_jobs_feed` (posted_at, scraped_at, id): as vagas com
+    `posted_at`, comparando a tupla inteira com o cursor, e as vagas sem
+    `posted_at`, por (scraped_at, id). As faixas vão num único `UNION ALL` e a
+    página sai de no máximo `2 * limit` linhas. `stmt` deve projetar `posted_at`,
+    `scraped_at` e `id`.
+    """
+    J = Job
+    ranges: list[Select[Any]] = []
+    if after is None or after.posted_at is not None:
+        head = stmt.where(J.posted_at.is_not(None))
+        if after is not None:
+            head = head.where(
+                tuple_(J.posted_at, J.scraped_at, J.id)
+                < (after.posted_at, after.scraped_at, after.id)
+            )
+        ranges.append(
+            head.order_by(J.posted_at.desc(), J.scraped_at.desc(), J.id.desc()).limit(limit)
+        )
+    tail = stmt.where(J.posted_at.is_(None))
+    if after is not None and after.posted_at is None:
+        tail = tail.where(tuple_(J.scraped_at, J.id) < (after.scraped_at, after.id))
+    ranges.append(tail.order_by(J.scraped_at.desc(), J.id.desc()).limit(limit))
+    if len(ranges) == 1:
+        return ranges[0]
+
+    page = union_all(*(select(r.subquery()) for r in ranges)).subquery()
+    order = (page.c.posted_at.desc().nulls_last(), page.c.scraped_at.desc(), page.c.id.desc())
+    return select(page).order_by(*order).limit(limit)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import structlog
+import uvicorn
+
+from job_finder.settings import settings
+
+log = structlog.get_logger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiproc_dir(path: str | Path) -> Path:
+    """Cria o diretório de métricas compartilhado e apaga arquivos de execuções anteriores.
+
+    Roda no processo pai, antes de subir os workers: contadores de uma execução
+    antiga não podem somar nos da nova.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+    return path
+
+
+def main() -> None:
+    """Sobe a API com `API_WORKERS` processos uvicorn.
+
+    Com mais de um worker, cada processo grava suas métricas em arquivos no
+    diretório de `PROMETHEUS_MULTIPROC_DIR` e o `/metrics` de qualquer worker
+    agrega todos. A variável precisa existir antes do `prometheus_client` ser
+    importado nos workers, por isso é definida aqui.
+    """
+    workers = max(1, settings.api_workers)
+    if workers > 1:
+        path = settings.prometheus_multiproc_dir or os.path.join(
+            tempfile.gettempdir(), "job_finder_metrics"
+        )
+        os.environ[MULTIPROC_ENV] = str(prepare_multiproc_dir(path))
+        log.info("api_multiprocess_metrics", workers=workers, path=os.environ[MULTIPROC_ENV])
+    uvicorn.run(
+        "job_finder.api.main:app",
+        host=settings.app_host,
+        port=settings.app_port,
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from job_finder.db.models.job import Job
+
+
+@dataclass(frozen=True)
+class Total:
+    count: int
+    exact: bool
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-Total-Count": str(self.count),
+            "X-Total-Count-Exact": "true" if self.exact else "false",
+        }
+
+
+def count_statement(conditions: Sequence[ColumnElement[bool]]) -> Select[Any]:
+    return select(func.count()).select_from(Job).where(*conditions)
+
+
+async def estimate_rows(db: AsyncSession, conditions: Sequence[ColumnElement[bool]]) -> int | None:
+    """Linhas estimadas pelo planner (`EXPLAIN`, sem executar); None fora do Postgres.
+
+    Sem filtros, a estimativa vem de `pg_class.reltuples`/páginas da tabela; com
+    filtros, das estatísticas das colunas. Custa um planejamento, não um scan.
+    """
+    bind = db.bind
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    stmt = select(Job.id).where(*conditions)
+    compiled = stmt.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
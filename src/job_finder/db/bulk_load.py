@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Final
+
+from psycopg.types.json import Jsonb
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import rowcount
+from job_finder.db.facets import FACET_COLUMNS, JOB_KEY_LOCK_SQL, FacetKey, facet_delta
+from job_finder.db.fx import Rates, load_fx_rates, salary_usd
+from job_finder.scraping.checksum import content_digest, content_fields
+from job_finder.scraping.schemas import JobIngest
+
+STAGING_TABLE: Final[str] = "jobs_staging"
+
+# Colunas de conteúdo copiadas 1:1 de staging para `jobs`
+JOB_COLUMNS: Final[tuple[str, ...]] = (
+    "external_id",
+    "source",
+    "source_url",
+    "title",
+    "description_html",
+    "description_text",
+    "location",
+    "remote",
+    "employment_type",
+    "seniority",
+    "seniority_level",
+    "currency",
+    "salary_min",
+    "salary_max",
+    "salary_min_usd",
+    "salary_max_usd",
+    "tags",
+    "language",
+    "posted_at",
+    "scraped_at",
+    "last_seen_at",
+    "content_hash",
+)
+STAGING_COLUMNS: Final[tuple[str, ...]] = ("seq", "company_name", *JOB_COLUMNS)
+
+_CREATE_STAGING = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    seq bigint NOT NULL,
+    company_name varchar(255),
+    external_id varchar(128),
+    source varchar(64) NOT NULL,
+    source_url varchar(1024) NOT NULL,
+    title varchar(512) NOT NULL,
+    description_html text,
+    description_text text,
+    location varchar(256),
+    remote boolean NOT NULL,
+    employment_type varchar(64),
+    seniority varchar(32),
+    seniority_level varchar(16),
+    currency varchar(3),
+    salary_min numeric(12, 2),
+    salary_max numeric(12, 2),
+    salary_min_usd numeric(12, 2),
+    salary_max_usd numeric(12, 2),
+    tags jsonb,
+    language varchar(5),
+    posted_at timestamptz,
+    scraped_at timestamptz NOT NULL,
+    last_seen_at timestamptz,
+    content_hash bytea
+) ON COMMIT DROP
+"""
+
+_MERGE_COMPANIES = f"""
+INSERT INTO companies (name)
+SELECT DISTINCT company_name FROM {STAGING_TABLE} WHERE company_name IS NOT NULL
+ON CONFLICT (name) DO NOTHING
+"""
+
+_MERGE_JOBS = """
+INSERT INTO jobs (company_id, {columns})
+SELECT c.id, {s_columns}
+FROM (
+    SELECT *, row_number() OVER (PARTITION BY source, external_id ORDER BY seq DESC) AS rn
+    FROM {staging}
+) s
+LEFT JOIN companies c ON c.name = s.company_name
+WHERE s.rn = 1 OR s.external_id IS NULL
+ON CONFLICT (source, external_id) DO UPDATE SET
+    company_id = EXCLUDED.company_id,
+    {updates},
+    updated_at = now()
+WHERE jobs.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+    OR jobs.source_url IS DISTINCT FROM EXCLUDED.source_url
+    OR jobs.company_id IS DISTINCT FROM EXCLUDED.company_id
+    OR jobs.tags::text IS DISTINCT FROM EXCLUDED.tags::text
+RETURNING {returning}
+""".format(
+    returning=", ".join(f"jobs.{c.key}" for c in FACET_COLUMNS),
+    columns=", ".join(JOB_COLUMNS),
+    s_columns=", ".join(f"s.{c}" for c in JOB_COLUMNS),
+    staging=STAGING_TABLE,
+    updates=",\n    ".join(
+        f"{c} = EXCLUDED.{c}" for c in JOB_COLUMNS if c not in {"source", "external_id"}
+    ),
+)
+
+# Mesmas travas por chave do upsert (ver job_finder.db.facets.lock_job_keys), em ordem
+_LOCK_KEYS = """
+SELECT pg_advisory_xact_lock(k) FROM (
+    SELECT DISTINCT {key} AS k
+    FROM {staging}
+    WHERE external_id IS NOT NULL
+    ORDER BY k
+) keys
+""".format(
+    key=JOB_KEY_LOCK_SQL.format(source="source", external_id="external_id"),
+    staging=STAGING_TABLE,
+)
+
+# Facetas atuais das vagas do staging que já existem (antes do merge), travadas até o commit
+_OLD_FACETS = """
+SELECT {columns} FROM jobs j
+JOIN {staging} s ON j.source = s.source AND j.external_id = s.external_id
+FOR UPDATE OF j
+""".format(columns=", ".join(f"j.{c.key}" for c in FACET_COLUMNS), staging=STAGING_TABLE)
+
+# Vagas do staging que o merge não reescreveu (sem mudança): só `last_seen_at`
+_TOUCH_SEEN = f"""
+UPDATE jobs j SET last_seen_at = s.scraped_at
+FROM {STAGING_TABLE} s
+WHERE j.source = s.source AND j.external_id = s.external_id
+    AND j.last_seen_at IS DISTINCT FROM s.scraped_at
+    AND j.scraped_at IS DISTINCT FROM s.scraped_at
+"""
+
+
+@dataclass(frozen=True)
+class BulkLoadStats:
+    staged: int
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # delta de `job_facets` das linhas gravadas (ver job_finder.db.facets)
+    facets: Counter[FacetKey] = field(default_factory=Counter)
+
+    @property
+    def merged(self) -> int:
+        return self.inserted + self.updated
+
+
+def staging_row(seq: int, data: JobIngest, scraped_at: datetime, rates: Rates) -> tuple[Any, ...]:
+    """Linha do `COPY` para a tabela de staging (ordem de `STAGING_COLUMNS`)."""
+    return (
+        seq,
+        data.company_name,
+        data.external_id,
+        data.source,
+        str(data.source_url),
+        data.title,
+        data.description_html,
+        data.description_text,
+        data.location,
+        data.remote,
+        data.employment_type,
+        data.seniority,
+        data.seniority_level,
+        data.currency,
+        data.salary_min,
+        data.salary_max,
+        *salary_usd(data, rates),
+        Jsonb(data.tags) if data.tags is not None else None,
+        data.language,
+        data.posted_at,
+        scraped_at,
+        scraped_at,
+        content_digest(content_fields(data)),
+    )
+
+
+def bulk_load(
+    db: Session, records: Iterable[JobIngest], scraped_at: datetime | None = None
+) -> BulkLoadStats:
+    """Carga em massa (somente Postgres): `COPY` para staging + merge set-based.
+
+    Os registros são transmitidos via `COPY ... FROM STDIN` para uma tabela
+    temporária (não gera WAL e some no commit). Em seguida, as empresas são criadas
+    com um único `INSERT ... SELECT DISTINCT` e as vagas entram com um único
+    `INSERT ... SELECT ... ON CONFLICT DO UPDATE` (última versão de cada chave vence),
+    que pula vagas sem mudança; estas só recebem `last_seen_at` num UPDATE set-based.
+    O delta de `job_facets` volta em `stats.facets` (aplicado por quem chama).
+    Não faz commit: a transação fica a cargo de quem chama.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise RuntimeError("bulk_load requer PostgreSQL (COPY FROM STDIN)")
+    ts = scraped_at or datetime.now(timezone.utc)
+    rates = load_fx_rates(db)
+
+    db.execute(text(_CREATE_STAGING))
+    db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+    raw = db.connection().connection.driver_connection
+    if raw is None:
+        raise RuntimeError("bulk_load: conexão do driver indisponível (sessão fechada?)")
+    staged = 0
+    with raw.cursor() as cur:
+        copy_sql = f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+        with cur.copy(copy_sql) as copy:
+            for seq, data in enumerate(records):
+                copy.write_row(staging_row(seq, data, ts, rates))
+                staged += 1
+    if not staged:
+        return BulkLoadStats(staged=0)
+
+    db.execute(text(f"ANALYZE {STAGING_TABLE}"))
+    db.execute(text(_MERGE_COMPANIES))
+    db.execute(text(_LOCK_KEYS))
+    old = {(r.source, r.external_id): r for r in db.execute(text(_OLD_FACETS))}
+    written = db.execute(text(_MERGE_JOBS)).all()
+    inserted = sum(1 for r in written if (r.source, r.external_id) not in old)
+    # linhas reescritas já têm scraped_at = s.scraped_at e ficam fora do toque
+    unchanged = rowcount(db.execute(text(_TOUCH_SEEN)))
+    return BulkLoadStats(
+        staged=staged,
+        inserted=inserted,
+        updated=len(written) - inserted,
+        unchanged=unchanged,
+        facets=facet_delta(old, written),
+    )
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import dialect_insert
+from job_finder.db.models.company import Company
+from job_finder.db.upsert import MAX_ROWS_PER_STATEMENT
+from job_finder.obs import metrics as m
+
+
+class CompanyCache:
+    """Cache LRU local ao processo (nome → id) com get-or-create em lote.
+
+    Aquecido a partir de `companies` no início do crawl; os misses de um lote são
+    resolvidos com `INSERT ... ON CONFLICT (name) DO NOTHING RETURNING id` e,
+    para nomes criados por outro processo, um único `SELECT ... WHERE name IN`.
+    """
+
+    def __init__(self, max_size: int = 50_000, spider: str = "unknown") -> None:
+        self.max_size = max(1, max_size)
+        self.spider = spider
+        self._ids: OrderedDict[str, UUID] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def warm(self, db: Session) -> int:
+        """Carrega as empresas mais recentes até `max_size`; retorna quantas entraram."""
+        stmt = (
+            select(Company.name, Company.id)
+            .order_by(Company.updated_at.desc())
+            .limit(self.max_size)
+        )
+        rows = db.execute(stmt).all()
+        # as mais recentes entram por último para ficarem no fim (MRU) da fila
+        for name, company_id in reversed(rows):
+            self._put(name, company_id)
+        return len(rows)
+
+    def resolve_many(self, db: Session, names: Iterable[str | None]) -> dict[str, UUID]:
+        """Resolve nomes em ids, criando as empresas que faltam. Não faz commit."""
+        found: dict[str, UUID] = {}
+        missing: list[str] = []
+        for name in dict.fromkeys(n for n in names if n):
+            company_id = self._ids.get(name)
+            if company_id is None:
+                missing.append(name)
+                continue
+            self._ids.move_to_end(name)
+            found[name] = company_id
+
+        if found:
+            m.COMPANY_CACHE_HITS.labels(spider=self.spider).inc(len(found))
+        if not missing:
+            return found
+        m.COMPANY_CACHE_MISSES.labels(spider=self.spider).inc(len(missing))
+
+        for start in range(0, len(missing), MAX_ROWS_PER_STATEMENT):
+            chunk = missing[start : start + MAX_ROWS_PER_STATEMENT]
+            resolved = self._create_missing(db, chunk)
+            for name, company_id in resolved.items():
+                self._put(name, company_id)
+                found[name] = company_id
+        return found
+
+    def forget(self, names: Iterable[str | None]) -> None:
+        """Remove nomes do cache (ex.: após rollback da transação que os criou)."""
+        for name in names:
+            if name:
+                self._ids.pop(name, None)
+
+    def _create_missing(self, db: Session, names: list[str]) -> dict[str, UUID]:
+        stmt = (
+            dialect_insert(db, Company)
+            .values([{"name": n} for n in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Company.name, Company.id)
+        )
+        resolved: dict[str, UUID] = {name: cid for name, cid in db.execute(stmt).all()}
+        existing = [n for n in names if n not in resolved]
+        if existing:
+            stmt_existing = select(Company.name, Company.id).where(Company.name.in_(existing))
+            resolved.update({name: cid for name, cid in db.execute(stmt_existing).all()})
+        return resolved
+
+    def _put(self, name: str, company_id: UUID) -> None:
+        self._ids[name] = company_id
+        self._ids.move_to_end(name)
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any, TypeAlias, cast
+
+from sqlalchemy import CursorResult, Result
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Os dois expõem `on_conflict_do_*` e `excluded` (o `Insert` genérico não)
+Insert: TypeAlias = postgresql.Insert | sqlite.Insert
+
+
+def dialect_insert(db: Session, entity: Any) -> Insert:
+    """`INSERT` com suporte a ON CONFLICT no dialeto da sessão (Postgres ou SQLite)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(entity)
+    return postgresql.insert(entity)
+
+
+def rowcount(result: Result[Any]) -> int:
+    """Linhas afetadas por um UPDATE/DELETE (o `Session.execute` tipa só `Result`)."""
+    return cast(CursorResult[Any], result).rowcount
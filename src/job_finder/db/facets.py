@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, Final, Literal
+
+from sqlalchemy import Select, SQLColumnExpression, delete, func, select, text, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import dialect_insert
+from job_finder.db.models.job import Job
+from job_finder.db.models.job_facet import JobFacet
+from job_finder.db.models.job_skill import JobSkill
+from job_finder.db.models.skill import Skill
+
+Facet = Literal["source", "remote", "seniority", "company", "posted_day", "skill"]
+FACETS: Final[tuple[str, ...]] = ("source", "remote", "seniority", "company", "posted_day", "skill")
+
+# Colunas de `jobs` que definem as facetas de uma vaga (+ a chave do upsert)
+FACET_COLUMNS: Final = (
+    Job.source,
+    Job.external_id,
+    Job.remote,
+    Job.seniority_level,
+    Job.company_id,
+    Job.posted_at,
+)
+FACET_ROWS_PER_STATEMENT = 1000
+
+# Chave de advisory lock de uma vaga `(source, external_id)` (ver `lock_job_keys`);
+# uma colisão de hash só serializa duas vagas distintas
+JOB_KEY_LOCK_SQL: Final[str] = "hashtextextended({source} || chr(31) || {external_id}, 0)"
+_LOCK_JOB_KEYS = """
+SELECT pg_advisory_xact_lock(k) FROM (
+    SELECT DISTINCT {key} AS k
+    FROM unnest(CAST(:sources AS text[]), CAST(:external_ids AS text[])) AS t(s, e)
+    ORDER BY k
+) keys
+""".format(key=JOB_KEY_LOCK_SQL.format(source="s", external_id="e"))
+
+FacetKey = tuple[str, str]
+
+
+def _day(ts: datetime) -> str:
+    return (ts.astimezone(timezone.utc) if ts.tzinfo else ts).date().isoformat()
+
+
+def facet_values(row: Any) -> list[FacetKey]:
+    """Pares (faceta, valor) de uma vaga; `row` tem os atributos de `FACET_COLUMNS`.
+
+    `skill` vem de `job_skills` e não entra aqui: nenhum escritor incremental grava
+    `job_skills`, então essa faceta só é mantida pelo `rebuild_facets`.
+    """
+    out = [("source", row.source), ("remote", "true" if row.remote else "false")]
+    if row.seniority_level:
+        out.append(("seniority", row.seniority_level))
+    if row.company_id is not None:
+        out.append(("company", str(row.company_id)))
+    if row.posted_at is not None:
+        out.append(("posted_day", _day(row.posted_at)))
+    return out
+
+
+def facet_delta(old: Mapping[tuple[str, str], Any], written: Iterable[Any]) -> Counter[FacetKey]:
+    """Delta das contagens para as vagas gravadas: −facetas antigas (se a vaga já
+    existia, em `old` por `(source, external_id)`), +facetas novas.
+    """
+    delta: Counter[FacetKey] = Counter()
+    for row in written:
+        prev = old.get((row.source, row.external_id)) if row.external_id is not None else None
+        if prev is not None:
+            for key in facet_values(prev):
+                delta[key] -= 1
+        for key in facet_values(row):
+            delta[key] += 1
+    return delta
+
+
+def lock_job_keys(db: Session, keys: Sequence[tuple[str, str]]) -> None:
+    """Trava as chaves `(source, external_id)` até o fim da transação (somente Postgres).
+
+    Advisory lock por chave, tomado em ordem (sem deadlock entre escritores): cobre
+    também vagas que ainda não existem, que um `FOR UPDATE` não alcança. Dois flushes
+    com a mesma vaga nova não contam ambos como inserção.
+    """
+    if not keys or db.get_bind().dialect.name != "postgresql":
+        return
+    sources, external_ids = zip(*keys, strict=True)
+    db.execute(text(_LOCK_JOB_KEYS), {"sources": list(sources), "external_ids": list(external_ids)})
+
+
+def existing_facet_rows(db: Session, keys: Sequence[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+    """Facetas atuais das vagas `(source, external_id)` já gravadas, travadas até o commit.
+
+    Chaves (`lock_job_keys`) e linhas (`FOR UPDATE`) ficam presas até o commit de quem
+    chama: nenhum escritor concorrente muda essas vagas entre esta leitura e o upsert,
+    então o delta de facetas parte dos valores que o upsert de fato substitui.
+    """
+    if not keys:
+        return {}
+    lock_job_keys(db, keys)
+    stmt = (
+        select(*FACET_COLUMNS)
+        .where(tuple_(Job.source, Job.external_id).in_(keys))
+        .with_for_update()
+    )
+    return {(r.source, r.external_id): r for r in db.execute(stmt)}
+
+
+def apply_facet_delta(db: Session, delta: Mapping[FacetKey, int]) -> int:
+    """Soma o delta em `job_facets` (upsert `count = count + delta`). Não faz commit.
+
+    As linhas vão em ordem de chave: escritores concorrentes travam as mesmas
+    linhas na mesma ordem e não entram em deadlock.
+    """
+    changes = [
+        {"facet": facet, "value": value, "count": n}
+        for (facet, value), n in sorted(delta.items())
+        if n
+    ]
+    for start in range(0, len(changes), FACET_ROWS_PER_STATEMENT):
+        stmt = dialect_insert(db, JobFacet).values(
+            changes[start : start + FACET_ROWS_PER_STATEMENT]
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["facet", "value"],
+                set_={"count": JobFacet.count + stmt.excluded["count"]},
+            )
+        )
+    return len(changes)
+
+
+def top_facets_statement(
+    facets: Sequence[str], limit: int, order: Literal["count", "value"] = "count"
+) -> Select[Any]:
+    """Top `limit` valores de cada faceta num único statement (`UNION ALL` de range
+    scans com LIMIT em `ix_job_facets_top`/PK), em ordem de faceta.
+    """
+    J = JobFacet
+
+    def ordering(t: Any) -> tuple[Any, ...]:
+        return (t.value.desc() if order == "value" else t.count.desc(), t.value)
+
+    columns: tuple[SQLColumnExpression[Any], ...] = (J.facet, J.value, J.count)
+    ranges = [
+        select(*columns).where(J.facet == facet, J.count > 0).order_by(*ordering(J)).limit(limit)
+        for facet in facets
+    ]
+    if len(ranges) == 1:
+        return ranges[0]
+    page = union_all(*(select(r.subquery()) for r in ranges)).subquery()
+    return select(page).order_by(page.c.facet, *ordering(page.c))
+
+
+def rebuild_facets(db: Session, batch_size: int = 10_000) -> int:
+    """Recalcula `job_facets` do zero (reparo de deriva); retorna quantas linhas gravou.
+
+    Usa a mesma extração dos deltas, lendo `jobs` em streaming. No Postgres a tabela
+    fica travada para escrita até o commit: deltas de flushes concorrentes esperam e
+    entram por cima da contagem nova, sem se perder. Não faz commit.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"LOCK TABLE {JobFacet.__tablename__} IN EXCLUSIVE MODE"))
+    counts: Counter[FacetKey] = Counter()
+    rows = db.execute(select(*FACET_COLUMNS).execution_options(yield_per=batch_size))
+    for row in rows:
+        counts.update(facet_values(row))
+    skills = (
+        select(Skill.name, func.count())
+        .select_from(JobSkill)
+        .join(Skill, Skill.id == JobSkill.skill_id)
+        .group_by(Skill.name)
+    )
+    for name, n in db.execute(skills):
+        counts["skill", name] = n
+
+    db.execute(delete(JobFacet))
+    return apply_facet_delta(db, counts)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Final
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import dialect_insert
+from job_finder.db.models.fx_rate import FxRate
+
+# Vagas sem moeda informada são tratadas como USD (caso comum nas fontes remotas)
+DEFAULT_CURRENCY: Final[str] = "USD"
+CENTS: Final[Decimal] = Decimal("0.01")
+
+Rates = Mapping[str, Decimal]
+
+
+def load_fx_rates(db: Session) -> dict[str, Decimal]:
+    """Cotações de `fx_rates` (moeda -> USD por unidade)."""
+    return {
+        currency: Decimal(rate)
+        for currency, rate in db.execute(select(FxRate.currency, FxRate.usd_rate))
+    }
+
+
+def to_usd(amount: Any, currency: str | None, rates: Rates) -> Decimal | None:
+    """Valor em USD, arredondado em centavos; None sem valor ou sem cotação da moeda."""
+    if amount is None:
+        return None
+    rate = rates.get((currency or DEFAULT_CURRENCY).upper())
+    if rate is None:
+        return None
+    return (Decimal(str(amount)) * rate).quantize(CENTS)
+
+
+def salary_usd(row: Any, rates: Rates) -> tuple[Decimal | None, Decimal | None]:
+    """`(salary_min_usd, salary_max_usd)` de uma vaga (`currency`, `salary_min`, `salary_max`).
+
+    Os valores de origem são tratados como anuais: o esquema não guarda o período.
+    """
+    return (
+        to_usd(row.salary_min, row.currency, rates),
+        to_usd(row.salary_max, row.currency, rates),
+    )
+
+
+def upsert_fx_rates(db: Session, rates: Rates) -> int:
+    """Grava/atualiza cotações em `fx_rates`. Não faz commit."""
+    if not rates:
+        return 0
+    stmt = dialect_insert(db, FxRate).values(
+        [{"currency": c.upper(), "usd_rate": r} for c, r in sorted(rates.items())]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["currency"],
+            set_={"usd_rate": stmt.excluded.usd_rate, "updated_at": func.now()},
+        )
+    )
+    return len(rates)
+
+
+def read_rates_csv(path: str | Path) -> dict[str, Decimal]:
+    """Lê um CSV `currency,usd_rate` (com cabeçalho)."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows: Iterable[dict[str, str]] = csv.DictReader(fh)
+        return {r["currency"].strip().upper(): Decimal(r["usd_rate"]) for r in rows}
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import dialect_insert
+from job_finder.db.models.ingest_generation import IngestGeneration
+
+GENERATION_ROW_ID = 1
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """Geração de ingestão e quando ela mudou (validadores de cache HTTP)."""
+
+    generation: int
+    updated_at: datetime | None = None
+
+
+def bump_generation(db: Session) -> None:
+    """Incrementa a geração de ingestão. Não faz commit: chamar na mesma transação
+    da escrita, para que leitores nunca vejam a geração nova antes dos dados.
+    """
+    stmt = dialect_insert(db, IngestGeneration).values(id=GENERATION_ROW_ID, generation=1)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={"generation": IngestGeneration.generation + 1, "updated_at": func.now()},
+        )
+    )
+
+
+def current_generation(db: Session) -> int:
+    stmt = select(IngestGeneration.generation).where(IngestGeneration.id == GENERATION_ROW_ID)
+    return db.scalar(stmt) or 0
+
+
+def current_watermark(db: Session) -> Watermark:
+    stmt = select(IngestGeneration.generation, IngestGeneration.updated_at).where(
+        IngestGeneration.id == GENERATION_ROW_ID
+    )
+    row = db.execute(stmt).first()
+    return Watermark(row.generation, row.updated_at) if row else Watermark(0)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from job_finder.db.bulk_load import bulk_load
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.facets import apply_facet_delta
+from job_finder.db.fx import load_fx_rates
+from job_finder.db.generation import bump_generation
+from job_finder.db.upsert import UpsertStats, job_row, upsert_jobs
+from job_finder.scraping.schemas import JobIngest
+
+
+def resolve_companies(
+    db: Session, companies: CompanyCache, names: Sequence[str | None]
+) -> dict[str, UUID]:
+    """Resolve empresas em transação própria: o cache nunca guarda ids desfeitos."""
+    try:
+        company_ids = companies.resolve_many(db, names)
+        db.commit()
+    except Exception:
+        db.rollback()
+        companies.forget(names)
+        raise
+    return company_ids
+
+
+def write_batch(
+    db: Session,
+    companies: CompanyCache,
+    pending: Sequence[tuple[JobIngest, datetime]],
+    bulk: bool = False,
+    skip_unchanged: bool = True,
+) -> UpsertStats:
+    """Grava um lote de vagas (upsert multi-linha ou COPY + merge). Não faz commit.
+
+    No modo bulk, o `last_seen_at` das vagas sem mudança já é tocado pelo merge
+    e `seen_keys` volta vazio. Se alguma vaga mudou, o delta das facetas é aplicado
+    em `job_facets` e a geração de ingestão é incrementada, na mesma transação
+    (invalida os caches da API).
+    """
+    if bulk:
+        loaded = bulk_load(db, (data for data, _ in pending))
+        stats = UpsertStats(
+            inserted=loaded.inserted,
+            updated=loaded.updated,
+            unchanged=loaded.unchanged,
+            facets=loaded.facets,
+        )
+    else:
+        company_ids = resolve_companies(db, companies, [data.company_name for data, _ in pending])
+        rates = load_fx_rates(db)
+        rows = [
+            job_row(data, company_ids.get(data.company_name or ""), scraped_at, rates)
+            for data, scraped_at in pending
+        ]
+        stats = upsert_jobs(db, rows, skip_unchanged=skip_unchanged)
+    if stats.written:
+        apply_facet_delta(db, stats.facets)
+        bump_generation(db)
+    return stats
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin, UUIDMixin
@@ -8,6 +8,15 @@ from .base import Base, TimestampMixin, UUIDMixin
 
 class Company(TimestampMixin, UUIDMixin, Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # filtro `company` da API (ILIKE '%x%'); requer a extensão pg_trgm
+        Index(
+            "ix_companies_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     website: Mapped[str | None] = mapped_column(String(512), nullable=True)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class FxRate(Base):
+    """Cotação local de uma moeda em USD (1 unidade = `usd_rate` dólares).
+
+    Usada para normalizar salários na ingestão (ver `job_finder.db.fx`); depois de
+    atualizar as cotações, rodar `backfill salary-usd`.
+    """
+
+    __tablename__ = "fx_rates"
+
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    usd_rate: Mapped[float] = mapped_column(Numeric(18, 8), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
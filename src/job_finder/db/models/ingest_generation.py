@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IngestGeneration(Base):
+    """Contador (linha única) incrementado a cada gravação de vagas.
+
+    Caches de leitura (ver `job_finder.api.cache`) comparam a geração em que uma
+    resposta foi calculada com a atual para saber se ela ainda vale.
+    """
+
+    __tablename__ = "ingest_generation"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    generation: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
@@ -10,10 +11,12 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    LargeBinary,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -25,8 +28,35 @@ class Job(TimestampMixin, UUIDMixin, Base):
     __tablename__ = "jobs"
     __table_args__ = (
         UniqueConstraint("source", "external_id", name="uq_jobs_source_external"),
-        Index("ix_jobs_posted_at", "posted_at"),
         Index("ix_jobs_scraped_at", "scraped_at"),
+        # feed por keyset (ver job_finder.api.pagination.feed_statement); também serve
+        # filtros/ordem só por posted_at (prefixo)
+        Index("ix_jobs_feed", "posted_at", "scraped_at", "id"),
+        # feed filtrado: igualdade + chaves do feed (range scan com LIMIT, sem sort)
+        Index("ix_jobs_source_feed", "source", "posted_at", "scraped_at", "id"),
+        Index("ix_jobs_company_feed", "company_id", "posted_at", "scraped_at", "id"),
+        # remote=true é o filtro mais comum e seletivo: parcial, menor que o feed inteiro
+        Index(
+            "ix_jobs_remote_feed",
+            "posted_at",
+            "scraped_at",
+            "id",
+            postgresql_where=text("remote IS true"),
+        ),
+        # ordem e marca d'água do /jobs/export (ver job_finder.api.export)
+        Index("ix_jobs_updated", "updated_at", "id"),
+        # filtros da API: btree para igualdade (match=exact), trigram para ILIKE '%x%'
+        Index("ix_jobs_location", "location"),
+        Index("ix_jobs_seniority_level", "seniority_level"),
+        # faixas salariais normalizadas (min_salary/max_salary da API)
+        Index("ix_jobs_salary_min_usd", "salary_min_usd"),
+        Index("ix_jobs_salary_max_usd", "salary_max_usd"),
+        Index(
+            "ix_jobs_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
     )
 
     external_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
@@ -45,14 +75,24 @@ class Job(TimestampMixin, UUIDMixin, Base):
     location: Mapped[str | None] = mapped_column(String(256), nullable=True)
     remote: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     employment_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # valor cru da fonte; o normalizado (`Seniority`, filtros e facetas) fica ao lado
     seniority: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    seniority_level: Mapped[str | None] = mapped_column(String(16), nullable=True)
 
     currency: Mapped[str | None] = mapped_column(String(3), nullable=True)
     salary_min: Mapped[float | None] = mapped_column(Numeric(12, 2), nullable=True)
     salary_max: Mapped[float | None] = mapped_column(Numeric(12, 2), nullable=True)
+    # salário anual em USD pelas cotações de `fx_rates` (ver job_finder.db.fx)
+    salary_min_usd: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    salary_max_usd: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
 
     tags: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     language: Mapped[str | None] = mapped_column(String(5), nullable=True)
 
     posted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     scraped_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # última execução em que a vaga foi vista (mesmo sem mudança de conteúdo)
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # digest (16 bytes) dos campos de conteúdo — ver job_finder.scraping.checksum
+    content_hash: Mapped[bytes | None] = mapped_column(LargeBinary(16), nullable=True)
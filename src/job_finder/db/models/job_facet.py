@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JobFacet(Base):
+    """Contagem de vagas por valor de faceta (rollup de `jobs`).
+
+    Mantida por deltas na mesma transação da escrita das vagas (ver
+    `job_finder.db.facets`); `/jobs/facets` e `/stats/*` leem só daqui.
+    """
+
+    __tablename__ = "job_facets"
+    __table_args__ = (
+        # top-N por faceta: range scan com LIMIT
+        Index("ix_job_facets_top", "facet", "count"),
+    )
+
+    facet: Mapped[str] = mapped_column(String(32), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Final
+
+from sqlalchemy import ColumnElement, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from job_finder.db.models.job import Job
+
+# Configuração de texto da busca: precisa ser a mesma na coluna gerada e na query
+FTS_CONFIG: Final[str] = "english"
+
+# Expressão da coluna gerada `jobs.search_vector` (título pesa mais que a descrição).
+# A coluna e o índice GIN só existem no Postgres (migração 20261018_03_job_search_vector)
+# e por isso não estão mapeados no modelo `Job`.
+SEARCH_VECTOR_SQL: Final[str] = (
+    f"setweight(to_tsvector('{FTS_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{FTS_CONFIG}'::regconfig, coalesce(description_text, '')), 'B')"
+)
+SEARCH_VECTOR_COLUMN: Final[str] = "search_vector"
+
+search_vector = literal_column(f"jobs.{SEARCH_VECTOR_COLUMN}", type_=TSVECTOR)
+
+
+def supports_fts(db: Session | AsyncSession) -> bool:
+    bind = db.bind
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def ts_query(q: str) -> ColumnElement[object]:
+    """`websearch_to_tsquery`: aceita a sintaxe de busca do usuário ("a b", -x, OR)."""
+    return func.websearch_to_tsquery(literal_column(f"'{FTS_CONFIG}'::regconfig"), q)
+
+
+def fts_match(q: str) -> ColumnElement[bool]:
+    """`search_vector @@ query` — servido pelo índice GIN `ix_jobs_search_vector`."""
+    return search_vector.bool_op("@@")(ts_query(q))
+
+
+def fts_rank(q: str) -> ColumnElement[float]:
+    return func.ts_rank(search_vector, ts_query(q))
+
+
+def substring_match(q: str) -> ColumnElement[bool]:
+    """Busca exata por substring (ILIKE) em título e descrição; não usa índice."""
+    return or_(Job.title.ilike(f"%{q}%"), Job.description_text.ilike(f"%{q}%"))
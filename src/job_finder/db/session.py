@@ -1,20 +1,189 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Final
 
-from sqlalchemy import create_engine
+import structlog
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import InterfaceError, OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from job_finder.obs import metrics as m
 from job_finder.settings import settings
 
+log = structlog.get_logger(__name__)
+
+# Falhas de conexão/banco indisponível: valem nova tentativa. Erros de dado
+# (IntegrityError, DataError, ...) não mudam ao repetir e devem subir.
+TRANSIENT_DB_ERRORS: Final = (OperationalError, InterfaceError)
+
 url = settings.sqlalchemy_url
-engine_kwargs: dict[str, Any] = dict(pool_pre_ping=True, future=True)
-if url.startswith("sqlite"):
-    engine_kwargs.update(connect_args={"check_same_thread": False})
-    if url.endswith(":memory:"):
-        engine_kwargs.update(poolclass=StaticPool)
-engine = create_engine(url, **engine_kwargs)
+read_url = settings.sqlalchemy_read_url
+has_replica = read_url != url
+
+
+def sync_engine_kwargs(sync_url: str) -> dict[str, Any]:
+    """Pool do engine síncrono (escrita dos pipelines e scripts), a partir de `Settings`."""
+    kwargs: dict[str, Any] = dict(pool_pre_ping=True, future=True)
+    if sync_url.startswith("sqlite"):
+        kwargs.update(connect_args={"check_same_thread": False})
+        if sync_url.endswith(":memory:"):
+            kwargs.update(poolclass=StaticPool)
+        return kwargs
+    kwargs.update(
+        pool_size=settings.db_write_pool_size, max_overflow=settings.db_write_max_overflow
+    )
+    return kwargs
+
+
+engine = create_engine(url, **sync_engine_kwargs(url))
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True
 )
+# Leituras síncronas que toleram atraso (relatórios, scripts): réplica, se configurada
+read_engine = create_engine(read_url, **sync_engine_kwargs(read_url)) if has_replica else engine
+ReadSessionLocal = sessionmaker(
+    bind=read_engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True
+)
+
+
+def async_url(sync_url: str) -> URL:
+    """URL equivalente com driver assíncrono (psycopg 3 async / aiosqlite)."""
+    u = make_url(sync_url)
+    if u.get_backend_name() == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite")
+    return u.set(drivername="postgresql+psycopg_async")
+
+
+def async_engine_kwargs(sync_url: str) -> dict[str, Any]:
+    """Pool e statement_timeout da API, a partir de `Settings`."""
+    if sync_url.startswith("sqlite"):
+        # SQLite (testes/dev): sem pool configurável nem statement_timeout
+        return {}
+    kwargs: dict[str, Any] = dict(
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_secs,
+    )
+    if settings.db_statement_timeout_ms > 0:
+        timeout = settings.db_statement_timeout_ms
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return kwargs
+
+
+# Engine assíncrono da API: handlers `async def` não prendem uma thread esperando o banco
+async_engine = create_async_engine(async_url(url), **async_engine_kwargs(url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+# Leituras da API: réplica (pool próprio), ou o mesmo engine sem DATABASE_READ_URL
+async_read_engine = (
+    create_async_engine(async_url(read_url), **async_engine_kwargs(read_url))
+    if has_replica
+    else async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+# Atraso de replay da réplica; 0 se não há WAL pendente (primário ocioso não conta
+# como atraso) ou se o banco não está em recovery (é o próprio primário)
+REPLICA_LAG_SQL: Final[str] = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+# Réplica que não responde a tempo conta como fora (a request que mede espera no máximo isso)
+PROBE_TIMEOUT_SECS: Final[float] = 1.0
+
+LagProbe = Callable[[async_sessionmaker[AsyncSession]], Awaitable[float]]
+
+
+async def replica_lag_secs(factory: async_sessionmaker[AsyncSession]) -> float:
+    """Atraso (s) do banco de `factory`; fora do Postgres (SQLite de teste) é 0."""
+    async with factory() as db:
+        bind = db.bind
+        if bind is None or bind.dialect.name != "postgresql":
+            return 0.0
+        return float(await db.scalar(text(REPLICA_LAG_SQL)) or 0)
+
+
+class ReadRouter:
+    """Escolhe onde a API lê: réplica, ou o primário se ela estiver atrasada ou fora.
+
+    O atraso é medido no máximo a cada `poll_secs` (por processo); entre medições,
+    vale a última decisão. Sem réplica, devolve sempre o primário.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None,
+        *,
+        max_lag_secs: float,
+        poll_secs: float,
+        probe: LagProbe = replica_lag_secs,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.max_lag_secs = max_lag_secs
+        self.poll_secs = poll_secs
+        self._probe = probe
+        self._checked_at = -math.inf
+        self._fallback: str | None = None
+
+    async def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        if self.replica is None:
+            return self.primary
+        now = time.monotonic()
+        if now - self._checked_at >= self.poll_secs:
+            # marca antes do await: requests concorrentes usam a decisão anterior
+            self._checked_at = now
+            self._fallback = await self._check(self.replica)
+        if self._fallback is None:
+            return self.replica
+        m.DB_READ_FALLBACKS.labels(reason=self._fallback).inc()
+        return self.primary
+
+    async def _check(self, replica: async_sessionmaker[AsyncSession]) -> str | None:
+        """Motivo para ler do primário (`lag`/`error`), ou None se a réplica serve."""
+        try:
+            lag = await asyncio.wait_for(self._probe(replica), timeout=PROBE_TIMEOUT_SECS)
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as exc:
+            if self._fallback != "error":
+                log.warning("db_replica_unavailable", error=repr(exc))
+            return "error"
+        m.DB_REPLICA_LAG_SECS.set(lag)
+        if lag > self.max_lag_secs:
+            if self._fallback != "lag":
+                log.warning("db_replica_lagging", lag_secs=lag, max_lag_secs=self.max_lag_secs)
+            return "lag"
+        return None
+
+
+read_router = ReadRouter(
+    AsyncSessionLocal,
+    AsyncReadSessionLocal if has_replica else None,
+    max_lag_secs=settings.db_replica_max_lag_secs,
+    poll_secs=settings.db_replica_lag_poll_secs,
+)
+
+
+async def read_session() -> AsyncSession:
+    """Sessão de leitura da API (ver `ReadRouter`); quem chama fecha."""
+    factory = await read_router.sessionmaker()
+    return factory()
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Dependência FastAPI: uma sessão de leitura por request, fechada ao fim da resposta."""
+    async with await read_session() as session:
+        yield session
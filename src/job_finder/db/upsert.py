@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Text, cast, func, or_, update
+from sqlalchemy.orm import Session
+
+from job_finder.db.dialect import dialect_insert, rowcount
+from job_finder.db.facets import FACET_COLUMNS, FacetKey, existing_facet_rows, facet_delta
+from job_finder.db.fx import Rates, salary_usd
+from job_finder.db.models.job import Job
+from job_finder.scraping.checksum import content_digest, content_fields
+from job_finder.scraping.schemas import JobIngest
+
+JOB_CONFLICT_KEYS: tuple[str, ...] = ("source", "external_id")
+
+# Postgres aceita até 65535 parâmetros por statement; 1000 linhas x ~20 colunas fica folgado
+MAX_ROWS_PER_STATEMENT = 1000
+# Chaves por UPDATE do toque em `last_seen_at`; acima de LAST_SEEN_PENDING_MAX
+# chaves acumuladas os pipelines tocam antes do fim da execução (limita memória)
+LAST_SEEN_BATCH = 5000
+LAST_SEEN_PENDING_MAX = 50_000
+
+
+@dataclass
+class UpsertStats:
+    """Resultado de um upsert: linhas inseridas, reescritas e sem mudança."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # chaves `(source, external_id)` sem mudança, ainda sem toque em `last_seen_at`
+    seen_keys: list[tuple[str, str]] = field(default_factory=list)
+    # delta de `job_facets` das linhas gravadas (ver job_finder.db.facets)
+    facets: Counter[FacetKey] = field(default_factory=Counter)
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+    def __iadd__(self, other: UpsertStats) -> UpsertStats:
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.seen_keys.extend(other.seen_keys)
+        self.facets.update(other.facets)
+        return self
+
+
+def job_row(
+    data: JobIngest, company_id: UUID | None, scraped_at: datetime, rates: Rates
+) -> dict[str, Any]:
+    """Converte um `JobIngest` validado na linha de `jobs` usada pelo upsert.
+
+    `rates` (ver `load_fx_rates`) normaliza o salário em USD.
+    """
+    salary_min_usd, salary_max_usd = salary_usd(data, rates)
+    return {
+        "external_id": data.external_id,
+        "source": data.source,
+        "source_url": str(data.source_url),
+        "title": data.title,
+        "description_html": data.description_html,
+        "description_text": data.description_text,
+        "company_id": company_id,
+        "location": data.location,
+        "remote": data.remote,
+        "employment_type": data.employment_type,
+        "seniority": data.seniority,
+        "seniority_level": data.seniority_level,
+        "currency": data.currency,
+        "salary_min": data.salary_min,
+        "salary_max": data.salary_max,
+        "salary_min_usd": salary_min_usd,
+        "salary_max_usd": salary_max_usd,
+        "tags": data.tags,
+        "language": data.language,
+        "posted_at": data.posted_at,
+        "scraped_at": scraped_at,
+        "last_seen_at": scraped_at,
+        "content_hash": content_digest(content_fields(data)),
+    }
+
+
+def collapse_rows(rows: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Mantém só a última ocorrência de cada `(source, external_id)`.
+
+    Um mesmo statement não pode atualizar a mesma linha duas vezes no ON CONFLICT.
+    Linhas sem `external_id` nunca conflitam (NULL é distinto) e passam intactas.
+    """
+    keyed: dict[tuple[str, str], int] = {}
+    out: list[dict[str, Any]] = []
+    for row in rows:
+        if row.get("external_id") is None:
+            out.append(row)
+            continue
+        key = (row["source"], row["external_id"])
+        if key in keyed:
+            out[keyed[key]] = row
+            continue
+        keyed[key] = len(out)
+        out.append(row)
+    return out
+
+
+def _changed(excluded: Any) -> ColumnElement[bool]:
+    """Condição do DO UPDATE: só reescreve a linha se algo gravado mudou.
+
+    `content_hash` cobre os campos de conteúdo; o resto é comparado direto
+    (`tags` como texto, já que `json` não tem operador de igualdade no Postgres).
+    Linhas legadas com `content_hash` NULL sempre são reescritas.
+    """
+    return or_(
+        Job.content_hash.is_distinct_from(excluded.content_hash),
+        Job.source_url.is_distinct_from(excluded.source_url),
+        Job.company_id.is_distinct_from(excluded.company_id),
+        cast(Job.tags, Text).is_distinct_from(cast(excluded.tags, Text)),
+    )
+
+
+def upsert_jobs(
+    db: Session, rows: Sequence[dict[str, Any]], skip_unchanged: bool = True
+) -> UpsertStats:
+    """Upsert multi-linha em `jobs` (ON CONFLICT (source, external_id) DO UPDATE).
+
+    Com `skip_unchanged`, o DO UPDATE tem um `WHERE ... IS DISTINCT FROM`: uma vaga
+    revista sem mudança não gera tupla morta nem WAL. As chaves dessas vagas voltam
+    em `seen_keys` para um toque em lote de `last_seen_at` (ver `touch_last_seen`).
+    As facetas das vagas já existentes são lidas (e travadas até o commit, ver
+    `existing_facet_rows`) antes do upsert; com o RETURNING, formam o delta de
+    `job_facets` em `stats.facets` (aplicado por quem chama).
+    Não faz commit: a transação fica a cargo de quem chama.
+    """
+    stats = UpsertStats()
+    batch = collapse_rows(rows)
+    for start in range(0, len(batch), MAX_ROWS_PER_STATEMENT):
+        chunk = batch[start : start + MAX_ROWS_PER_STATEMENT]
+        stmt = dialect_insert(db, Job).values(chunk)
+        set_: dict[str, Any] = {k: stmt.excluded[k] for k in chunk[0] if k not in JOB_CONFLICT_KEYS}
+        set_["updated_at"] = func.now()
+        upsert = stmt.on_conflict_do_update(
+            index_elements=list(JOB_CONFLICT_KEYS),
+            set_=set_,
+            where=_changed(stmt.excluded) if skip_unchanged else None,
+        )
+        keys = [(r["source"], r["external_id"]) for r in chunk if r["external_id"] is not None]
+        old = existing_facet_rows(db, keys)
+        # linhas barradas pelo WHERE não aparecem no RETURNING
+        written = db.execute(upsert.returning(*FACET_COLUMNS)).all()
+        touched = {(r.source, r.external_id) for r in written}
+        inserted = sum(1 for r in written if (r.source, r.external_id) not in old)
+        stats.inserted += inserted
+        stats.updated += len(written) - inserted
+        stats.facets.update(facet_delta(old, written))
+        for row in chunk:
+            key = (row["source"], row["external_id"])
+            if row["external_id"] is not None and key not in touched:
+                stats.unchanged += 1
+                stats.seen_keys.append(key)
+    return stats
+
+
+def touch_last_seen(db: Session, keys: Iterable[tuple[str, str]], seen_at: datetime) -> int:
+    """Marca `last_seen_at` de vagas revistas sem mudança, em UPDATEs de até
+    `LAST_SEEN_BATCH` chaves por fonte. Não faz commit.
+    """
+    by_source: dict[str, list[str]] = defaultdict(list)
+    for source, external_id in keys:
+        by_source[source].append(external_id)
+    touched = 0
+    for source, external_ids in by_source.items():
+        for start in range(0, len(external_ids), LAST_SEEN_BATCH):
+            stmt = (
+                update(Job)
+                .where(
+                    Job.source == source,
+                    Job.external_id.in_(external_ids[start : start + LAST_SEEN_BATCH]),
+                )
+                # mantém `updated_at` (o onupdate do mixin o moveria): a vaga não mudou
+                .values(last_seen_at=seen_at, updated_at=Job.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            touched += rowcount(db.execute(stmt))
+    return touched
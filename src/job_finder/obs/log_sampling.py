@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+
+class LogAggregator:
+    """Agrega eventos de log de alto volume em contadores por spider.
+
+    Em vez de uma linha por item/response, cada `record` só incrementa um
+    contador em memória; um evento `<scope>_summary` com os totais da janela sai
+    a cada `summary_every_items` eventos ou `summary_interval_secs` segundos (e no
+    `flush`). Um a cada `sample_rate` eventos de cada tipo ainda é logado
+    individualmente (`sample_rate=1` loga todos, `0` nenhum); eventos com
+    `force=True` (erros, respostas não-2xx) são sempre logados.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        spider: str,
+        sample_rate: int = 100,
+        summary_every_items: int = 1000,
+        summary_interval_secs: float = 60.0,
+        logger: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.scope = scope
+        self.spider = spider
+        self.sample_rate = max(0, sample_rate)
+        self.summary_every_items = max(1, summary_every_items)
+        self.summary_interval_secs = summary_interval_secs
+        self.log = logger or structlog.get_logger(f"job_finder.{scope}")
+        self._clock = clock
+        self._seen: Counter[str] = Counter()
+        self._window: Counter[str] = Counter()
+        self._window_items = 0
+        self._window_started = clock()
+
+    @classmethod
+    def from_settings(cls, settings: Any, scope: str, spider: str, **kwargs: Any) -> LogAggregator:
+        return cls(
+            scope,
+            spider,
+            sample_rate=settings.getint("LOG_SAMPLE_RATE", 100),
+            summary_every_items=settings.getint("LOG_SUMMARY_EVERY_ITEMS", 1000),
+            summary_interval_secs=settings.getfloat("LOG_SUMMARY_INTERVAL_SECS", 60.0),
+            **kwargs,
+        )
+
+    def record(
+        self,
+        event: str,
+        key: str | None = None,
+        force: bool = False,
+        level: str = "info",
+        **fields: Any,
+    ) -> None:
+        """Conta `event` (agrupado por `key`, ex.: status HTTP) e loga se amostrado."""
+        self._window[f"{event}:{key}" if key is not None else event] += 1
+        self._window_items += 1
+        self._seen[event] += 1
+        if force:
+            getattr(self.log, level)(event, spider=self.spider, **fields)
+        elif self.sample_rate and (self._seen[event] - 1) % self.sample_rate == 0:
+            getattr(self.log, level)(
+                event, spider=self.spider, sample_rate=self.sample_rate, **fields
+            )
+        if (
+            self._window_items >= self.summary_every_items
+            or self._clock() - self._window_started >= self.summary_interval_secs
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Emite o resumo da janela corrente (se houver eventos) e abre outra."""
+        now = self._clock()
+        if self._window_items:
+            self.log.info(
+                f"{self.scope}_summary",
+                spider=self.spider,
+                events=self._window_items,
+                counts=dict(self._window),
+                window_secs=round(now - self._window_started, 3),
+            )
+        self._window.clear()
+        self._window_items = 0
+        self._window_started = now
@@ -32,3 +32,101 @@ SCRAPY_BANS = Counter(
 SCRAPY_BAN_PAUSED = Gauge(
     "scrapy_ban_paused", "Spider pausada por ban (1=sim,0=não)", ["spider", "slot"]
 )
+
+# ====== Métricas de Pipelines (escrita no banco) ======
+DB_FLUSHES = Counter(
+    "db_pipeline_flushes_total", "Flushes do buffer do DbPipeline", ["spider", "trigger"]
+)
+DB_FLUSH_ERRORS = Counter(
+    "db_pipeline_flush_errors_total", "Flushes do DbPipeline que falharam", ["spider"]
+)
+DB_ITEM_ERRORS = Counter(
+    "db_pipeline_item_errors_total",
+    "Vagas rejeitadas pelo banco (erro não transitório) no DbPipeline",
+    ["spider"],
+)
+DB_UPSERT_ROWS = Counter(
+    "db_pipeline_rows_total",
+    "Vagas do DbPipeline por resultado do upsert (inserted/updated/unchanged)",
+    ["spider", "outcome"],
+)
+DB_FLUSH_ROWS = Histogram(
+    "db_pipeline_flush_rows",
+    "Linhas gravadas por flush do DbPipeline",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+DB_FLUSH_LATENCY_MS = Histogram(
+    "db_pipeline_flush_latency_ms",
+    "Latência (ms) de cada flush do DbPipeline",
+    buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+COMPANY_CACHE_HITS = Counter(
+    "company_cache_hits_total", "Empresas resolvidas pelo cache local (nome→id)", ["spider"]
+)
+COMPANY_CACHE_MISSES = Counter(
+    "company_cache_misses_total", "Empresas resolvidas no banco (cache miss)", ["spider"]
+)
+DEDUPE_HITS = Counter(
+    "dedupe_hits_total", "Vagas descartadas por já existirem sem mudanças", ["source"]
+)
+DEDUPE_INDEX_SIZE = Gauge(
+    "dedupe_index_jobs", "Vagas no índice de checksums do DedupePipeline", ["source"]
+)
+INGEST_INVALID_ITEMS = Counter(
+    "ingest_invalid_items_total", "Itens descartados na validação (por campo)", ["source", "field"]
+)
+DB_WRITER_IN_FLIGHT = Gauge(
+    "db_writer_in_flight", "Itens aguardando a thread escritora do DbPipeline", ["spider"]
+)
+DB_WRITER_PAUSES = Counter(
+    "db_writer_pauses_total", "Pausas do engine por backpressure da escrita no banco", ["spider"]
+)
+SPOOL_RECORDS = Counter("spool_records_total", "Itens gravados no spool local", ["spider"])
+
+# ====== Métricas da API ======
+API_CACHE_HITS = Counter("api_cache_hits_total", "Respostas servidas do cache", ["path", "tier"])
+API_CACHE_MISSES = Counter("api_cache_misses_total", "Respostas calculadas no banco", ["path"])
+API_CACHE_STALE = Counter(
+    "api_cache_stale_served_total",
+    "Respostas de geração antiga servidas porque o banco falhou",
+    ["path"],
+)
+API_EXPORT_ROWS = Counter("api_export_rows_total", "Vagas enviadas pelo /jobs/export", ["format"])
+API_NOT_MODIFIED = Counter(
+    "api_not_modified_total", "Respostas 304 (ETag/Last-Modified ainda válidos)", ["path"]
+)
+API_ADMISSION_IN_FLIGHT = Gauge(
+    "api_admission_in_flight",
+    "Requests com vaga no limitador de concorrência",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+API_ADMISSION_QUEUE = Gauge(
+    "api_admission_queue_depth",
+    "Requests esperando vaga no limitador",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+API_ADMISSION_WAIT_MS = Histogram(
+    "api_admission_wait_ms",
+    "Espera por vaga no limitador (ms)",
+    ["pool"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+API_ADMISSION_SHED = Counter(
+    "api_admission_shed_total",
+    "Requests recusadas com 503 (fila cheia, prazo de espera ou statement_timeout)",
+    ["pool", "reason"],
+)
+
+# ====== Métricas de roteamento de leitura (réplica) ======
+DB_REPLICA_LAG_SECS = Gauge(
+    "db_replica_lag_seconds",
+    "Atraso medido da réplica de leitura da API",
+    multiprocess_mode="livemax",
+)
+DB_READ_FALLBACKS = Counter(
+    "db_read_fallbacks_total",
+    "Sessões de leitura da API enviadas ao primário (réplica atrasada ou fora)",
+    ["reason"],
+)
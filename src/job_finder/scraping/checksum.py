@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any, Final
+
+# Campos de conteúdo que definem "a vaga mudou?" (mesma ordem do dedupe original)
+CONTENT_FIELDS: Final[tuple[str, ...]] = (
+    "title",
+    "description_html",
+    "description_text",
+    "location",
+    "remote",
+    "employment_type",
+    "seniority",
+    "currency",
+    "salary_min",
+    "salary_max",
+    "language",
+    "posted_at",
+)
+DIGEST_SIZE: Final[int] = 16
+# Entradas ordenadas por vez ao montar o índice (lista temporária de tuplas)
+SORT_CHUNK: Final[int] = 65_536
+
+
+def normalize_for_hash(d: dict[str, Any]) -> dict[str, Any]:
+    """Normaliza estrutura para um hash estável (strings, floats, isoformat)."""
+    out: dict[str, Any] = {}
+    for k, v in d.items():
+        if isinstance(v, datetime):
+            # aware → UTC: o mesmo instante gera o mesmo hash vindo da fonte ou do banco
+            out[k] = (v.astimezone(timezone.utc) if v.tzinfo else v).isoformat()
+        elif isinstance(v, (int, float)) or v is None or isinstance(v, bool):
+            out[k] = v
+        else:
+            out[k] = str(v) if v is not None else None
+    return out
+
+
+def content_fields(obj: Any) -> dict[str, Any]:
+    """Extrai os campos de conteúdo de um `JobIngest`, `Job` ou linha de SELECT."""
+    out = {f: getattr(obj, f) for f in CONTENT_FIELDS}
+    for f in ("salary_min", "salary_max"):
+        if out[f] is not None:
+            out[f] = float(out[f])
+    return out
+
+
+def content_digest(d: dict[str, Any]) -> bytes:
+    """SHA-256 dos campos normalizados, truncado em `DIGEST_SIZE` bytes."""
+    payload = json.dumps(normalize_for_hash(d), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).digest()[:DIGEST_SIZE]
+
+
+def _key(external_id: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(external_id.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class ChecksumIndex:
+    """Mapa compacto `external_id → digest` de uma fonte, para dedupe em memória.
+
+    Guarda um hash de 64 bits do `external_id` num `array('Q')` ordenado e os
+    digests de 16 bytes num único `bytes` paralelo: ~24 bytes por vaga
+    (≈24 MB para 1M vagas), contra >100 bytes/entrada de um `dict[str, bytes]`.
+    A busca é binária; vagas vistas durante o crawl vão para um overlay pequeno.
+
+    A ordenação é feita em blocos de `SORT_CHUNK` entradas, depois intercalados:
+    o pico de memória fica em ~2× o índice compacto mais um bloco, sem uma lista
+    Python do tamanho da fonte inteira.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, bytes]] = ()) -> None:
+        runs = list(_sorted_runs(entries))
+        self._keys = array("Q")
+        digests = bytearray()
+        for key, digest in heapq.merge(*(_iter_run(*run) for run in runs)):
+            self._keys.append(key)
+            digests += digest
+        self._digests = bytes(digests)
+        self._recent: dict[int, bytes] = {}
+        # chaves do overlay que também estão no array: contadas uma vez só em len()
+        self._overlap = 0
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._recent) - self._overlap
+
+    def get(self, external_id: str) -> bytes | None:
+        key = _key(external_id)
+        recent = self._recent.get(key)
+        if recent is not None:
+            return recent
+        i = self._find(key)
+        if i is None:
+            return None
+        return self._digests[i * DIGEST_SIZE : (i + 1) * DIGEST_SIZE]
+
+    def remember(self, external_id: str, digest: bytes) -> None:
+        """Registra o digest mais recente de uma vaga que seguiu no pipeline."""
+        key = _key(external_id)
+        if key not in self._recent and self._find(key) is not None:
+            self._overlap += 1
+        self._recent[key] = digest[:DIGEST_SIZE]
+
+    def _find(self, key: int) -> int | None:
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return None
+
+
+def _sorted_runs(entries: Iterable[tuple[str, bytes]]) -> Iterator[tuple[array[int], bytes]]:
+    """Blocos de até `SORT_CHUNK` entradas, cada um ordenado por chave e já compacto."""
+    chunk: list[tuple[int, bytes]] = []
+    for external_id, digest in entries:
+        chunk.append((_key(external_id), digest[:DIGEST_SIZE]))
+        if len(chunk) >= SORT_CHUNK:
+            yield _compact(chunk)
+            chunk = []
+    if chunk:
+        yield _compact(chunk)
+
+
+def _compact(chunk: list[tuple[int, bytes]]) -> tuple[array[int], bytes]:
+    chunk.sort()
+    return array("Q", (key for key, _ in chunk)), b"".join(digest for _, digest in chunk)
+
+
+def _iter_run(keys: array[int], digests: bytes) -> Iterator[tuple[int, bytes]]:
+    for i, key in enumerate(keys):
+        yield key, digests[i * DIGEST_SIZE : (i + 1) * DIGEST_SIZE]
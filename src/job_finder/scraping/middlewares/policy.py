@@ -2,19 +2,43 @@
 from __future__ import annotations
 
 import time
+from typing import Any
 
 import scrapy
 import structlog
+from scrapy import signals
 from scrapy.http import Request, Response
 
 from job_finder.obs import metrics as m
+from job_finder.obs.log_sampling import LogAggregator
 
 log = structlog.get_logger(__name__)
 
 
 class PolicyMiddleware:
-    def __init__(self) -> None:
+    """Métricas e logs de request/response.
+
+    O `http_response` passa por um `LogAggregator`: respostas 2xx são contadas
+    por status e só 1 a cada `LOG_SAMPLE_RATE` vira linha de log; respostas não-2xx
+    são sempre logadas. O resumo por spider sai a cada `LOG_SUMMARY_EVERY_ITEMS`
+    respostas, `LOG_SUMMARY_INTERVAL_SECS` segundos e no fechamento da spider.
+    """
+
+    def __init__(self, settings: Any = None) -> None:
         self._t0: dict[int, float] = {}
+        self.settings = settings
+        self._aggregators: dict[str, LogAggregator] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> PolicyMiddleware:
+        mw = cls(settings=crawler.settings)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def spider_closed(self, spider: scrapy.Spider) -> None:
+        aggregator = self._aggregators.pop(getattr(spider, "name", "unknown"), None)
+        if aggregator is not None:
+            aggregator.flush()
 
     def process_request(self, request: Request, spider: scrapy.Spider) -> None:
         self._t0[id(request)] = time.perf_counter()
@@ -54,14 +78,29 @@ class PolicyMiddleware:
         response: Response,
         latency_ms: float,
     ) -> None:
-        log.info(
+        ok = 200 <= response.status < 300
+        self._aggregator(spider).record(
             "http_response",
+            key=str(response.status),
+            force=not ok,
+            level="info" if ok else "warning",
             source=getattr(spider, "name", "unknown"),
             url=str(response.url),
             status_code=response.status,
             latency_ms=int(latency_ms),
         )
 
+    def _aggregator(self, spider: scrapy.Spider) -> LogAggregator:
+        name = getattr(spider, "name", "unknown")
+        aggregator = self._aggregators.get(name)
+        if aggregator is None:
+            if self.settings is None:
+                aggregator = LogAggregator("http", name, logger=log)
+            else:
+                aggregator = LogAggregator.from_settings(self.settings, "http", name, logger=log)
+            self._aggregators[name] = aggregator
+        return aggregator
+
     def _emit_response_metrics(
         self,
         spider: scrapy.Spider,
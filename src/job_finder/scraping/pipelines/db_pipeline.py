@@ -1,76 +1,422 @@
 # src/job_finder/scraping/pipelines/db_pipeline.py
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, cast
 
 import scrapy
 import structlog
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+from scrapy.utils.defer import deferred_from_coro
 from sqlalchemy.orm import Session
+from twisted.internet import reactor as _reactor
+from twisted.internet import task, threads
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
 
-from job_finder.db.models.company import Company
-from job_finder.db.models.job import Job
-from job_finder.db.session import SessionLocal
-from job_finder.scraping.schemas import JobIngest
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.job_writer import write_batch
+from job_finder.db.session import TRANSIENT_DB_ERRORS, SessionLocal
+from job_finder.db.upsert import LAST_SEEN_PENDING_MAX, UpsertStats, touch_last_seen
+from job_finder.obs import metrics as m
+from job_finder.scraping.schemas import JobIngest, as_job_ingest
+from job_finder.scraping.signals import job_seen
 
 log = structlog.get_logger(__name__)
+reactor = cast(Any, _reactor)
+
+# vaga em buffer; no modo assíncrono, com o Deferred devolvido pelo `process_item`
+Pending = tuple[JobIngest, datetime, "Deferred[None] | None"]
+
+# teto do backoff entre tentativas de flush
+RETRY_BACKOFF_MAX_SECS = 60.0
+
+
+class DbWriteFailed(RuntimeError):
+    """Vagas que continuaram sem gravar após todas as tentativas do flush final."""
 
 
 class DbPipeline:
+    """Persiste vagas em `jobs` com upserts multi-linha em lote.
+
+    Os itens validados ficam em buffer e são gravados num único
+    `INSERT ... ON CONFLICT (source, external_id) DO UPDATE` quando o buffer
+    atinge `DB_PIPELINE_BATCH_SIZE`, quando o timer de `DB_PIPELINE_FLUSH_INTERVAL`
+    dispara ou no `close_spider`. `batch_size=1` reproduz a gravação item a item.
+    As empresas do lote são resolvidas de uma vez pelo `CompanyCache`.
+
+    Com `BULK_LOAD` ligado (somente Postgres), cada flush vira um `COPY` para
+    staging seguido de um merge set-based (ver `job_finder.db.bulk_load`).
+
+    Com `DB_PIPELINE_SKIP_UNCHANGED` (padrão), vagas revistas sem mudança não são
+    reescritas: o upsert só faz o DO UPDATE quando algo difere, e o `last_seen_at`
+    dessas vagas é gravado em lote (no fim da execução ou a cada
+    `LAST_SEEN_PENDING_MAX` chaves). As vagas descartadas antes, pelo `DedupePipeline`
+    (sinal `job_seen`), entram no mesmo toque, também gravado pela thread escritora.
+    Os totais inserted/updated/unchanged vão para
+    `db_pipeline_rows_total` e para o log `db_pipeline_summary`.
+
+    Com `DB_PIPELINE_ASYNC` ligado, todo acesso ao banco (buffer, flush, commit)
+    roda numa thread escritora dedicada e `process_item` devolve um `Deferred`
+    que só dispara depois do flush que grava (ou rejeita) a vaga: o reactor nunca
+    espera o Postgres e um item só sai do pipeline gravado. A thread única preserva
+    a ordem dos itens; acima de `DB_PIPELINE_MAX_IN_FLIGHT` itens ainda não gravados
+    (no mínimo dois lotes) o engine é pausado até a fila cair pela metade, e o
+    `close_spider` só termina após o flush final.
+
+    Um flush nunca descarta o lote: em erro transitório (`TRANSIENT_DB_ERRORS`)
+    as vagas voltam ao início do buffer e o flush é refeito com backoff exponencial
+    (`DB_PIPELINE_RETRY_BACKOFF`); após `DB_PIPELINE_MAX_RETRIES` falhas seguidas a
+    spider é encerrada e o flush final tenta de novo, levantando `DbWriteFailed` se
+    ainda sobrar vaga. No modo assíncrono, desistir falha os Deferreds das vagas em
+    buffer (o Scrapy registra o erro de cada item). Em erro de dado, o lote é regravado vaga a vaga e só as
+    rejeitadas pelo banco ficam de fora (log `write_job_failed`).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        company_cache_size: int = 50_000,
+        bulk: bool = False,
+        async_writes: bool = False,
+        max_in_flight: int = 1000,
+        skip_unchanged: bool = True,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        crawler: scrapy.crawler.Crawler | None = None,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.company_cache_size = company_cache_size
+        self.bulk = bulk
+        self.async_writes = async_writes
+        self.max_in_flight = max(1, max_in_flight)
+        if async_writes:
+            # o buffer inteiro conta como em voo: abaixo de dois lotes o engine
+            # pausaria antes de o flush por tamanho disparar
+            self.max_in_flight = max(self.max_in_flight, 2 * self.batch_size)
+        self.skip_unchanged = skip_unchanged
+        self.max_retries = max(1, max_retries)
+        self.retry_backoff = retry_backoff
+        self.crawler = crawler
+        self._buffer: list[Pending] = []
+        self._failures = 0
+        self._retry_at = 0.0
+        self._closing = False
+        self._timer: task.LoopingCall | None = None
+        self._pool: ThreadPool | None = None
+        self._in_flight = 0
+        self._paused = False
+        self._stats = UpsertStats()
+        self._seen: list[tuple[str, str]] = []
+        # chaves do sinal `job_seen`, acumuladas no reactor até irem para a escrita
+        self._dropped: list[tuple[str, str]] = []
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> DbPipeline:
+        bs = int(crawler.settings.getint("DB_PIPELINE_BATCH_SIZE", 500))
+        fi = float(crawler.settings.getfloat("DB_PIPELINE_FLUSH_INTERVAL", 5.0))
+        cs = int(crawler.settings.getint("COMPANY_CACHE_SIZE", 50_000))
+        bulk = crawler.settings.getbool("BULK_LOAD", False)
+        aw = crawler.settings.getbool("DB_PIPELINE_ASYNC", False)
+        mif = int(crawler.settings.getint("DB_PIPELINE_MAX_IN_FLIGHT", 1000))
+        su = crawler.settings.getbool("DB_PIPELINE_SKIP_UNCHANGED", True)
+        mr = int(crawler.settings.getint("DB_PIPELINE_MAX_RETRIES", 3))
+        rb = float(crawler.settings.getfloat("DB_PIPELINE_RETRY_BACKOFF", 1.0))
+        pipeline = cls(
+            batch_size=bs,
+            flush_interval=fi,
+            company_cache_size=cs,
+            bulk=bulk,
+            async_writes=aw,
+            max_in_flight=mif,
+            skip_unchanged=su,
+            max_retries=mr,
+            retry_backoff=rb,
+            crawler=crawler,
+        )
+        crawler.signals.connect(pipeline.job_seen, signal=job_seen)
+        return pipeline
+
     def open_spider(self, spider: scrapy.Spider) -> None:
         self.db: Session = SessionLocal()
+        self._spider_name = getattr(spider, "name", "unknown")
+        self._run_started_at = datetime.now(timezone.utc)
+        self.companies = CompanyCache(max_size=self.company_cache_size, spider=self._spider_name)
+        if not self.bulk:
+            warmed = self.companies.warm(self.db)
+            self.db.commit()
+            log.info("company_cache_warmed", spider=self._spider_name, companies=warmed)
+        if self.async_writes:
+            self._pool = ThreadPool(minthreads=1, maxthreads=1, name="db-writer")
+            self._pool.start()
+        if self.flush_interval > 0:
+            self._timer = task.LoopingCall(self._submit, self._flush, "timer")
+            self._timer.start(self.flush_interval, now=False)
 
-    def close_spider(self, spider: scrapy.Spider) -> None:
-        self.db.close()
-
-    def _get_or_create_company(self, name: str | None) -> Company | None:
-        if not name:
+    def close_spider(self, spider: scrapy.Spider) -> Deferred[None] | None:
+        if self._timer is not None and self._timer.running:
+            self._timer.stop()
+        self._timer = None
+        self._submit_dropped()
+        if self._pool is None:
+            self._close()
             return None
-        company = self.db.scalar(select(Company).where(Company.name == name))
-        if company:
-            return company
-        company = Company(name=name)
-        self.db.add(company)
-        self.db.commit()
-        self.db.refresh(company)
-        return company
-
-    def process_item(self, item: dict[str, Any], spider: scrapy.Spider) -> dict[str, Any]:
-        data = JobIngest(**item)
-        company = self._get_or_create_company(data.company_name)
-
-        payload: dict[str, Any] = {
-            "external_id": data.external_id,
-            "source": data.source,
-            "source_url": str(data.source_url),
-            "title": data.title,
-            "description_html": data.description_html,
-            "description_text": data.description_text,
-            "company_id": getattr(company, "id", None),
-            "location": data.location,
-            "remote": data.remote,
-            "employment_type": data.employment_type,
-            "seniority": data.seniority,
-            "currency": data.currency,
-            "salary_min": data.salary_min,
-            "salary_max": data.salary_max,
-            "tags": data.tags,
-            "language": data.language,
-            "posted_at": data.posted_at,
-            "scraped_at": datetime.now(timezone.utc),
-        }
-
-        stmt = (
-            insert(Job)
-            .values(**payload)
-            .on_conflict_do_update(
-                index_elements=["source", "external_id"],
-                set_={k: v for k, v in payload.items() if k not in {"source", "external_id"}},
+        # enfileirado atrás de todo o trabalho pendente: flush final em ordem
+        d: Deferred[None] = self._submit(self._close)
+        d.addBoth(self._stop_pool)
+        return d
+
+    def process_item(
+        self, item: JobIngest | dict[str, Any], spider: scrapy.Spider
+    ) -> JobIngest | dict[str, Any] | Deferred[JobIngest | dict[str, Any]]:
+        data = as_job_ingest(item)
+        scraped_at = datetime.now(timezone.utc)
+        if self._pool is None:
+            self._accept(data, scraped_at, None)
+            return item
+        self._in_flight += 1
+        self._update_backpressure()
+        done: Deferred[None] = Deferred()
+        released = done.addBoth(self._release, item)
+        self._submit(self._accept, data, scraped_at, done).addErrback(self._accept_failed, done)
+        return released
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pool is None:
+            return fn(*args)
+        return threads.deferToThreadPool(reactor, self._pool, fn, *args)
+
+    def _accept(self, data: JobIngest, scraped_at: datetime, done: Deferred[None] | None) -> None:
+        self._buffer.append((data, scraped_at, done))
+        if len(self._buffer) >= self.batch_size:
+            self._flush("size")
+
+    def _close(self) -> None:
+        self._closing = True
+        try:
+            self._drain()
+            self._touch_seen()
+        finally:
+            self.db.close()
+        log.info(
+            "db_pipeline_summary",
+            spider=self._spider_name,
+            inserted=self._stats.inserted,
+            updated=self._stats.updated,
+            unchanged=self._stats.unchanged,
+        )
+
+    def _drain(self) -> None:
+        """Flush final, com as mesmas tentativas; o que não gravar é erro, não perda."""
+        for _ in range(self.max_retries):
+            self._flush("close")
+            if not self._buffer:
+                return
+            time.sleep(max(0.0, self._retry_at - time.monotonic()))
+        log.error("db_pipeline_unwritten", spider=self._spider_name, rows=len(self._buffer))
+        error = DbWriteFailed(f"{len(self._buffer)} vagas não gravadas ({self._spider_name})")
+        self._settle(self._buffer, error)
+        raise error
+
+    def job_seen(self, source: str, external_id: str) -> bool:
+        """Receptor do sinal `job_seen`: o `last_seen_at` vai no toque em lote da escrita."""
+        self._dropped.append((source, external_id))
+        if len(self._dropped) >= self.batch_size:
+            self._submit_dropped()
+        return True
+
+    def _submit_dropped(self) -> None:
+        if self._dropped:
+            keys, self._dropped = self._dropped, []
+            self._submit(self._add_seen, keys)
+
+    def _add_seen(self, keys: list[tuple[str, str]]) -> None:
+        self._seen.extend(keys)
+        if len(self._seen) >= LAST_SEEN_PENDING_MAX:
+            self._touch_seen()
+
+    def _touch_seen(self) -> None:
+        if not self._seen:
+            return
+        keys, self._seen = self._seen, []
+        try:
+            touched = touch_last_seen(self.db, keys, self._run_started_at)
+            self.db.commit()
+        except TRANSIENT_DB_ERRORS:
+            # só perde o last_seen_at desta leva; as vagas já estão gravadas
+            self.db.rollback()
+            log.exception("touch_last_seen_failed", spider=self._spider_name, keys=len(keys))
+            return
+        log.info("touch_last_seen", spider=self._spider_name, keys=len(keys), rows=touched)
+
+    def _stop_pool(self, result: Any) -> Any:
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+        return result
+
+    def _accept_failed(self, failure: Failure, done: Deferred[None]) -> None:
+        # erro antes de a vaga entrar no buffer (ou num flush que não a resolveu)
+        if not done.called:
+            done.errback(failure)
+
+    def _release(self, result: Any, item: JobIngest | dict[str, Any]) -> Any:
+        self._in_flight -= 1
+        self._update_backpressure()
+        if isinstance(result, Failure):
+            return result
+        return item
+
+    def _update_backpressure(self) -> None:
+        m.DB_WRITER_IN_FLIGHT.labels(spider=self._spider_name).set(self._in_flight)
+        engine = getattr(self.crawler, "engine", None)
+        if engine is None:
+            return
+        if not self._paused and self._in_flight >= self.max_in_flight:
+            self._paused = True
+            m.DB_WRITER_PAUSES.labels(spider=self._spider_name).inc()
+            log.warning(
+                "db_writer_backpressure", spider=self._spider_name, in_flight=self._in_flight
             )
+            engine.pause()
+        elif self._paused and self._in_flight <= self.max_in_flight // 2:
+            self._paused = False
+            engine.unpause()
+
+    def _flush(self, trigger: str) -> None:
+        if not self._buffer:
+            return
+        if trigger != "close" and time.monotonic() < self._retry_at:
+            return  # em backoff: o próximo gatilho depois do prazo refaz o flush
+        pending, self._buffer = self._buffer, []
+        started_at = time.perf_counter()
+        try:
+            stats = self._write(pending)
+        except TRANSIENT_DB_ERRORS:
+            self._requeue(pending)
+            return
+        except Exception:
+            self.db.rollback()
+            m.DB_FLUSH_ERRORS.labels(spider=self._spider_name).inc()
+            log.exception("flush_jobs_failed", spider=self._spider_name, rows=len(pending))
+            stats = self._write_each(pending)
+        self._record(stats, trigger, started_at)
+
+    def _write(self, pending: list[Pending]) -> UpsertStats:
+        stats = write_batch(
+            self.db,
+            self.companies,
+            [(data, scraped_at) for data, scraped_at, _ in pending],
+            bulk=self.bulk,
+            skip_unchanged=self.skip_unchanged,
         )
-        self.db.execute(stmt)
         self.db.commit()
-        log.info("upsert_job", source=data.source, external_id=data.external_id)
-        return item
+        self._failures = 0
+        self._retry_at = 0.0
+        self._settle(pending)
+        return stats
+
+    def _write_each(self, pending: list[Pending]) -> UpsertStats:
+        """Regrava um lote rejeitado vaga a vaga, isolando as que o banco recusa."""
+        stats = UpsertStats()
+        for i, entry in enumerate(pending):
+            try:
+                stats += self._write([entry])
+            except TRANSIENT_DB_ERRORS:
+                self._requeue(pending[i:])
+                break
+            except Exception as exc:
+                self.db.rollback()
+                m.DB_ITEM_ERRORS.labels(spider=self._spider_name).inc()
+                data = entry[0]
+                log.exception(
+                    "write_job_failed",
+                    spider=self._spider_name,
+                    source=data.source,
+                    external_id=data.external_id,
+                )
+                self._settle([entry], exc)
+        return stats
+
+    def _settle(self, pending: list[Pending], error: Exception | None = None) -> None:
+        """Dispara (no reactor) os Deferreds das vagas assíncronas: gravadas ou com erro."""
+        for _, _, done in pending:
+            if done is None:
+                continue
+            if error is None:
+                reactor.callFromThread(done.callback, None)
+            else:
+                reactor.callFromThread(done.errback, error)
+
+    def _requeue(self, pending: list[Pending]) -> None:
+        """Devolve o lote ao início do buffer (mesma ordem) e agenda nova tentativa."""
+        self.db.rollback()
+        self._buffer[:0] = pending
+        self._failures += 1
+        m.DB_FLUSH_ERRORS.labels(spider=self._spider_name).inc()
+        delay = min(self.retry_backoff * 2 ** (self._failures - 1), RETRY_BACKOFF_MAX_SECS)
+        self._retry_at = time.monotonic() + delay
+        log.warning(
+            "flush_jobs_retry",
+            spider=self._spider_name,
+            rows=len(pending),
+            failures=self._failures,
+            retry_in_secs=delay,
+            exc_info=True,
+        )
+        if self._failures < self.max_retries or self._closing:
+            return
+        if self._failures == self.max_retries:
+            log.error(
+                "flush_jobs_gave_up",
+                spider=self._spider_name,
+                rows=len(self._buffer),
+                failures=self._failures,
+            )
+            self._stop_crawl("db_write_failed")
+        if self._pool is not None:
+            # itens assíncronos presos no buffer travariam o fechamento do scraper;
+            # no modo síncrono as vagas ficam para o flush final
+            failed, self._buffer = self._buffer, []
+            self._settle(failed, DbWriteFailed(f"{len(failed)} vagas não gravadas"))
+
+    def _stop_crawl(self, reason: str) -> None:
+        engine = getattr(self.crawler, "engine", None)
+        if engine is None:
+            return
+        # pode vir da thread escritora: o engine só é tocado no reactor
+        reactor.callFromThread(self._close_spider, engine, reason)
+
+    def _close_spider(self, engine: Any, reason: str) -> Deferred[None]:
+        # Scrapy >= 2.14: close_spider_async; antes, só close_spider(spider, reason)
+        if hasattr(engine, "close_spider_async"):
+            return deferred_from_coro(engine.close_spider_async(reason=reason))
+        d: Deferred[None] = engine.close_spider(getattr(self.crawler, "spider", None), reason)
+        return d
+
+    def _record(self, stats: UpsertStats, trigger: str, started_at: float) -> None:
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        m.DB_FLUSHES.labels(spider=self._spider_name, trigger=trigger).inc()
+        m.DB_FLUSH_ROWS.observe(stats.written)
+        m.DB_FLUSH_LATENCY_MS.observe(latency_ms)
+        for outcome in ("inserted", "updated", "unchanged"):
+            m.DB_UPSERT_ROWS.labels(spider=self._spider_name, outcome=outcome).inc(
+                getattr(stats, outcome)
+            )
+        log.info(
+            "flush_jobs",
+            spider=self._spider_name,
+            trigger=trigger,
+            rows=stats.written,
+            unchanged=stats.unchanged,
+            latency_ms=int(latency_ms),
+        )
+        self._seen.extend(stats.seen_keys)
+        stats.seen_keys = []
+        self._stats += stats
+        if len(self._seen) >= LAST_SEEN_PENDING_MAX:
+            self._touch_seen()
@@ -1,9 +1,9 @@
 # src/job_finder/scraping/pipelines/dedupe_pipeline.py
 from __future__ import annotations
 
-import hashlib
-import json
-from datetime import datetime
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from typing import Any
 
 import scrapy
@@ -11,83 +11,161 @@ import structlog
 from scrapy.exceptions import DropItem
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from twisted.internet import threads
+from twisted.internet.defer import Deferred, DeferredList
 
 from job_finder.db.models.job import Job
-from job_finder.db.session import SessionLocal
-from job_finder.scraping.schemas import JobIngest
+from job_finder.db.session import TRANSIENT_DB_ERRORS, SessionLocal
+from job_finder.db.upsert import LAST_SEEN_PENDING_MAX, touch_last_seen
+from job_finder.obs import metrics as m
+from job_finder.obs.log_sampling import LogAggregator
+from job_finder.scraping.checksum import (
+    CONTENT_FIELDS,
+    ChecksumIndex,
+    content_digest,
+    content_fields,
+)
+from job_finder.scraping.schemas import JobIngest, as_job_ingest
+from job_finder.scraping.signals import job_seen
 
 log = structlog.get_logger(__name__)
 
+INDEX_YIELD_PER = 5000
 
-def _normalize_for_hash(d: dict[str, Any]) -> dict[str, Any]:
-    """Normaliza estrutura para um hash estável (strings, floats, isoformat)."""
-    out: dict[str, Any] = {}
-    for k, v in d.items():
-        if isinstance(v, datetime):
-            out[k] = v.isoformat()
-        elif isinstance(v, (int, float)) or v is None or isinstance(v, bool):
-            out[k] = v
-        else:
-            out[k] = str(v) if v is not None else None
-    return out
 
+class DedupePipeline:
+    """Descarta vagas que já existem em `jobs` sem nenhuma mudança de conteúdo.
 
-def _checksum(d: dict[str, Any]) -> str:
-    payload = json.dumps(_normalize_for_hash(d), sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    O índice de checksums da fonte da spider é carregado no `open_spider`, numa
+    única query em streaming, antes de o crawl começar; cada decisão é então uma
+    busca em memória, sem SQL por item. A leitura usa a coluna `content_hash`
+    (range scan da fonte em `uq_jobs_source_external`); só linhas ainda sem
+    backfill têm o hash recalculado a partir do conteúdo. Itens de outra fonte
+    (as spiders só emitem a própria) seguem sem dedupe: o `DbPipeline` já pula a
+    reescrita de vagas sem mudança.
 
+    As vagas descartadas ainda foram vistas nesta execução: suas chaves vão pelo
+    sinal `job_seen` para o `DbPipeline`, que grava o `last_seen_at` em lote na
+    thread escritora. Sem receptor (ex.: modo spool), os toques são feitos aqui,
+    numa thread, a cada `LAST_SEEN_PENDING_MAX` chaves e no `close_spider`. Os
+    descartes são logados de forma agregada/amostrada (ver `LogAggregator`).
+    """
+
+    def __init__(self, settings: Any = None, crawler: scrapy.crawler.Crawler | None = None) -> None:
+        self.settings = settings
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> DedupePipeline:
+        return cls(settings=crawler.settings, crawler=crawler)
 
-class DedupePipeline:
     def open_spider(self, spider: scrapy.Spider) -> None:
+        name = getattr(spider, "name", "unknown")
+        if self.settings is None:
+            self.events = LogAggregator("dedupe", name, logger=log)
+        else:
+            self.events = LogAggregator.from_settings(self.settings, "dedupe", name, logger=log)
+        self._seen: list[tuple[str, str]] = []
+        self._touches: list[Deferred[None]] = []
+        self._run_started_at = datetime.now(timezone.utc)
+        self._source = name
         self.db: Session = SessionLocal()
+        try:
+            self._index = self._load_index(name)
+        finally:
+            self.db.close()
 
-    def close_spider(self, spider: scrapy.Spider) -> None:
-        self.db.close()
+    def close_spider(self, spider: scrapy.Spider) -> Deferred[Any] | None:
+        self.events.flush()
+        self._index = ChecksumIndex()
+        if self._seen:
+            # fim do crawl: nada mais disputa o reactor
+            keys, self._seen = self._seen, []
+            self._touch_seen(keys)
+        if not self._touches:
+            return None
+        return DeferredList(self._touches)
 
-    def process_item(self, item: dict[str, Any], spider: scrapy.Spider) -> dict[str, Any]:
-        data = JobIngest(**item)
-        # Sem external_id não dá para deduplicar fortemente — deixa seguir
-        if not data.external_id:
-            return item
-        # Busca o job existente
-        exists = self.db.scalar(
-            select(Job).where(Job.source == data.source, Job.external_id == data.external_id)
+    def _mark_seen(self, source: str, external_id: str) -> None:
+        if self.crawler is not None:
+            replies = self.crawler.signals.send_catch_log(
+                signal=job_seen, source=source, external_id=external_id
+            )
+            if any(handled is True for _, handled in replies):
+                return
+        self._seen.append((source, external_id))
+        if len(self._seen) >= LAST_SEEN_PENDING_MAX:
+            keys, self._seen = self._seen, []
+            self._touches.append(threads.deferToThread(self._touch_seen, keys))
+
+    def _touch_seen(self, keys: list[tuple[str, str]]) -> None:
+        # sessão própria: pode rodar numa thread, em paralelo com o reactor
+        db = SessionLocal()
+        try:
+            touched = touch_last_seen(db, keys, self._run_started_at)
+            db.commit()
+        except TRANSIENT_DB_ERRORS:
+            db.rollback()
+            log.warning("dedupe_touch_last_seen_failed", keys=len(keys))
+            return
+        finally:
+            db.close()
+        log.info("dedupe_touch_last_seen", keys=len(keys), rows=touched)
+
+    def _index_entries(self, source: str) -> Iterator[tuple[str, bytes]]:
+        base = (Job.source == source, Job.external_id.is_not(None))
+        stmt = (
+            select(Job.external_id, Job.content_hash)
+            .where(*base, Job.content_hash.is_not(None))
+            .execution_options(yield_per=INDEX_YIELD_PER)
+        )
+        for r in self.db.execute(stmt):
+            yield r.external_id, r.content_hash
+
+        legacy = (
+            select(Job.external_id, *(getattr(Job, f) for f in CONTENT_FIELDS))
+            .where(*base, Job.content_hash.is_(None))
+            .execution_options(yield_per=INDEX_YIELD_PER)
         )
-        if not exists:
+        for r in self.db.execute(legacy):
+            yield r.external_id, content_digest(content_fields(r))
+
+    def _load_index(self, source: str) -> ChecksumIndex:
+        started_at = time.perf_counter()
+        try:
+            index = ChecksumIndex(self._index_entries(source))
+        except TRANSIENT_DB_ERRORS:
+            # banco fora do ar não derruba o crawl (ex.: modo spool): segue sem dedupe
+            log.warning("dedupe_index_unavailable", source=source)
+            index = ChecksumIndex()
+        finally:
+            self.db.rollback()
+        m.DEDUPE_INDEX_SIZE.labels(source=source).set(len(index))
+        log.info(
+            "dedupe_index_loaded",
+            source=source,
+            jobs=len(index),
+            latency_ms=int((time.perf_counter() - started_at) * 1000),
+        )
+        return index
+
+    def process_item(
+        self, item: JobIngest | dict[str, Any], spider: scrapy.Spider
+    ) -> JobIngest | dict[str, Any]:
+        data = as_job_ingest(item)
+        # Sem external_id não dá para deduplicar fortemente — deixa seguir
+        if not data.external_id or data.source != self._source:
             return item
-        current = {
-            "title": exists.title,
-            "description_html": exists.description_html,
-            "description_text": exists.description_text,
-            "location": exists.location,
-            "remote": exists.remote,
-            "employment_type": exists.employment_type,
-            "seniority": exists.seniority,
-            "currency": exists.currency,
-            "salary_min": float(exists.salary_min) if exists.salary_min is not None else None,
-            "salary_max": float(exists.salary_max) if exists.salary_max is not None else None,
-            "language": exists.language,
-            "posted_at": exists.posted_at,
-        }
-        incoming = {
-            "title": data.title,
-            "description_html": data.description_html,
-            "description_text": data.description_text,
-            "location": data.location,
-            "remote": data.remote,
-            "employment_type": data.employment_type,
-            "seniority": data.seniority,
-            "currency": data.currency,
-            "salary_min": data.salary_min,
-            "salary_max": data.salary_max,
-            "language": data.language,
-            "posted_at": data.posted_at,
-        }
-        if _checksum(current) == _checksum(incoming):
-            log.info(
+        digest = content_digest(content_fields(data))
+        if self._index.get(data.external_id) == digest:
+            m.DEDUPE_HITS.labels(source=data.source).inc()
+            self.events.record(
                 "drop_duplicate_unchanged",
+                key=data.source,
                 source=data.source,
                 external_id=data.external_id,
             )
+            self._mark_seen(data.source, data.external_id)
             raise DropItem("duplicate_unchanged")
+        self._index.remember(data.external_id, digest)
         return item
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any
+
+import scrapy
+import structlog
+
+from job_finder.obs import metrics as m
+from job_finder.scraping.schemas import JobIngest, as_job_ingest
+from job_finder.scraping.spool import SpoolWriter
+
+log = structlog.get_logger(__name__)
+
+
+class SpoolPipeline:
+    """Grava os itens validados num spool local em vez de escrever no Postgres.
+
+    Substitui o `DbPipeline` quando `SPOOL_DIR` está configurado: o crawl fica
+    limitado pela rede, não pela latência do banco. Os segmentos são drenados
+    depois por `python -m job_finder.scripts.spool drain`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync_every: int = 500,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> SpoolPipeline:
+        return cls(
+            directory=crawler.settings.get("SPOOL_DIR") or ".scrapy/spool",
+            segment_bytes=crawler.settings.getint("SPOOL_SEGMENT_BYTES", 64 * 1024 * 1024),
+            fsync_every=crawler.settings.getint("SPOOL_FSYNC_EVERY", 500),
+            fsync_interval=crawler.settings.getfloat("SPOOL_FSYNC_INTERVAL", 1.0),
+        )
+
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        self._spider_name = getattr(spider, "name", "unknown")
+        self.writer = SpoolWriter(
+            self.directory,
+            prefix=self._spider_name,
+            segment_bytes=self.segment_bytes,
+            fsync_every=self.fsync_every,
+            fsync_interval=self.fsync_interval,
+        )
+        log.info("spool_opened", spider=self._spider_name, directory=self.directory)
+
+    def close_spider(self, spider: scrapy.Spider) -> None:
+        self.writer.close()
+
+    def process_item(
+        self, item: JobIngest | dict[str, Any], spider: scrapy.Spider
+    ) -> JobIngest | dict[str, Any]:
+        self.writer.append(as_job_ingest(item))
+        m.SPOOL_RECORDS.labels(spider=self._spider_name).inc()
+        return item
@@ -0,0 +1,79 @@
+# src/job_finder/scraping/pipelines/validation_pipeline.py
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, Final, NoReturn
+
+import scrapy
+import structlog
+from pydantic import ValidationError
+from scrapy.exceptions import DropItem
+
+from job_finder.obs import metrics as m
+from job_finder.scraping.schemas import JobIngest
+
+log = structlog.get_logger(__name__)
+
+# Caminho rápido: o mínimo que o upsert precisa (chave de conflito, URL e título)
+TRUSTED_REQUIRED: Final[tuple[str, ...]] = ("source", "external_id", "source_url", "title")
+
+
+def trusted_errors(item: dict[str, Any]) -> list[str]:
+    """Campos obrigatórios ausentes, vazios ou com tipo errado num item "confiável"."""
+    bad = [
+        field
+        for field in TRUSTED_REQUIRED
+        if not isinstance(item.get(field), str) or not item[field].strip()
+    ]
+    if "source_url" not in bad and not item["source_url"].startswith(("http://", "https://")):
+        bad.append("source_url")
+    return bad
+
+
+class ValidationPipeline:
+    """Primeiro estágio: valida o item uma única vez e entrega o `JobIngest` adiante.
+
+    Os estágios seguintes recebem o modelo pronto (ver `as_job_ingest`) e não pagam
+    a validação de novo. Spiders com `trusted_items = True` (APIs JSON de formato
+    garantido) usam `model_construct`, sem validação nem parsing de `HttpUrl`; ainda
+    assim os campos de `TRUSTED_REQUIRED` são conferidos (presentes, `str` não vazia,
+    URL http(s)).
+    Itens inválidos são contados por fonte e campo e descartados aqui, em vez de
+    estourarem no meio do pipeline.
+    """
+
+    def process_item(self, item: JobIngest | dict[str, Any], spider: scrapy.Spider) -> JobIngest:
+        if isinstance(item, JobIngest):
+            return item
+        if getattr(spider, "trusted_items", False):
+            return self._construct(item, spider)
+        try:
+            return JobIngest(**item)
+        except ValidationError as exc:
+            fields = {".".join(str(p) for p in err["loc"]) or "__root__" for err in exc.errors()}
+            self._drop(item, spider, fields, exc)
+
+    def _construct(self, item: dict[str, Any], spider: scrapy.Spider) -> JobIngest:
+        bad = trusted_errors(item)
+        if bad:
+            self._drop(item, spider, bad)
+        return JobIngest.model_construct(**item)
+
+    def _drop(
+        self,
+        item: dict[str, Any],
+        spider: scrapy.Spider,
+        fields: Iterable[str],
+        exc: Exception | None = None,
+    ) -> NoReturn:
+        source = str(item.get("source") or getattr(spider, "name", "unknown"))
+        fields = sorted(fields)
+        for field in fields:
+            m.INGEST_INVALID_ITEMS.labels(source=source, field=field).inc()
+        log.warning(
+            "drop_invalid_item",
+            source=source,
+            external_id=item.get("external_id"),
+            fields=fields,
+        )
+        raise DropItem("invalid_item") from exc
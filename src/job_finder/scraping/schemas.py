@@ -1,12 +1,65 @@
 # src/job_finder/scraping/schemas.py
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Any
+from enum import Enum
+from typing import Any, Final
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
+class Seniority(str, Enum):
+    INTERN = "intern"
+    JUNIOR = "junior"
+    MID = "mid"
+    SENIOR = "senior"
+    LEAD = "lead"
+    PRINCIPAL = "principal"
+
+
+# Grafias vistas nas fontes → nível normalizado (chaves em minúsculas, sem pontuação)
+_SENIORITY_ALIASES: Final[dict[str, Seniority]] = {
+    "intern": Seniority.INTERN,
+    "internship": Seniority.INTERN,
+    "estagio": Seniority.INTERN,
+    "estágio": Seniority.INTERN,
+    "estagiario": Seniority.INTERN,
+    "estagiário": Seniority.INTERN,
+    "junior": Seniority.JUNIOR,
+    "jr": Seniority.JUNIOR,
+    "júnior": Seniority.JUNIOR,
+    "entry": Seniority.JUNIOR,
+    "entry level": Seniority.JUNIOR,
+    "mid": Seniority.MID,
+    "mid level": Seniority.MID,
+    "middle": Seniority.MID,
+    "intermediate": Seniority.MID,
+    "pleno": Seniority.MID,
+    "pl": Seniority.MID,
+    "senior": Seniority.SENIOR,
+    "sr": Seniority.SENIOR,
+    "sênior": Seniority.SENIOR,
+    "lead": Seniority.LEAD,
+    "tech lead": Seniority.LEAD,
+    "staff": Seniority.LEAD,
+    "principal": Seniority.PRINCIPAL,
+    "distinguished": Seniority.PRINCIPAL,
+}
+
+
+def normalize_seniority(value: str | None) -> str | None:
+    """Mapeia a senioridade da fonte para um `Seniority`; grafias desconhecidas viram None.
+
+    O valor cru continua em `jobs.seniority`; o normalizado vai para `jobs.seniority_level`.
+    """
+    if value is None:
+        return None
+    key = " ".join(value.lower().replace(".", " ").replace("-", " ").split())
+    level = _SENIORITY_ALIASES.get(key)
+    return level.value if level is not None else None
+
+
 class JobIngest(BaseModel):
     source: str
     external_id: str | None = None
@@ -26,6 +79,11 @@ class JobIngest(BaseModel):
     description_html: str | None = None
     description_text: str | None = None
 
+    @property
+    def seniority_level(self) -> str | None:
+        """Senioridade normalizada (`Seniority`) do valor cru da fonte."""
+        return normalize_seniority(self.seniority)
+
     @field_validator("salary_max")
     @classmethod
     def _salary_order(cls, value: float | None, info: Any) -> float | None:
@@ -33,3 +91,10 @@ class JobIngest(BaseModel):
         if value is not None and isinstance(min_value, int | float) and value < float(min_value):
             raise ValueError("salary_max < salary_min")
         return value
+
+
+def as_job_ingest(item: JobIngest | Mapping[str, Any]) -> JobIngest:
+    """Reaproveita o modelo já validado por um estágio anterior; valida dicts crus."""
+    if isinstance(item, JobIngest):
+        return item
+    return JobIngest(**item)
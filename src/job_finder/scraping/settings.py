@@ -34,6 +34,12 @@ HTTPCACHE_DIR = os.getenv("SCRAPY_HTTPCACHE_DIR", ".scrapy/httpcache")
 # Logs estruturados
 LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
 LOG_LEVEL = "INFO"
+# Eventos por item/response são agregados: 1 a cada N vira linha de log (1 = todos,
+# 0 = nenhum) e um resumo por spider sai a cada N eventos ou T segundos.
+# Erros e respostas não-2xx são sempre logados.
+LOG_SAMPLE_RATE = int(os.getenv("SCRAPY_LOG_SAMPLE_RATE", "100"))
+LOG_SUMMARY_EVERY_ITEMS = int(os.getenv("SCRAPY_LOG_SUMMARY_EVERY_ITEMS", "1000"))
+LOG_SUMMARY_INTERVAL_SECS = float(os.getenv("SCRAPY_LOG_SUMMARY_INTERVAL_SECS", "60"))
 
 DOWNLOADER_MIDDLEWARES = {
     "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
@@ -56,10 +62,43 @@ RETRY_BACKOFF_MAX = float(os.getenv("SCRAPY_RETRY_BACKOFF_MAX", "60"))
 RETRY_PRIORITY_ADJUST = -1
 
 ITEM_PIPELINES = {
+    "job_finder.scraping.pipelines.validation_pipeline.ValidationPipeline": 100,
     "job_finder.scraping.pipelines.dedupe_pipeline.DedupePipeline": 200,
     "job_finder.scraping.pipelines.db_pipeline.DbPipeline": 300,
 }
 
+# ===== Escrita em lote no banco (DbPipeline) =====
+# Flush quando o buffer atinge N itens ou a cada T segundos (o que vier primeiro)
+DB_PIPELINE_BATCH_SIZE = int(os.getenv("SCRAPY_DB_BATCH_SIZE", "500"))
+DB_PIPELINE_FLUSH_INTERVAL = float(os.getenv("SCRAPY_DB_FLUSH_INTERVAL", "5.0"))
+# Flush que falha por erro transitório volta ao buffer e é refeito com backoff
+# exponencial (base em segundos); após N falhas seguidas a spider é encerrada
+DB_PIPELINE_MAX_RETRIES = int(os.getenv("SCRAPY_DB_MAX_RETRIES", "3"))
+DB_PIPELINE_RETRY_BACKOFF = float(os.getenv("SCRAPY_DB_RETRY_BACKOFF", "1.0"))
+# Cache LRU nome→id de empresas (aquecido no open_spider)
+COMPANY_CACHE_SIZE = int(os.getenv("SCRAPY_COMPANY_CACHE_SIZE", "50000"))
+# Carga em massa (somente Postgres): cada flush vira COPY → staging → merge set-based
+BULK_LOAD = os.getenv("SCRAPY_BULK_LOAD", "0") == "1"
+# Escrita fora do reactor (thread escritora dedicada) com backpressure no engine
+DB_PIPELINE_ASYNC = os.getenv("SCRAPY_DB_ASYNC", "1") == "1"
+DB_PIPELINE_MAX_IN_FLIGHT = int(os.getenv("SCRAPY_DB_MAX_IN_FLIGHT", "1000"))
+# Pula o DO UPDATE de vagas sem mudança (só toca last_seen_at, em lote)
+DB_PIPELINE_SKIP_UNCHANGED = os.getenv("SCRAPY_DB_SKIP_UNCHANGED", "1") == "1"
+
+# ===== Spool local (write-ahead) =====
+# Com SCRAPY_SPOOL_DIR definido, os itens vão para segmentos locais em vez do Postgres;
+# drene com: python -m job_finder.scripts.spool drain --dir <dir>
+SPOOL_DIR = os.getenv("SCRAPY_SPOOL_DIR")
+SPOOL_SEGMENT_BYTES = int(os.getenv("SCRAPY_SPOOL_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+SPOOL_FSYNC_EVERY = int(os.getenv("SCRAPY_SPOOL_FSYNC_EVERY", "500"))
+SPOOL_FSYNC_INTERVAL = float(os.getenv("SCRAPY_SPOOL_FSYNC_INTERVAL", "1.0"))
+if SPOOL_DIR:
+    ITEM_PIPELINES = {
+        "job_finder.scraping.pipelines.validation_pipeline.ValidationPipeline": 100,
+        "job_finder.scraping.pipelines.dedupe_pipeline.DedupePipeline": 200,
+        "job_finder.scraping.pipelines.spool_pipeline.SpoolPipeline": 300,
+    }
+
 # Custom user agents (opcional)
 USER_AGENT_LIST: Final[tuple[str, ...]] = ()
 
@@ -0,0 +1,7 @@
+# src/job_finder/scraping/signals.py
+from __future__ import annotations
+
+# Vaga revista sem mudança e descartada antes da escrita (`DedupePipeline`), com
+# `source` e `external_id`: quem grava `jobs` (`DbPipeline`) marca o `last_seen_at`
+# dela na sua thread escritora. O receptor devolve True se assumiu o toque.
+job_seen = object()
@@ -12,6 +12,9 @@ from scrapy.http import Request, Response
 class WorkableSpider(scrapy.Spider):
     name = "workable"
     allowed_domains = ["apply.workable.com"]
+    # API JSON com formato garantido: ValidationPipeline usa o caminho rápido
+    # (que ainda confere shortcode, título e URL; itens sem eles são descartados)
+    trusted_items = True
 
     def __init__(self, org: str | None = None, **kwargs: Any) -> None:
         super().__init__(**kwargs)
@@ -27,10 +30,12 @@ class WorkableSpider(scrapy.Spider):
         except Exception:
             data = {}
         for job in data.get("results", []):
+            shortcode = job.get("shortcode")
             yield {
                 "source": self.name,
-                "external_id": job.get("shortcode"),
-                "source_url": job.get("url") or response.url,
+                "external_id": shortcode,
+                # nunca a URL da listagem: todas as vagas sem `url` cairiam nela
+                "source_url": job.get("url") or self._job_url(shortcode),
                 "title": job.get("title"),
                 "company_name": self.org,
                 "location": (job.get("location", {}) or {}).get("city"),
@@ -38,3 +43,8 @@ class WorkableSpider(scrapy.Spider):
                 "language": "en",
                 "tags": {"board": "workable", "org": self.org},
             }
+
+    def _job_url(self, shortcode: str | None) -> str | None:
+        if not shortcode:
+            return None
+        return f"https://apply.workable.com/{self.org}/j/{shortcode}/"
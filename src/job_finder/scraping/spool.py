@@ -0,0 +1,244 @@
+# src/job_finder/scraping/spool.py
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Final
+
+from job_finder.scraping.schemas import JobIngest
+
+# Frame: tamanho (4 bytes, big-endian) + crc32 do payload (4 bytes) + payload JSON
+_HEADER: Final[struct.Struct] = struct.Struct(">II")
+SEGMENT_SUFFIX: Final[str] = ".seg"
+OPEN_SUFFIX: Final[str] = ".seg.open"
+# registros que não decodificam (JSON/schema), um `<segmento>.ndjson` por segmento
+QUARANTINE_DIR: Final[str] = "quarantine"
+
+
+class SpoolCorruption(Exception):
+    """Frame truncado ou com CRC inválido num segmento selado."""
+
+    def __init__(self, segment: Path, offset: int, reason: str) -> None:
+        super().__init__(f"{segment.name}: {reason} no offset {offset}")
+        self.segment = segment
+        self.offset = offset
+
+
+def encode_record(data: JobIngest, scraped_at: datetime) -> bytes:
+    payload = json.dumps(
+        {"scraped_at": scraped_at.isoformat(), "item": data.model_dump(mode="json")},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_record(payload: bytes) -> tuple[JobIngest, datetime]:
+    raw: dict[str, Any] = json.loads(payload)
+    return JobIngest.model_validate(raw["item"]), datetime.fromisoformat(raw["scraped_at"])
+
+
+class SpoolWriter:
+    """Append-only em segmentos locais, com fsync em lote.
+
+    O segmento corrente é `*.seg.open`; ao atingir `segment_bytes` (ou no close)
+    ele é fsyncado e renomeado para `*.seg`, e só então fica visível ao loader.
+    O fsync acontece a cada `fsync_every` registros ou `fsync_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync_every: int = 500,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._fh: BinaryIO | None = None
+        self._path: Path | None = None
+        self._seq = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def append(self, data: JobIngest, scraped_at: datetime | None = None) -> None:
+        frame = encode_record(data, scraped_at or datetime.now(timezone.utc))
+        fh = self._fh or self._open_segment()
+        fh.write(frame)
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self._sync()
+        if fh.tell() >= self.segment_bytes:
+            self._seal()
+
+    def close(self) -> None:
+        self._seal()
+
+    def _open_segment(self) -> BinaryIO:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        while True:
+            self._seq += 1
+            name = f"{self.prefix}-{stamp}-{os.getpid()}-{self._seq:06d}"
+            self._path = self.directory / f"{name}{OPEN_SUFFIX}"
+            # nunca reaproveita o nome de um segmento existente (o checkpoint é por nome)
+            if (
+                not self._path.exists()
+                and not (self.directory / f"{name}{SEGMENT_SUFFIX}").exists()
+            ):
+                break
+        self._fh = open(self._path, "ab")  # noqa: SIM115 (fechado em _seal)
+        return self._fh
+
+    def _sync(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _seal(self) -> None:
+        if self._fh is None or self._path is None:
+            return
+        self._sync()
+        self._fh.close()
+        sealed = self._path.with_name(self._path.name.removesuffix(OPEN_SUFFIX) + SEGMENT_SUFFIX)
+        os.replace(self._path, sealed)
+        self._fh = None
+        self._path = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def seal_orphans(directory: str | Path) -> list[Path]:
+    """Sela segmentos `.open` deixados por processos que morreram (crash/kill -9).
+
+    A cauda de um crash (frame incompleto ou sem fsync) é cortada antes de selar:
+    depois disso, todo segmento selado tem só frames íntegros.
+    """
+    sealed: list[Path] = []
+    for path in sorted(Path(directory).glob(f"*{OPEN_SUFFIX}")):
+        name = path.name.removesuffix(OPEN_SUFFIX)
+        try:
+            pid = int(name.rsplit("-", 2)[-2])
+        except (IndexError, ValueError):
+            continue
+        if _pid_alive(pid):
+            continue
+        valid = _valid_length(path)
+        if valid < path.stat().st_size:
+            os.truncate(path, valid)
+        target = path.with_name(name + SEGMENT_SUFFIX)
+        os.replace(path, target)
+        sealed.append(target)
+    return sealed
+
+
+def sealed_segments(directory: str | Path) -> list[Path]:
+    """Segmentos prontos para carga, em ordem de criação."""
+    return sorted(Path(directory).glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def read_frames(path: Path, offset: int = 0) -> Iterator[tuple[int, int, bytes]]:
+    """Frames a partir de `offset`: (offset, offset_seguinte, payload).
+
+    Frame truncado ou com CRC inválido levanta `SpoolCorruption` com o offset dele:
+    num segmento selado isso é dano no disco, não cauda de crash (ver `seal_orphans`),
+    e pular em silêncio perderia todos os registros seguintes.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        while True:
+            start = fh.tell()
+            header = fh.read(_HEADER.size)
+            if not header:
+                return
+            if len(header) < _HEADER.size:
+                raise SpoolCorruption(path, start, "cabeçalho truncado")
+            size, crc = _HEADER.unpack(header)
+            payload = fh.read(size)
+            if len(payload) < size:
+                raise SpoolCorruption(path, start, "frame truncado")
+            if zlib.crc32(payload) != crc:
+                raise SpoolCorruption(path, start, "crc inválido")
+            yield start, fh.tell(), payload
+
+
+def read_segment(path: Path, offset: int = 0) -> Iterator[tuple[int, JobIngest, datetime]]:
+    """Lê registros a partir de `offset`; devolve (offset_seguinte, item, scraped_at)."""
+    for _, end, payload in read_frames(path, offset):
+        data, scraped_at = decode_record(payload)
+        yield end, data, scraped_at
+
+
+def _valid_length(path: Path) -> int:
+    """Tamanho do prefixo de frames íntegros do segmento."""
+    valid = 0
+    try:
+        for _, end, _ in read_frames(path):
+            valid = end
+    except SpoolCorruption:
+        pass
+    return valid
+
+
+def quarantine(segment: Path, offset: int, payload: bytes, error: str) -> Path:
+    """Guarda um registro que não decodifica para inspeção; o drain segue adiante."""
+    target = segment.parent / QUARANTINE_DIR / f"{segment.name}.ndjson"
+    target.parent.mkdir(exist_ok=True)
+    line = json.dumps(
+        {
+            "segment": segment.name,
+            "offset": offset,
+            "error": error,
+            "payload": payload.decode("utf-8", "replace"),
+        }
+    )
+    with open(target, "a", encoding="utf-8") as fh:
+        fh.write(line + "\n")
+    return target
+
+
+class SpoolCheckpoint:
+    """Offsets já carregados por segmento, persistidos de forma atômica em JSON."""
+
+    FILENAME: Final[str] = "checkpoint.json"
+
+    def __init__(self, directory: str | Path) -> None:
+        self.path = Path(directory) / self.FILENAME
+        self.offsets: dict[str, int] = {}
+        if self.path.exists():
+            self.offsets = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, segment: Path) -> int:
+        return self.offsets.get(segment.name, 0)
+
+    def set(self, segment: Path, offset: int) -> None:
+        self.offsets[segment.name] = offset
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.offsets, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
@@ -0,0 +1,167 @@
+# src/job_finder/scripts/backfill.py
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from job_finder.db.facets import FacetKey, apply_facet_delta, rebuild_facets
+from job_finder.db.fx import load_fx_rates, read_rates_csv, salary_usd, upsert_fx_rates
+from job_finder.db.generation import bump_generation
+from job_finder.db.models.job import Job
+from job_finder.db.session import SessionLocal
+from job_finder.scraping.checksum import CONTENT_FIELDS, content_digest, content_fields
+from job_finder.scraping.schemas import normalize_seniority
+
+
+def backfill_content_hash(db: Session, batch_size: int = 1000, recompute: bool = False) -> int:
+    """Preenche `jobs.content_hash` em lotes (keyset por id); retorna quantas linhas gravou."""
+    columns = [Job.id, *(getattr(Job, f) for f in CONTENT_FIELDS)]
+    total = 0
+    last_id = None
+    while True:
+        stmt = select(*columns).order_by(Job.id).limit(batch_size)
+        if not recompute:
+            stmt = stmt.where(Job.content_hash.is_(None))
+        if last_id is not None:
+            stmt = stmt.where(Job.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        # coluna derivada: mantém `updated_at` (senão o export reentrega a tabela inteira)
+        db.execute(
+            update(Job).values(updated_at=Job.updated_at),
+            [{"id": r.id, "content_hash": content_digest(content_fields(r))} for r in rows],
+        )
+        db.commit()
+        total += len(rows)
+        last_id = rows[-1].id
+    return total
+
+
+def backfill_seniority(db: Session, batch_size: int = 1000) -> int:
+    """Preenche `jobs.seniority_level` a partir do valor cru de `jobs.seniority`
+    (que não é alterado); retorna quantas linhas mudaram.
+    """
+    columns = [Job.id, Job.seniority, Job.seniority_level]
+    total = 0
+    last_id = None
+    while True:
+        stmt = select(*columns).order_by(Job.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Job.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        changes = []
+        facets: Counter[FacetKey] = Counter()
+        for r in rows:
+            level = normalize_seniority(r.seniority)
+            if level == r.seniority_level:
+                continue
+            changes.append({"id": r.id, "seniority_level": level})
+            if r.seniority_level is not None:
+                facets["seniority", r.seniority_level] -= 1
+            if level is not None:
+                facets["seniority", level] += 1
+        if changes:
+            # coluna derivada: mantém `updated_at` (marca d'água do export)
+            db.execute(update(Job).values(updated_at=Job.updated_at), changes)
+            apply_facet_delta(db, facets)
+            bump_generation(db)
+        db.commit()
+        total += len(changes)
+        last_id = rows[-1].id
+    return total
+
+
+def backfill_salary_usd(db: Session, batch_size: int = 1000) -> int:
+    """Recalcula `salary_min_usd`/`salary_max_usd` com as cotações atuais de `fx_rates`
+    (rodar depois de atualizá-las); retorna quantas linhas mudaram.
+    """
+    rates = load_fx_rates(db)
+    columns = [
+        Job.id,
+        Job.currency,
+        Job.salary_min,
+        Job.salary_max,
+        Job.salary_min_usd,
+        Job.salary_max_usd,
+    ]
+    total = 0
+    last_id = None
+    while True:
+        stmt = select(*columns).order_by(Job.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Job.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        changes = []
+        for r in rows:
+            min_usd, max_usd = salary_usd(r, rates)
+            if (min_usd, max_usd) != (r.salary_min_usd, r.salary_max_usd):
+                changes.append({"id": r.id, "salary_min_usd": min_usd, "salary_max_usd": max_usd})
+        if changes:
+            # mantém `updated_at`: a vaga em si não mudou (marca d'água do export)
+            db.execute(update(Job).values(updated_at=Job.updated_at), changes)
+            bump_generation(db)
+        db.commit()
+        total += len(changes)
+        last_id = rows[-1].id
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfills de colunas derivadas")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_hash = sub.add_parser("content-hash", help="Preenche jobs.content_hash")
+    p_hash.add_argument("--batch-size", type=int, default=1000)
+    p_hash.add_argument(
+        "--all", action="store_true", help="Recalcula todas as linhas, não só as NULL"
+    )
+
+    p_sen = sub.add_parser("seniority", help="Preenche jobs.seniority_level (Seniority)")
+    p_sen.add_argument("--batch-size", type=int, default=1000)
+
+    p_facets = sub.add_parser("facets", help="Recalcula job_facets do zero (reparo)")
+    p_facets.add_argument("--batch-size", type=int, default=10_000)
+
+    p_usd = sub.add_parser(
+        "salary-usd", help="Recalcula jobs.salary_*_usd pelas cotações de fx_rates"
+    )
+    p_usd.add_argument("--batch-size", type=int, default=1000)
+    p_usd.add_argument(
+        "--rates", help="CSV currency,usd_rate gravado em fx_rates antes do recálculo"
+    )
+
+    args = parser.parse_args()
+    db: Session = SessionLocal()
+    try:
+        if args.cmd == "content-hash":
+            n = backfill_content_hash(db, batch_size=args.batch_size, recompute=args.all)
+            print(f"[backfill] content-hash: {n} jobs")
+        elif args.cmd == "seniority":
+            n = backfill_seniority(db, batch_size=args.batch_size)
+            print(f"[backfill] seniority: {n} jobs")
+        elif args.cmd == "facets":
+            n = rebuild_facets(db, batch_size=args.batch_size)
+            bump_generation(db)
+            db.commit()
+            print(f"[backfill] facets: {n} linhas em job_facets")
+        elif args.cmd == "salary-usd":
+            if args.rates:
+                n = upsert_fx_rates(db, read_rates_csv(args.rates))
+                db.commit()
+                print(f"[backfill] fx_rates: {n} cotações")
+            n = backfill_salary_usd(db, batch_size=args.batch_size)
+            print(f"[backfill] salary-usd: {n} jobs")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# src/job_finder/scripts/bench_api.py
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from job_finder.api import main as api
+from job_finder.db.search import supports_fts
+from job_finder.db.session import SessionLocal
+
+
+def sync_app() -> FastAPI:
+    """`/jobs` no caminho síncrono antigo (handler `def` + `SessionLocal`), mesma consulta."""
+    app = FastAPI()
+
+    @app.get("/jobs")
+    def list_jobs(q: str | None = None, remote: bool | None = None, limit: int = 50) -> Response:
+        db: Session = SessionLocal()
+        try:
+            stmt, ranked = api.jobs_query(
+                fts_available=supports_fts(db),
+                q=q,
+                q_mode="fts",
+                sort="recent",
+                match="contains",
+                limit=limit,
+                offset=0,
+                after=None,
+                remote=remote,
+            )
+            rows = db.execute(stmt).all()
+        finally:
+            db.close()
+        body, headers = api.render_jobs(rows, limit, ranked)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return app
+
+
+async def run(
+    app: FastAPI, clients: int, requests: int, params: dict[str, str]
+) -> dict[str, float]:
+    """`clients` clientes concorrentes, cada um com `requests` chamadas sequenciais ao `/jobs`."""
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as c:
+
+        async def client() -> None:
+            for _ in range(requests):
+                t0 = time.perf_counter()
+                resp = await c.get("/jobs", params=params)
+                resp.raise_for_status()
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    q = statistics.quantiles(latencies, n=100)
+    return {"rps": len(latencies) / elapsed, "p50_ms": q[49], "p95_ms": q[94]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara o /jobs assíncrono com o caminho síncrono antigo (em processo)"
+    )
+    parser.add_argument("--clients", type=int, default=200, help="Clientes concorrentes")
+    parser.add_argument("--requests", type=int, default=20, help="Requests por cliente")
+    parser.add_argument("--q", default=None, help="Busca textual (opcional)")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    # o cache da API mascararia o banco: mede só o caminho de consulta
+    api.query_cache = None
+    params = {"limit": str(args.limit)}
+    if args.q:
+        params["q"] = args.q
+
+    for name, app in (("sync", sync_app()), ("async", api.app)):
+        r = asyncio.run(run(app, args.clients, args.requests, params))
+        print(
+            f"[bench_api] {name}: {r['rps']:.0f} req/s, p50 {r['p50_ms']:.1f} ms, "
+            f"p95 {r['p95_ms']:.1f} ms ({args.clients} clientes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
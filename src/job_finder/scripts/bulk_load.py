@@ -0,0 +1,90 @@
+# src/job_finder/scripts/bulk_load.py
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from job_finder.db.bulk_load import bulk_load
+from job_finder.db.facets import apply_facet_delta
+from job_finder.db.generation import bump_generation
+from job_finder.db.session import SessionLocal
+from job_finder.scraping.schemas import JobIngest
+
+
+class JsonlReader:
+    """Lê registros `JobIngest` de JSONL, pulando (e contando) linhas inválidas."""
+
+    def __init__(self, streams: Iterable[TextIO]) -> None:
+        self.streams = streams
+        self.invalid = 0
+
+    def __iter__(self) -> Iterator[JobIngest]:
+        for stream in self.streams:
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    yield JobIngest.model_validate_json(line)
+                except ValidationError:
+                    self.invalid += 1
+
+
+def _open_all(paths: list[str]) -> Iterator[TextIO]:
+    for path in paths:
+        if path == "-":
+            yield sys.stdin
+            continue
+        with open(path, encoding="utf-8") as fh:
+            yield fh
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Carga em massa de vagas (JSONL de JobIngest) via COPY + merge"
+    )
+    parser.add_argument("files", nargs="+", help="Arquivos JSONL ('-' para stdin)")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Registros por transação (COPY + merge)",
+    )
+    args = parser.parse_args()
+
+    reader = JsonlReader(_open_all(args.files))
+    records = iter(reader)
+    staged = merged = unchanged = 0
+    db: Session = SessionLocal()
+    try:
+        while True:
+            chunk = list(islice(records, args.chunk_size))
+            if not chunk:
+                break
+            stats = bulk_load(db, chunk)
+            if stats.merged:
+                apply_facet_delta(db, stats.facets)
+                bump_generation(db)
+            db.commit()
+            staged += stats.staged
+            merged += stats.merged
+            unchanged += stats.unchanged
+            print(
+                f"[bulk_load] chunk: {stats.staged} staged, {stats.inserted} inserted, "
+                f"{stats.updated} updated, {stats.unchanged} unchanged"
+            )
+    finally:
+        db.close()
+    print(
+        f"[bulk_load] total: {staged} staged, {merged} merged, {unchanged} unchanged, "
+        f"{reader.invalid} invalid"
+    )
+
+
+if __name__ == "__main__":
+    main()
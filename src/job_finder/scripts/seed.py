@@ -3,16 +3,22 @@ from __future__ import annotations
 
 import argparse
 import secrets
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from job_finder.db.facets import FacetKey, apply_facet_delta, facet_values
+from job_finder.db.fx import load_fx_rates, salary_usd
+from job_finder.db.generation import bump_generation
 from job_finder.db.models.company import Company
 from job_finder.db.models.job import Job
+from job_finder.db.models.job_facet import JobFacet
 from job_finder.db.models.skill import Skill
 from job_finder.db.session import SessionLocal
+from job_finder.scraping.checksum import content_digest, content_fields
 
 COMPANY_SAMPLES = [
     ("Acme Inc", "BR", "São Paulo"),
@@ -71,12 +77,32 @@ SKILL_SAMPLES = [
 
 def _ensure_skills(db: Session) -> None:
     existing = {s.name for s in db.execute(select(Skill)).scalars().all()}
-    to_add = [Skill(name=n, category=c) for n, c in SKILL_SAMPLES if n not in existing]
+    # nomes repetidos na amostra (ex.: "sql"): vale a primeira categoria
+    to_add: dict[str, Skill] = {}
+    for n, c in SKILL_SAMPLES:
+        if n not in existing and n not in to_add:
+            to_add[n] = Skill(name=n, category=c)
     if to_add:
-        db.add_all(to_add)
+        db.add_all(to_add.values())
         db.commit()
 
 
+def _add_jobs(db: Session, jobs: list[Job]) -> None:
+    """Grava as vagas com as colunas derivadas da ingestão (salário em USD, hash de
+    conteúdo), os deltas de `job_facets` e uma nova geração, numa transação.
+    """
+    rates = load_fx_rates(db)
+    facets: Counter[FacetKey] = Counter()
+    for j in jobs:
+        j.salary_min_usd, j.salary_max_usd = salary_usd(j, rates)
+        j.content_hash = content_digest(content_fields(j))
+        facets.update(facet_values(j))
+    db.add_all(jobs)
+    apply_facet_delta(db, facets)
+    bump_generation(db)
+    db.commit()
+
+
 def _pick(seq: list[Any]) -> Any:
     return secrets.choice(seq)
 
@@ -106,6 +132,7 @@ def seed_minimal(db: Session) -> None:
     now = datetime.now(timezone.utc)
     jobs = []
     for i, c in enumerate(companies, start=1):
+        level = _pick(["junior", "mid", "senior"])
         j = Job(
             external_id=f"seed-min-{i}",
             source="seed",
@@ -115,7 +142,8 @@ def seed_minimal(db: Session) -> None:
             location=c.city,
             remote=_rand_bool(),
             employment_type="full-time",
-            seniority=_pick(["junior", "mid", "senior"]),
+            seniority=level,
+            seniority_level=level,
             currency="USD",
             salary_min=60000,
             salary_max=120000,
@@ -125,8 +153,7 @@ def seed_minimal(db: Session) -> None:
         )
         jobs.append(j)
 
-    db.add_all(jobs)
-    db.commit()
+    _add_jobs(db, jobs)
     print(f"[seed] minimal: {len(jobs)} jobs, {len(companies)} companies")
 
 
@@ -157,6 +184,7 @@ def seed_demo(db: Session, jobs_total: int = 50, companies_total: int = 10) -> N
         c = _pick(created_companies)
         sal_min = _pick([50000, 70000, 90000, 110000])
         sal_max = sal_min + _pick([15000, 30000, 50000])
+        level = _pick(["junior", "mid", "senior"])
         j = Job(
             external_id=f"seed-demo-{i}",
             source=_pick(["weworkremotely", "remoteok", "remoteco", "workable"]),
@@ -166,7 +194,8 @@ def seed_demo(db: Session, jobs_total: int = 50, companies_total: int = 10) -> N
             location=c.city,
             remote=_rand_bool(),
             employment_type=_pick(["full-time", "contract"]),
-            seniority=_pick(["junior", "mid", "senior"]),
+            seniority=level,
+            seniority_level=level,
             currency="USD",
             salary_min=sal_min,
             salary_max=sal_max,
@@ -176,8 +205,7 @@ def seed_demo(db: Session, jobs_total: int = 50, companies_total: int = 10) -> N
         )
         jobs.append(j)
 
-    db.add_all(jobs)
-    db.commit()
+    _add_jobs(db, jobs)
     print(f"[seed] demo: {len(jobs)} jobs, {len(created_companies)} companies")
 
 
@@ -200,6 +228,8 @@ def main() -> None:
             db.query(Job).delete()
             db.query(Company).delete()
             db.query(Skill).delete()
+            db.query(JobFacet).delete()
+            bump_generation(db)
             db.commit()
             print("[seed] clear ok")
             return
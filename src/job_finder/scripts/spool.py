@@ -0,0 +1,171 @@
+# src/job_finder/scripts/spool.py
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.job_writer import write_batch
+from job_finder.db.session import SessionLocal
+from job_finder.db.upsert import touch_last_seen
+from job_finder.scraping.schemas import JobIngest
+from job_finder.scraping.spool import (
+    QUARANTINE_DIR,
+    SpoolCheckpoint,
+    SpoolCorruption,
+    decode_record,
+    quarantine,
+    read_frames,
+    seal_orphans,
+    sealed_segments,
+)
+
+
+@dataclass
+class SpoolLoad:
+    """Resultado de uma carga do spool: registros gravados e postos em quarentena."""
+
+    loaded: int = 0
+    quarantined: int = 0
+
+    def __iadd__(self, other: SpoolLoad) -> SpoolLoad:
+        self.loaded += other.loaded
+        self.quarantined += other.quarantined
+        return self
+
+
+def load_segment(
+    db: Session,
+    companies: CompanyCache,
+    segment: Path,
+    offset: int = 0,
+    batch_size: int = 1000,
+    checkpoint: SpoolCheckpoint | None = None,
+    bulk: bool = False,
+) -> SpoolLoad:
+    """Carrega um segmento a partir de `offset`, com commit (e checkpoint) por lote.
+
+    Registros que não decodificam vão para a quarentena (ver `quarantine`) e a carga
+    segue; o total deles volta em `SpoolLoad.quarantined`. Um frame corrompido grava o que veio antes dele e levanta `SpoolCorruption`:
+    o checkpoint para no offset do frame, nunca depois dele.
+    """
+    pending: list[tuple[JobIngest, datetime]] = []
+    result = SpoolLoad()
+
+    def _commit(upto: int) -> None:
+        if pending:
+            stats = write_batch(db, companies, pending, bulk=bulk)
+            touch_last_seen(db, stats.seen_keys, max(ts for _, ts in pending))
+            db.commit()
+            result.loaded += len(pending)
+            pending.clear()
+        if checkpoint is not None:
+            checkpoint.set(segment, upto)
+
+    position = offset
+    try:
+        for start, position, payload in read_frames(segment, offset):
+            try:
+                pending.append(decode_record(payload))
+            except (ValueError, KeyError) as exc:  # JSON inválido / ValidationError
+                where = quarantine(segment, start, payload, repr(exc))
+                result.quarantined += 1
+                print(
+                    f"[spool] registro em quarentena: {segment.name}@{start} → {where}",
+                    file=sys.stderr,
+                )
+            if len(pending) >= batch_size:
+                _commit(position)
+    except SpoolCorruption:
+        _commit(position)
+        raise
+    _commit(position)
+    return result
+
+
+def drain(directory: str, batch_size: int = 1000, bulk: bool = False) -> SpoolLoad:
+    """Drena os segmentos selados, retomando do último offset confirmado.
+
+    Um segmento corrompido não impede os demais; ao fim, o primeiro erro é levantado.
+    """
+    for orphan in seal_orphans(directory):
+        print(f"[spool] segmento órfão selado: {orphan.name}")
+    checkpoint = SpoolCheckpoint(directory)
+    db: Session = SessionLocal()
+    companies = CompanyCache()
+    try:
+        companies.warm(db)
+        db.commit()
+        total = SpoolLoad()
+        corrupted: list[SpoolCorruption] = []
+        for segment in sealed_segments(directory):
+            offset = checkpoint.get(segment)
+            if offset >= segment.stat().st_size:
+                continue
+            try:
+                n = load_segment(db, companies, segment, offset, batch_size, checkpoint, bulk)
+            except SpoolCorruption as exc:
+                print(f"[spool] ERRO: {exc}; checkpoint parado nesse offset", file=sys.stderr)
+                corrupted.append(exc)
+                continue
+            print(f"[spool] {segment.name}: {n.loaded} jobs")
+            total += n
+        if corrupted:
+            raise corrupted[0]
+        return total
+    finally:
+        db.close()
+
+
+def replay(directory: str, batch_size: int = 1000, bulk: bool = False) -> SpoolLoad:
+    """Recarrega todos os segmentos desde o início (ex.: após mudança de schema)."""
+    db: Session = SessionLocal()
+    companies = CompanyCache()
+    try:
+        total = SpoolLoad()
+        for segment in sealed_segments(directory):
+            n = load_segment(db, companies, segment, 0, batch_size, None, bulk)
+            print(f"[spool] replay {segment.name}: {n.loaded} jobs")
+            total += n
+        return total
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Loader do spool local de vagas")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, help_ in (
+        ("drain", "Carrega segmentos pendentes (com checkpoint)"),
+        ("replay", "Recarrega todos os segmentos, ignorando checkpoints"),
+    ):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--dir", default=".scrapy/spool")
+        p.add_argument("--batch-size", type=int, default=1000)
+        p.add_argument("--bulk", action="store_true", help="Usa COPY + merge (Postgres)")
+
+    args = parser.parse_args()
+    try:
+        if args.cmd == "drain":
+            total = drain(args.dir, batch_size=args.batch_size, bulk=args.bulk)
+        else:
+            total = replay(args.dir, batch_size=args.batch_size, bulk=args.bulk)
+    except SpoolCorruption as exc:
+        parser.exit(1, f"[spool] {args.cmd} interrompido: {exc}\n")
+    print(f"[spool] {args.cmd}: {total.loaded} jobs")
+    if total.quarantined:
+        # os registros foram pulados: o checkpoint avançou, mas a carga não está completa
+        parser.exit(
+            1,
+            f"[spool] {args.cmd}: {total.quarantined} registro(s) em quarentena"
+            f" em {Path(args.dir) / QUARANTINE_DIR}\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
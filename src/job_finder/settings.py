@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     postgres_user: str = Field(default="app", alias="POSTGRES_USER")
     postgres_password: str = Field(default="app", alias="POSTGRES_PASSWORD")
     database_url: str | None = Field(default=None, alias="DATABASE_URL")
+    # Réplica de leitura da API (opcional; sem ela, tudo vai para DATABASE_URL)
+    database_read_url: str | None = Field(default=None, alias="DATABASE_READ_URL")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -23,9 +25,57 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # Pool de cada engine assíncrono da API: réplica e primário (ver job_finder.db.session)
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_secs: float = Field(default=5.0, alias="DB_POOL_TIMEOUT_SECS")
+    # statement_timeout das conexões da API (0 = sem limite)
+    db_statement_timeout_ms: int = Field(default=5000, alias="DB_STATEMENT_TIMEOUT_MS")
+    # Pool do engine síncrono de escrita (pipelines do Scrapy e scripts), por processo
+    db_write_pool_size: int = Field(default=5, alias="DB_WRITE_POOL_SIZE")
+    db_write_max_overflow: int = Field(default=5, alias="DB_WRITE_MAX_OVERFLOW")
+    # Atraso máximo da réplica antes de a API ler do primário; medido a cada poll
+    db_replica_max_lag_secs: float = Field(default=5.0, alias="DB_REPLICA_MAX_LAG_SECS")
+    db_replica_lag_poll_secs: float = Field(default=1.0, alias="DB_REPLICA_LAG_POLL_SECS")
+
     # App/servidor
     app_host: str = Field(default="127.0.0.1", alias="APP_HOST")
     app_port: int = Field(default=8000, alias="APP_PORT")
+    # Processos uvicorn da API (`python -m job_finder.api.server`); com mais de um,
+    # as métricas vão para arquivos em PROMETHEUS_MULTIPROC_DIR (padrão: dir temporário)
+    api_workers: int = Field(default=1, alias="API_WORKERS")
+    prometheus_multiproc_dir: str | None = Field(default=None, alias="PROMETHEUS_MULTIPROC_DIR")
+
+    # Cache de respostas do /jobs (LRU+TTL em processo; Redis opcional compartilhado)
+    api_cache_enabled: bool = Field(default=True, alias="API_CACHE_ENABLED")
+    api_cache_max_entries: int = Field(default=1024, alias="API_CACHE_MAX_ENTRIES")
+    api_cache_ttl_secs: float = Field(default=60.0, alias="API_CACHE_TTL_SECS")
+    api_cache_redis_url: str | None = Field(default=None, alias="API_CACHE_REDIS_URL")
+    # Com que frequência (s) cada processo relê a geração de ingestão no banco
+    api_generation_poll_secs: float = Field(default=1.0, alias="API_GENERATION_POLL_SECS")
+    # Linhas por lote do cursor do /jobs/export (limita a memória por export)
+    api_export_batch_rows: int = Field(default=5000, alias="API_EXPORT_BATCH_ROWS")
+    # Janela (s) relida antes de `since` no /jobs/export: cobre transações de escrita
+    # que commitam depois de o cliente já ter visto uma marca d'água mais nova
+    api_export_overlap_secs: float = Field(default=300.0, alias="API_EXPORT_OVERLAP_SECS")
+    # include_total: acima dessa estimativa do planner, o total é a estimativa
+    api_exact_count_max: int = Field(default=10_000, alias="API_EXACT_COUNT_MAX")
+
+    # Admissão: vagas simultâneas por orçamento (leve/pesado); somadas, devem caber
+    # no pool do engine (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    api_light_concurrency: int = Field(default=16, alias="API_LIGHT_CONCURRENCY")
+    api_heavy_concurrency: int = Field(default=4, alias="API_HEAVY_CONCURRENCY")
+    # Espera máxima por vaga e tamanho da fila antes de recusar com 503
+    api_queue_timeout_ms: int = Field(default=250, alias="API_QUEUE_TIMEOUT_MS")
+    api_max_queue: int = Field(default=64, alias="API_MAX_QUEUE")
+    api_retry_after_secs: float = Field(default=1.0, alias="API_RETRY_AFTER_SECS")
+    # statement_timeout por request (SET LOCAL), por orçamento
+    api_light_statement_timeout_ms: int = Field(
+        default=1000, alias="API_LIGHT_STATEMENT_TIMEOUT_MS"
+    )
+    api_heavy_statement_timeout_ms: int = Field(
+        default=5000, alias="API_HEAVY_STATEMENT_TIMEOUT_MS"
+    )
 
     @property
     def sqlalchemy_url(self) -> str:
@@ -36,6 +86,10 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def sqlalchemy_read_url(self) -> str:
+        return self.database_read_url or self.sqlalchemy_url
+
     # ===== Propriedades de compatibilidade (UPPER_CASE) =====
     @property
     def APP_ENV(self) -> str:
@@ -2,23 +2,35 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from collections.abc import Iterator
 
 import pytest
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
 from tests.factories import company_factory as _company_factory
+from tests.factories import ingest_factory as _ingest_factory
 from tests.factories import job_factory as _job_factory
 
 # 1) Configura variável de ambiente para usar banco de dados de teste
-os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+# (SQLite em arquivo: o engine síncrono e o assíncrono da API enxergam o mesmo banco)
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///" + os.path.join(
+    tempfile.gettempdir(), f"job_finder_test_{os.getpid()}.db"
+)
 os.environ.setdefault("APP_ENV", "test")
+# Os testes gravam direto via ORM (sem bump de geração): cache da API desligado
+os.environ.setdefault("API_CACHE_ENABLED", "0")
 
 # 2) Importa engine e metadata
 # 3) Garante que modelos foram registrados
 import job_finder.db.models.company  # noqa: F401
+import job_finder.db.models.fx_rate  # noqa: F401
+import job_finder.db.models.ingest_generation  # noqa: F401
 import job_finder.db.models.job  # noqa: F401
+import job_finder.db.models.job_facet  # noqa: F401
 from job_finder.db.models.base import Base
+from job_finder.db.search import SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_SQL
 from job_finder.db.session import engine
 
 try:
@@ -47,6 +59,45 @@ def _create_schema():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    if engine.url.database and os.path.exists(engine.url.database):
+        os.remove(engine.url.database)
+
+
+# Testes de plano/índice (somente Postgres: TEST_POSTGRES_URL=postgresql+psycopg://...)
+PG_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(scope="module")
+def pg(request: pytest.FixtureRequest) -> Iterator[Session]:
+    """Sessão num Postgres descartável: o schema é recriado (com pg_trgm e a coluna de
+    FTS) e populado pela função `pg_seed(conn)` do módulo de teste, se houver.
+    """
+    if not PG_URL:
+        pytest.skip("TEST_POSTGRES_URL não definido")
+    engine = create_engine(PG_URL)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.drop_all(conn)
+        Base.metadata.create_all(conn)
+        # a coluna de FTS não é mapeada no modelo (ver migração 20261018_03)
+        conn.execute(
+            text(
+                f"ALTER TABLE jobs ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector "
+                f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+            )
+        )
+        conn.execute(
+            text(f"CREATE INDEX ix_jobs_search_vector ON jobs USING gin ({SEARCH_VECTOR_COLUMN})")
+        )
+        seed = getattr(request.module, "pg_seed", None)
+        if seed is not None:
+            seed(conn)
+        conn.execute(text("ANALYZE"))
+    with Session(engine) as session:
+        yield session
+    Base.metadata.drop_all(engine)
+    engine.dispose()
 
 
 @pytest.fixture
@@ -57,3 +108,8 @@ def company_factory(db: Session):
 @pytest.fixture
 def job_factory(db: Session):
     return _job_factory(db)
+
+
+@pytest.fixture
+def ingest(db: Session):
+    return _ingest_factory(db)
@@ -8,8 +8,11 @@ from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.job_writer import write_batch
 from job_finder.db.models.company import Company
 from job_finder.db.models.job import Job
+from job_finder.scraping.schemas import JobIngest, normalize_seniority
 
 
 def company_factory(db: Session) -> Callable[..., Company]:
@@ -31,6 +34,7 @@ def job_factory(db: Session, default_company: Company | None = None) -> Callable
     def _make(**overrides) -> Job:
         company = overrides.pop("company", None) or default_company or company_factory(db)()
         now = datetime.now(timezone.utc)
+        seniority = overrides.get("seniority", random.choice(["junior", "mid", "senior"]))
         j = Job(
             external_id=overrides.get("external_id", f"ext-{uuid4().hex[:8]}"),
             source=overrides.get(
@@ -38,11 +42,13 @@ def job_factory(db: Session, default_company: Company | None = None) -> Callable
             ),
             source_url=overrides.get("source_url", "https://example.com/job"),
             title=overrides.get("title", "Software Engineer"),
+            description_text=overrides.get("description_text"),
             company_id=company.id,
             location=overrides.get("location", company.city),
             remote=overrides.get("remote", True),
             employment_type=overrides.get("employment_type", "full-time"),
-            seniority=overrides.get("seniority", random.choice(["junior", "mid", "senior"])),
+            seniority=seniority,
+            seniority_level=overrides.get("seniority_level", normalize_seniority(seniority)),
             currency=overrides.get("currency", "USD"),
             salary_min=overrides.get("salary_min", 60000),
             salary_max=overrides.get("salary_max", 120000),
@@ -56,3 +62,28 @@ def job_factory(db: Session, default_company: Company | None = None) -> Callable
         return j
 
     return _make
+
+
+def ingest_factory(db: Session) -> Callable[..., None]:
+    """Grava vagas pelo caminho da ingestão (`write_batch`: facets, geração) e faz commit.
+
+    Aceita `JobIngest` ou só o `external_id` de uma vaga remota mínima da remoteok.
+    """
+
+    def _ingest(*jobs: JobIngest | str) -> None:
+        now = datetime.now(timezone.utc)
+        batch = [(j if isinstance(j, JobIngest) else _ingest_data(j), now) for j in jobs]
+        write_batch(db, CompanyCache(), batch)
+        db.commit()
+
+    return _ingest
+
+
+def _ingest_data(external_id: str) -> JobIngest:
+    return JobIngest(
+        source="remoteok",
+        external_id=external_id,
+        source_url=f"https://example.com/{external_id}",
+        title=f"Job {external_id}",
+        remote=True,
+    )
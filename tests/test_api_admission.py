@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from job_finder.api import admission, main
+from job_finder.api.admission import AdmissionGate, Overloaded, is_heavy
+
+client = TestClient(main.app)
+
+
+def test_gate_sheds_when_queue_is_full_or_deadline_passes():
+    async def run() -> list[str]:
+        gate = AdmissionGate("test", limit=1, max_wait_secs=0.05, max_queue=1)
+        await gate.acquire()
+        waiting = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        reasons = []
+        with pytest.raises(Overloaded) as full:
+            await gate.acquire()
+        reasons.append(full.value.reason)
+        with pytest.raises(Overloaded) as late:
+            await waiting
+        reasons.append(late.value.reason)
+
+        gate.release()
+        async with gate.slot():
+            assert gate.waiting == 0
+        return reasons
+
+    assert asyncio.run(run()) == ["queue_full", "deadline"]
+
+
+@pytest.mark.parametrize("has_timeout", [True, False], ids=["timeout", "shielded"])
+def test_deadline_racing_the_acquire_keeps_the_permit(monkeypatch, has_timeout):
+    if has_timeout and not admission.HAS_ASYNCIO_TIMEOUT:
+        pytest.skip("asyncio.timeout requer Python 3.11")
+    monkeypatch.setattr(admission, "HAS_ASYNCIO_TIMEOUT", has_timeout)
+    real_wait_for = asyncio.wait_for
+
+    async def late_wait_for(aw, timeout):
+        # a vaga sai e o prazo estoura no mesmo passo (a corrida do wait_for no 3.10)
+        await aw
+        raise asyncio.TimeoutError
+
+    async def run() -> int:
+        gate = AdmissionGate("test", limit=1, max_wait_secs=0.01, max_queue=5)
+        await gate.acquire()
+        waiting = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        if not has_timeout:
+            monkeypatch.setattr(asyncio, "wait_for", late_wait_for)
+        # libera exatamente no prazo de quem espera
+        loop = asyncio.get_running_loop()
+        loop.call_at(loop.time() + gate.max_wait_secs, gate.release)
+        try:
+            await waiting
+            gate.release()
+        except Overloaded:
+            pass
+        finally:
+            monkeypatch.setattr(asyncio, "wait_for", real_wait_for)
+        await asyncio.sleep(0)
+        # nenhuma vaga perdida: o limitador voltou à capacidade cheia
+        return gate._sem._value
+
+    assert asyncio.run(run()) == 1
+
+
+def test_classifies_heavy_requests():
+    assert not is_heavy({"sort": "recent", "offset": 0, "limit": 50})
+    assert is_heavy({"q": "python"})
+    assert is_heavy({"offset": 500})
+    assert is_heavy({"include_total": True})
+    assert is_heavy({"sort": "relevance"})
+
+
+def test_overloaded_pool_returns_503_with_retry_after(db, monkeypatch):
+    gate = AdmissionGate("heavy", limit=1, max_wait_secs=0.01, max_queue=0, retry_after_secs=2.5)
+    asyncio.run(gate.acquire())
+    monkeypatch.setattr(main, "heavy_gate", gate)
+
+    resp = client.get("/jobs", params={"include_total": True, "limit": 7})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+
+    # leituras leves seguem no próprio orçamento
+    assert client.get("/jobs", params={"limit": 7}).status_code == 200
+
+
+def test_shed_requests_do_not_read_the_watermark(db, monkeypatch):
+    # sem cache de consultas, a marca d'água vem do banco: só depois da admissão
+    gate = AdmissionGate("light", limit=1, max_wait_secs=0.01, max_queue=0)
+    asyncio.run(gate.acquire())
+    monkeypatch.setattr(main, "light_gate", gate)
+    monkeypatch.setattr(main, "query_cache", None)
+    reads = []
+    monkeypatch.setattr(main, "current_watermark", lambda conn: reads.append(conn))
+
+    for path in ("/jobs", "/jobs/facets", "/stats/source"):
+        assert client.get(path).status_code == 503
+    assert reads == []
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from job_finder.api import main
+from job_finder.api.cache import QueryCache, cache_key
+from job_finder.db.generation import Watermark, current_generation
+
+client = TestClient(main.app)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(generation: list[int], clock: _Clock, **kwargs) -> QueryCache:
+    async def _load() -> Watermark:
+        return Watermark(generation[0])
+
+    return QueryCache("/test", _load, poll_secs=0, clock=clock, **kwargs)
+
+
+def test_entries_expire_on_ttl_and_generation_change():
+    gen, clock = [1], _Clock()
+    cache = _cache(gen, clock, ttl_secs=10)
+
+    async def scenario() -> None:
+        await cache.store("k", await cache.generation(), b"[]", {})
+        assert await cache.lookup("k", await cache.generation()) is not None
+
+        clock.now += 11
+        assert await cache.lookup("k", await cache.generation()) is None
+
+        await cache.store("k", await cache.generation(), b"[]", {})
+        gen[0] = 2
+        assert await cache.lookup("k", await cache.generation()) is None
+        assert await cache.stale("k") is not None
+
+    asyncio.run(scenario())
+
+
+def test_lru_eviction():
+    cache = _cache([1], _Clock(), max_entries=2)
+
+    async def scenario() -> None:
+        for key in ("a", "b"):
+            await cache.store(key, 1, b"[]", {})
+        await cache.lookup("a", 1)
+        await cache.store("c", 1, b"[]", {})
+        assert await cache.lookup("b", 1) is None
+        assert await cache.lookup("a", 1) is not None
+
+    asyncio.run(scenario())
+
+
+def test_cache_key_ignores_none_and_order():
+    assert cache_key("/jobs", {"remote": True, "q": None, "company": " Acme "}) == cache_key(
+        "/jobs", {"company": "Acme", "remote": True}
+    )
+
+
+@pytest.fixture
+def jobs_cache(monkeypatch):
+    cache = QueryCache("/jobs", main._load_watermark, poll_secs=0)
+    monkeypatch.setattr(main, "query_cache", cache)
+    return cache
+
+
+def test_ingestion_invalidates_cached_responses(db, jobs_cache, ingest):
+    ingest("1")
+    first = client.get("/jobs", params={"remote": True})
+    assert first.headers["X-Cache"] == "MISS"
+    assert client.get("/jobs", params={"remote": "true"}).headers["X-Cache"] == "HIT"
+
+    before = current_generation(db)
+    ingest("2")
+    assert current_generation(db) == before + 1
+
+    resp = client.get("/jobs", params={"remote": True})
+    assert resp.headers["X-Cache"] == "MISS"
+    assert len(resp.json()) == 2
+
+
+def test_serves_stale_when_database_fails(db, jobs_cache, monkeypatch, ingest):
+    ingest("1")
+    assert client.get("/jobs").headers["X-Cache"] == "MISS"
+
+    async def _new_generation() -> Watermark:
+        return Watermark(99)  # nova ingestão: entrada antiga não vale mais
+
+    async def _down(*_: object, **__: object) -> None:
+        raise OperationalError("SELECT", {}, Exception("db down"))
+
+    jobs_cache.load_watermark = _new_generation
+    monkeypatch.setattr(main, "_fetch_jobs", _down)
+    resp = client.get("/jobs")
+    assert resp.headers["X-Cache"] == "STALE"
+    assert len(resp.json()) == 1
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from job_finder.api import main
+
+client = TestClient(main.app)
+
+
+def test_if_none_match_returns_304_until_next_ingestion(ingest):
+    ingest("1")
+    first = client.get("/jobs", params={"limit": 10})
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"') and "Last-Modified" in first.headers
+
+    again = client.get("/jobs", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag
+
+    # outra query, outra ETag
+    other = client.get("/jobs", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    ingest("2")
+    fresh = client.get("/jobs", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and len(fresh.json()) == 2
+    assert fresh.headers["ETag"] != etag
+
+
+def test_if_modified_since(ingest):
+    ingest("1")
+    last_modified = client.get("/stats/source").headers["Last-Modified"]
+
+    resp = client.get("/stats/source", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get("/stats/source", headers={"If-Modified-Since": old}).status_code == 200
+
+
+def test_not_modified_skips_the_jobs_query(monkeypatch, ingest):
+    ingest("1")
+    etag = client.get("/jobs").headers["ETag"]
+
+    async def _boom(*_: object, **__: object) -> None:
+        raise AssertionError("a query de vagas não deveria rodar")
+
+    monkeypatch.setattr(main, "_fetch_jobs", _boom)
+    assert client.get("/jobs", headers={"If-None-Match": etag}).status_code == 304
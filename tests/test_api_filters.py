@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Connection, insert, select, text
+from sqlalchemy.orm import Session
+
+from job_finder.api.main import app, job_conditions
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.fx import upsert_fx_rates
+from job_finder.db.job_writer import write_batch
+from job_finder.db.models.company import Company
+from job_finder.db.models.job import Job
+from job_finder.scraping.schemas import JobIngest
+
+client = TestClient(app)
+
+
+def _titles(**params) -> list[str]:
+    resp = client.get("/jobs", params=params)
+    assert resp.status_code == 200, resp.text
+    return sorted(j["title"] for j in resp.json())
+
+
+def test_contains_and_exact_match_modes(company_factory, job_factory):
+    acme = company_factory(name="Acme Inc")
+    job_factory(title="A", company=acme, location="São Paulo", seniority="senior")
+    job_factory(title="B", company=company_factory(name="Acme Labs"), location="Porto Alegre")
+    job_factory(title="C", company=company_factory(name="Other"), location="São Paulo, SP")
+
+    assert _titles(company="acme") == ["A", "B"]
+    assert _titles(company="Acme Inc", match="exact") == ["A"]
+    assert _titles(location="paulo") == ["A", "C"]
+    assert _titles(location="São Paulo", match="exact") == ["A"]
+
+
+def test_source_filter_is_exact(job_factory):
+    job_factory(title="A", source="remoteok")
+    job_factory(title="B", source="remoteok_eu")
+
+    assert _titles(source="remoteok") == ["A"]
+
+
+def test_seniority_filter_is_normalized(job_factory):
+    job_factory(title="Senior", seniority="Sr.")
+    job_factory(title="Junior", seniority="junior")
+
+    assert _titles(seniority="Sr.") == ["Senior"]
+    assert _titles(seniority="senior", match="exact") == ["Senior"]
+    assert client.get("/jobs", params={"seniority": "wizard", "match": "exact"}).status_code == 422
+
+
+def test_salary_filters_compare_normalized_usd(db):
+    upsert_fx_rates(db, {"USD": Decimal(1), "EUR": Decimal("1.10"), "BRL": Decimal("0.20")})
+    now = datetime.now(timezone.utc)
+    offers = {
+        "usd": ("USD", 60000, 90000),
+        "eur": ("EUR", 60000, 80000),
+        "brl": ("BRL", 200000, None),
+    }
+    pending = [
+        (
+            JobIngest(
+                source="remoteok",
+                external_id=key,
+                source_url=f"https://example.com/{key}",
+                title=key,
+                currency=currency,
+                salary_min=low,
+                salary_max=high,
+            ),
+            now,
+        )
+        for key, (currency, low, high) in offers.items()
+    ]
+    write_batch(db, CompanyCache(), pending)
+    db.commit()
+
+    # EUR 60k = USD 66k; BRL 200k = USD 40k
+    assert _titles(min_salary=65000) == ["eur"]
+    assert _titles(min_salary=50000) == ["eur", "usd"]
+    assert _titles(max_salary=88000) == ["eur"]
+    eur = client.get("/jobs", params={"min_salary": 65000}).json()[0]
+    assert (eur["salary_min_usd"], eur["salary_max_usd"]) == (66000, 88000)
+
+
+# ---- EXPLAIN (somente Postgres: TEST_POSTGRES_URL, ver fixture `pg`) ----
+# O schema do banco apontado é recriado: use um banco descartável.
+
+
+def pg_seed(conn: Connection) -> None:
+    company_ids = conn.scalars(
+        insert(Company).returning(Company.id), [{"name": f"Company {i}"} for i in range(2000)]
+    ).all()
+    conn.execute(
+        insert(Job),
+        [
+            {
+                "source": "seed",
+                "external_id": str(i),
+                "source_url": f"https://example.com/{i}",
+                "title": f"Job {i}",
+                "company_id": company_ids[i % len(company_ids)],
+                "location": f"City {i % 500}",
+                "seniority": ("Jr", "Pleno", "Sr.", "Tech Lead")[i % 4],
+                "seniority_level": ("junior", "mid", "senior", "lead")[i % 4],
+                "remote": bool(i % 2),
+                "salary_min_usd": 1000 * (i % 200),
+                "salary_max_usd": 1000 * (i % 200) + 50_000,
+                "scraped_at": datetime.now(timezone.utc),
+            }
+            for i in range(20_000)
+        ],
+    )
+
+
+def _plan(db: Session, **filters) -> str:
+    # a pergunta é "o filtro consegue usar o índice?", não o custo com 20k linhas
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    stmt = select(Job.id).where(*job_conditions(**filters))
+    compiled = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+    db.rollback()
+    return "\n".join(rows)
+
+
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        ({"company": "pany 12"}, "ix_companies_name_trgm"),
+        ({"company": "Company 12", "match": "exact"}, "companies_name_key"),
+        ({"location": "ity 42"}, "ix_jobs_location_trgm"),
+        ({"location": "City 42", "match": "exact"}, "ix_jobs_location"),
+        ({"seniority": "lead"}, "ix_jobs_seniority_level"),
+        ({"min_salary": 190_000}, "ix_jobs_salary_min_usd"),
+        ({"max_salary": 60_000}, "ix_jobs_salary_max_usd"),
+    ],
+)
+def test_filters_use_indexes(pg, filters, index):
+    plan = _plan(pg, **filters)
+    assert index in plan, plan
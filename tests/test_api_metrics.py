@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from job_finder.api import main
+from job_finder.api.server import prepare_multiproc_dir
+
+client = TestClient(main.app)
+
+# Simula um worker: grava métricas no diretório compartilhado e, se `dead`, encerra
+# como o lifespan da API (mark_process_dead)
+WORKER = """
+import os, sys
+from prometheus_client import multiprocess
+from job_finder.api import main
+from job_finder.obs import metrics as m
+main.REQS.labels("/jobs").inc()
+m.API_ADMISSION_IN_FLIGHT.labels(pool="light").inc()
+if sys.argv[1] == "dead":
+    multiprocess.mark_process_dead(os.getpid())
+"""
+
+
+def _worker(path: str, state: str) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": path}
+    subprocess.run([sys.executable, "-c", WORKER, state], env=env, check=True)
+
+
+def test_metrics_aggregate_worker_files(tmp_path, monkeypatch):
+    (tmp_path / "counter_1.db").write_bytes(b"")  # sobra de uma execução anterior
+    path = str(prepare_multiproc_dir(tmp_path))
+    assert not list(tmp_path.iterdir())
+
+    _worker(path, "live")
+    _worker(path, "dead")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", path)
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert 'api_requests_total{path="/jobs"} 2.0' in resp.text
+    # livesum: só o worker vivo conta no gauge
+    assert 'api_admission_in_flight{pool="light"} 1.0' in resp.text
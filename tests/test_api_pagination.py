@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from job_finder.api.main import app
+from job_finder.api.pagination import MAX_OFFSET, FeedKey
+
+client = TestClient(app)
+
+
+def _page(**params) -> tuple[list[str], str | None]:
+    resp = client.get("/jobs", params=params)
+    assert resp.status_code == 200, resp.text
+    return [j["title"] for j in resp.json()], resp.headers.get("X-Next-Cursor")
+
+
+def test_cursor_walks_feed_in_order_including_null_posted_at(job_factory):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    scraped = base + timedelta(days=30)
+    for i in range(5):
+        job_factory(title=f"posted-{i}", posted_at=base + timedelta(days=i), scraped_at=scraped)
+    # mesmo posted_at/scraped_at: desempate por id
+    job_factory(title="tie-a", posted_at=base, scraped_at=scraped)
+    for i in range(3):
+        job_factory(title=f"unposted-{i}", posted_at=None, scraped_at=scraped + timedelta(hours=i))
+
+    titles, cursor = _page(limit=3)
+    seen = list(titles)
+    while cursor:
+        titles, cursor = _page(limit=3, cursor=cursor)
+        seen.extend(titles)
+
+    assert len(seen) == len(set(seen)) == 9
+    assert seen[:4] == ["posted-4", "posted-3", "posted-2", "posted-1"]
+    assert set(seen[4:6]) == {"posted-0", "tie-a"}
+    assert seen[6:] == ["unposted-2", "unposted-1", "unposted-0"]
+
+
+def test_cursor_pages_match_offset_pages(job_factory):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(6):
+        job_factory(title=f"job-{i}", posted_at=base + timedelta(hours=i))
+
+    first, cursor = _page(limit=2)
+    second, _ = _page(limit=2, cursor=cursor)
+    assert second == _page(limit=2, offset=2)[0]
+    assert first + second == ["job-5", "job-4", "job-3", "job-2"]
+
+
+def test_cursor_round_trip_and_validation():
+    key = FeedKey(None, datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4())
+    assert FeedKey.decode(key.encode()) == key
+    assert client.get("/jobs", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/jobs", params={"offset": MAX_OFFSET + 1}).status_code == 422
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from job_finder.api.main import app
+from job_finder.db.session import async_engine
+
+client = TestClient(app)
+
+
+@contextmanager
+def _statements() -> Iterator[list[str]]:
+    seen: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        # a leitura da marca d'água (ETag, pela PK) não conta: só as queries de vagas
+        if "ingest_generation" not in statement:
+            seen.append(statement)
+
+    # a API usa o engine assíncrono; os eventos de cursor ficam no `sync_engine` dele
+    target = async_engine.sync_engine
+    event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield seen
+    finally:
+        event.remove(target, "before_cursor_execute", _record)
+
+
+def test_list_jobs_runs_one_projected_statement(company_factory, job_factory):
+    for i in range(30):
+        # mistura vagas com e sem posted_at: a página cruza as duas faixas do feed
+        extra = {"posted_at": None} if i % 3 == 0 else {}
+        job_factory(title=f"Job {i}", company=company_factory(), **extra)
+
+    with _statements() as seen:
+        resp = client.get("/jobs", params={"limit": 20, "company": "Company"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body) == 20 and all(j["company"].startswith("Company-") for j in body)
+    assert len(seen) == 1, seen
+    assert "description" not in seen[0]
+
+    with _statements() as seen:
+        client.get("/jobs", params={"limit": 20, "cursor": resp.headers["X-Next-Cursor"]})
+        client.get("/jobs", params={"limit": 20, "offset": 20})
+    assert len(seen) == 2, seen
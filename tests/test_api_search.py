@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from job_finder.api.main import app
+from job_finder.db.models.job import Job
+from job_finder.db.search import fts_match, fts_rank
+
+client = TestClient(app)
+
+
+def test_fts_query_uses_search_vector_and_websearch_syntax():
+    stmt = select(Job.id).where(fts_match('python -django "data engineer"'))
+    stmt = stmt.order_by(fts_rank("python").desc())
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "jobs.search_vector @@ websearch_to_tsquery('english'::regconfig" in sql
+    assert "ts_rank(jobs.search_vector, websearch_to_tsquery('english'::regconfig" in sql
+
+
+def test_q_falls_back_to_substring_without_postgres(job_factory):
+    job_factory(title="Senior Python Developer")
+    job_factory(title="Go Engineer", description_text="we also like python")
+    job_factory(title="Designer")
+
+    for mode in ("fts", "substring"):
+        resp = client.get("/jobs", params={"q": "python", "q_mode": mode, "sort": "relevance"})
+        assert resp.status_code == 200
+        assert sorted(j["title"] for j in resp.json()) == ["Go Engineer", "Senior Python Developer"]
+
+
+def test_invalid_q_mode_is_rejected():
+    assert client.get("/jobs", params={"q": "x", "q_mode": "regex"}).status_code == 422
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from job_finder.api import main
+from job_finder.api.cache import QueryCache
+
+client = TestClient(main.app)
+
+
+def test_include_total_is_exact_for_small_results(job_factory):
+    for i in range(7):
+        job_factory(title=f"Job {i}", remote=i % 2 == 0)
+
+    resp = client.get("/jobs", params={"limit": 2, "remote": True, "include_total": True})
+    assert len(resp.json()) == 2
+    assert resp.headers["X-Total-Count"] == "4"
+    assert resp.headers["X-Total-Count-Exact"] == "true"
+    assert "X-Total-Count" not in client.get("/jobs").headers
+
+
+def test_large_estimates_skip_the_count(job_factory, monkeypatch):
+    job_factory()
+
+    async def _estimate(db, conditions) -> int:
+        return 2_000_000
+
+    async def _no_count(*_: object) -> None:
+        raise AssertionError("COUNT(*) não deveria rodar")
+
+    monkeypatch.setattr(main, "estimate_rows", _estimate)
+    monkeypatch.setattr(main.AsyncSession, "scalar", _no_count)
+    resp = client.get("/jobs", params={"include_total": True})
+    assert resp.headers["X-Total-Count"] == "2000000"
+    assert resp.headers["X-Total-Count-Exact"] == "false"
+
+
+def test_exact_counts_are_cached_per_filter(job_factory, monkeypatch):
+    cache = QueryCache("/jobs:total", main._load_watermark, poll_secs=0)
+    monkeypatch.setattr(main, "total_cache", cache)
+    job_factory(remote=True)
+
+    params = {"remote": True, "include_total": True}
+    assert client.get("/jobs", params=params).headers["X-Total-Count"] == "1"
+    # a contagem guardada vale até a próxima geração de ingestão
+    job_factory(remote=True)
+    assert client.get("/jobs", params={**params, "limit": 5}).headers["X-Total-Count"] == "1"
+    other = client.get("/jobs", params={"include_total": True})
+    assert other.headers["X-Total-Count"] == "2"
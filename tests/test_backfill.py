@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import select, update
+
+from job_finder.db.fx import upsert_fx_rates
+from job_finder.db.models.job import Job
+from job_finder.scraping.checksum import content_digest, content_fields
+from job_finder.scripts.backfill import (
+    backfill_content_hash,
+    backfill_salary_usd,
+    backfill_seniority,
+)
+
+
+def test_backfill_content_hash_fills_only_missing(db, job_factory):
+    jobs = [job_factory(title=f"Engineer {i}") for i in range(5)]
+
+    assert backfill_content_hash(db, batch_size=2) == 5
+    assert backfill_content_hash(db, batch_size=2) == 0
+
+    db.expire_all()
+    for j in jobs:
+        stored = db.scalar(select(Job).where(Job.id == j.id))
+        assert stored.content_hash == content_digest(content_fields(stored))
+
+
+def test_backfill_content_hash_keeps_updated_at(db, job_factory):
+    job = job_factory(title="Engineer")
+    old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    db.execute(update(Job).where(Job.id == job.id).values(updated_at=old, content_hash=None))
+    db.commit()
+
+    assert backfill_content_hash(db) == 1
+    db.expire_all()
+    stored = db.get(Job, job.id)
+    assert stored.content_hash is not None
+    assert stored.updated_at.replace(tzinfo=timezone.utc) == old
+
+
+def test_backfill_seniority_fills_level_and_keeps_raw_value(db, job_factory):
+    raw = job_factory(seniority="Sr.", seniority_level=None)
+    unknown = job_factory(seniority="wizard", seniority_level=None)
+    done = job_factory(seniority="mid")
+    updated_at = db.get(Job, raw.id).updated_at
+
+    assert backfill_seniority(db, batch_size=2) == 1
+
+    db.expire_all()
+    levels = {j.id: (j.seniority, j.seniority_level) for j in db.scalars(select(Job))}
+    assert levels[raw.id] == ("Sr.", "senior")
+    assert levels[unknown.id] == ("wizard", None)
+    assert levels[done.id] == ("mid", "mid")
+    assert db.get(Job, raw.id).updated_at == updated_at
+
+
+def test_backfill_salary_usd_follows_rate_updates(db, job_factory):
+    upsert_fx_rates(db, {"USD": Decimal(1), "EUR": Decimal("1.10")})
+    eur = job_factory(currency="EUR", salary_min=50000, salary_max=70000)
+    brl = job_factory(currency="BRL", salary_min=10000, salary_max=None)
+    before = db.get(Job, eur.id).updated_at
+
+    assert backfill_salary_usd(db, batch_size=1) == 1  # BRL ainda sem cotação
+    db.expire_all()
+    stored = db.get(Job, eur.id)
+    assert (stored.salary_min_usd, stored.salary_max_usd) == (Decimal("55000"), Decimal("77000"))
+    assert stored.updated_at == before
+    assert db.get(Job, brl.id).salary_min_usd is None
+
+    upsert_fx_rates(db, {"EUR": Decimal("1.20"), "BRL": Decimal("0.2")})
+    assert backfill_salary_usd(db) == 2
+    assert backfill_salary_usd(db) == 0
+    db.expire_all()
+    assert db.get(Job, eur.id).salary_min_usd == Decimal("60000")
+    assert db.get(Job, brl.id).salary_min_usd == Decimal("2000")
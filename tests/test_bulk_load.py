@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from job_finder.db.bulk_load import STAGING_COLUMNS, bulk_load, staging_row
+from job_finder.scraping.schemas import JobIngest
+from job_finder.scripts.bulk_load import JsonlReader
+
+
+def test_staging_row_follows_copy_column_order():
+    data = JobIngest(
+        source="remoteok",
+        external_id="ext-1",
+        source_url="https://example.com/jobs/1",
+        title="Backend Engineer",
+        company_name="Acme Inc",
+        tags={"board": "remoteok"},
+        currency="EUR",
+        salary_min=50000,
+    )
+    now = datetime.now(timezone.utc)
+    rates = {"EUR": Decimal("1.1")}
+    row = dict(zip(STAGING_COLUMNS, staging_row(7, data, now, rates), strict=True))
+    assert row["seq"] == 7
+    assert row["company_name"] == "Acme Inc"
+    assert row["source_url"] == "https://example.com/jobs/1"
+    assert row["scraped_at"] is now
+    assert row["salary_min_usd"] == Decimal("55000.00") and row["salary_max_usd"] is None
+    assert len(row["content_hash"]) == 16
+
+
+def test_jsonl_reader_skips_invalid_lines():
+    good = '{"source": "remoteok", "source_url": "https://example.com/1", "title": "SRE"}'
+    stream = io.StringIO("\n".join([good, "{not json", '{"source": "x"}', "", good]))
+    reader = JsonlReader([stream])
+    assert [r.title for r in reader] == ["SRE", "SRE"]
+    assert reader.invalid == 2
+
+
+def test_bulk_load_requires_postgres(db):
+    with pytest.raises(RuntimeError):
+        bulk_load(db, [])
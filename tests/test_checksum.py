@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from job_finder.scraping import checksum
+from job_finder.scraping.checksum import ChecksumIndex, content_digest
+
+
+def test_index_lookup_and_overlay():
+    d1 = content_digest({"title": "Backend"})
+    d2 = content_digest({"title": "Frontend"})
+    index = ChecksumIndex([("b", d2), ("a", d1)])
+
+    assert len(d1) == 16
+    assert index.get("a") == d1
+    assert index.get("b") == d2
+    assert index.get("missing") is None
+
+    d3 = content_digest({"title": "Backend II"})
+    index.remember("a", d3)
+    index.remember("c", d1)
+    assert index.get("a") == d3
+    assert index.get("c") == d1
+    # "a" está no array e no overlay: conta uma vez
+    index.remember("a", d2)
+    assert len(index) == 3
+
+
+def test_index_stays_compact():
+    entries = ((f"ext-{i}", content_digest({"i": i})) for i in range(10_000))
+    index = ChecksumIndex(entries)
+    assert len(index) == 10_000
+    assert index._keys.itemsize * len(index._keys) + len(index._digests) == 24 * 10_000
+
+
+def test_index_merges_sorted_chunks(monkeypatch):
+    monkeypatch.setattr(checksum, "SORT_CHUNK", 7)
+    entries = [(f"ext-{i}", content_digest({"i": i})) for i in range(100)]
+    index = ChecksumIndex(reversed(entries))
+
+    assert list(index._keys) == sorted(index._keys)
+    assert len(index) == 100
+    assert all(index.get(ext) == digest for ext, digest in entries)
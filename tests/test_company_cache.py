@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from sqlalchemy import event, func, select
+
+from job_finder.db.company_cache import CompanyCache
+from job_finder.db.models.company import Company
+
+
+def _count_statements(db):
+    executed: list[str] = []
+
+    def _on_execute(conn, cursor, statement, params, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _on_execute)
+    return executed, lambda: event.remove(db.get_bind(), "before_cursor_execute", _on_execute)
+
+
+def test_warm_then_hits_skip_the_database(db, company_factory):
+    acme = company_factory(name="Acme Inc")
+    cache = CompanyCache()
+    assert cache.warm(db) == 1
+
+    executed, stop = _count_statements(db)
+    try:
+        ids = cache.resolve_many(db, ["Acme Inc", "Acme Inc", None])
+    finally:
+        stop()
+    assert ids == {"Acme Inc": acme.id}
+    assert executed == []
+
+
+def test_misses_are_created_in_bulk_and_reuse_existing(db, company_factory):
+    globex = company_factory(name="Globex")
+    cache = CompanyCache()
+
+    ids = cache.resolve_many(db, ["Globex", "Initech", "Hooli"])
+    db.commit()
+
+    assert ids["Globex"] == globex.id
+    assert set(ids) == {"Globex", "Initech", "Hooli"}
+    assert db.scalar(select(func.count()).select_from(Company)) == 3
+    assert "Initech" in cache
+
+
+def test_lru_eviction_keeps_most_recent(db):
+    cache = CompanyCache(max_size=2)
+    cache.resolve_many(db, ["A", "B"])
+    cache.resolve_many(db, ["A"])
+    cache.resolve_many(db, ["C"])
+    assert "A" in cache and "C" in cache
+    assert "B" not in cache
+    assert len(cache) == 2
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import DropItem
+from scrapy.signalmanager import SignalManager
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from twisted.internet.defer import maybeDeferred, succeed
+
+from job_finder.db.models.job import Job
+from job_finder.scraping.pipelines import db_pipeline
+from job_finder.scraping.pipelines.db_pipeline import DbPipeline, DbWriteFailed
+from job_finder.scraping.pipelines.dedupe_pipeline import DedupePipeline
+from job_finder.scraping.signals import job_seen
+
+
+class _DummySpider:
+    name = "remoteok"
+
+
+def _item(external_id: str, title: str = "Backend Engineer") -> dict:
+    return {
+        "source": "remoteok",
+        "external_id": external_id,
+        "source_url": f"https://example.com/jobs/{external_id}",
+        "title": title,
+        "company_name": "Acme Inc",
+        "remote": True,
+        "language": "en",
+        "tags": {"board": "remoteok"},
+    }
+
+
+def _count_jobs(db) -> int:
+    db.expire_all()
+    return db.scalar(select(func.count()).select_from(Job))
+
+
+def test_flushes_when_batch_is_full(db):
+    pipeline = DbPipeline(batch_size=2, flush_interval=0)
+    spider = _DummySpider()
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("a"), spider)
+        assert _count_jobs(db) == 0
+        pipeline.process_item(_item("b"), spider)
+        assert _count_jobs(db) == 2
+        pipeline.process_item(_item("c"), spider)
+        assert _count_jobs(db) == 2
+    finally:
+        pipeline.close_spider(spider)
+    assert _count_jobs(db) == 3
+
+
+def test_batch_upsert_keeps_last_version_of_duplicates(db):
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    spider = _DummySpider()
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("dup", title="v1"), spider)
+        pipeline.process_item(_item("dup", title="v2"), spider)
+    finally:
+        pipeline.close_spider(spider)
+
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("dup", title="v3"), spider)
+    finally:
+        pipeline.close_spider(spider)
+
+    db.expire_all()
+    titles = db.scalars(select(Job.title).where(Job.external_id == "dup")).all()
+    assert titles == ["v3"]
+
+
+def test_content_hash_written_on_upsert_drives_dedupe(db):
+    spider = _DummySpider()
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("hashed"), spider)
+    finally:
+        pipeline.close_spider(spider)
+
+    db.expire_all()
+    stored = db.scalar(select(Job.content_hash).where(Job.external_id == "hashed"))
+    assert stored is not None and len(stored) == 16
+
+    dedupe = DedupePipeline()
+    dedupe.open_spider(spider)
+    try:
+        with pytest.raises(DropItem):
+            dedupe.process_item(_item("hashed"), spider)
+        assert dedupe.process_item(_item("hashed", title="Changed"), spider)
+    finally:
+        dedupe.close_spider(spider)
+
+
+def test_unchanged_rows_are_not_rewritten_but_marked_seen(db):
+    spider = _DummySpider()
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("same"), spider)
+        pipeline.process_item(_item("edited", title="v1"), spider)
+    finally:
+        pipeline.close_spider(spider)
+    db.expire_all()
+    before = {j.external_id: j for j in db.scalars(select(Job))}
+    first_seen = before["same"].last_seen_at
+    first_scraped = before["same"].scraped_at
+    db.expire_all()
+
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("same"), spider)
+        pipeline.process_item(_item("edited", title="v2"), spider)
+        pipeline.process_item(_item("new"), spider)
+    finally:
+        pipeline.close_spider(spider)
+
+    stats = pipeline._stats
+    assert (stats.inserted, stats.updated, stats.unchanged) == (1, 1, 1)
+    db.expire_all()
+    same = db.scalar(select(Job).where(Job.external_id == "same"))
+    assert same.scraped_at == first_scraped
+    assert same.last_seen_at > first_seen
+    edited = db.scalar(select(Job).where(Job.external_id == "edited"))
+    assert edited.title == "v2"
+
+
+def _last_seen(db, external_id: str):
+    db.expire_all()
+    return db.scalar(select(Job.last_seen_at).where(Job.external_id == external_id))
+
+
+def _write_kept(db, spider) -> None:
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("kept"), spider)
+    finally:
+        pipeline.close_spider(spider)
+
+
+def test_dedupe_drops_are_marked_seen_by_the_writer(db, monkeypatch):
+    spider = _DummySpider()
+    _write_kept(db, spider)
+    first_seen = _last_seen(db, "kept")
+
+    # mesma ligação do from_crawler: o toque vai para a escrita do DbPipeline
+    crawler = SimpleNamespace(signals=SignalManager())
+    writer = DbPipeline(batch_size=10, flush_interval=0)
+    crawler.signals.connect(writer.job_seen, signal=job_seen)
+    writes = []
+    monkeypatch.setattr(writer, "_submit", lambda fn, *args: writes.append(fn) or fn(*args))
+    dedupe = DedupePipeline(crawler=crawler)
+    writer.open_spider(spider)
+    dedupe.open_spider(spider)
+    with pytest.raises(DropItem):
+        dedupe.process_item(_item("kept"), spider)
+    assert dedupe.close_spider(spider) is None and dedupe._seen == []
+    assert _last_seen(db, "kept") == first_seen
+
+    writer.close_spider(spider)
+    assert writes[0] == writer._add_seen
+    assert _last_seen(db, "kept") > first_seen
+
+
+def test_dedupe_touches_seen_itself_without_a_writer(db):
+    spider = _DummySpider()
+    _write_kept(db, spider)
+    first_seen = _last_seen(db, "kept")
+
+    dedupe = DedupePipeline()
+    dedupe.open_spider(spider)
+    with pytest.raises(DropItem):
+        dedupe.process_item(_item("kept"), spider)
+    dedupe.close_spider(spider)
+    assert _last_seen(db, "kept") > first_seen
+
+
+def _failing_writes(monkeypatch, fails: dict, error: Exception) -> None:
+    real = db_pipeline.write_batch
+
+    def write_batch(db, companies, pending, **kwargs):
+        if fails["left"] > 0:
+            fails["left"] -= 1
+            raise error
+        return real(db, companies, pending, **kwargs)
+
+    monkeypatch.setattr(db_pipeline, "write_batch", write_batch)
+
+
+def test_failed_flush_keeps_the_batch_and_retries(db, monkeypatch):
+    fails = {"left": 2}
+    _failing_writes(monkeypatch, fails, OperationalError("INSERT", {}, ConnectionError()))
+    spider = _DummySpider()
+    pipeline = DbPipeline(batch_size=2, flush_interval=0, retry_backoff=0)
+    pipeline.open_spider(spider)
+    try:
+        pipeline.process_item(_item("a"), spider)
+        pipeline.process_item(_item("b"), spider)
+        pipeline.process_item(_item("c"), spider)
+        # duas falhas: nada gravado, nada contado como gravado, nada perdido
+        assert fails["left"] == 0
+        assert _count_jobs(db) == 0
+        assert pipeline._stats.written == 0
+        assert [d.external_id for d, *_ in pipeline._buffer] == ["a", "b", "c"]
+    finally:
+        pipeline.close_spider(spider)
+    assert _count_jobs(db) == 3
+    assert pipeline._stats.inserted == 3
+
+
+def test_close_raises_when_writes_keep_failing(db, monkeypatch):
+    _failing_writes(monkeypatch, {"left": 99}, OperationalError("INSERT", {}, ConnectionError()))
+    spider = _DummySpider()
+    pipeline = DbPipeline(batch_size=10, flush_interval=0, max_retries=2, retry_backoff=0)
+    pipeline.open_spider(spider)
+    pipeline.process_item(_item("a"), spider)
+    with pytest.raises(DbWriteFailed):
+        pipeline.close_spider(spider)
+    assert _count_jobs(db) == 0
+    assert pipeline._stats.written == 0
+
+
+def test_data_error_only_drops_the_rejected_job(db, monkeypatch):
+    # o lote falha uma vez por erro de dado; regravado vaga a vaga, só "bad" é recusada
+    real = db_pipeline.write_batch
+
+    def write_batch(db, companies, pending, **kwargs):
+        if any(d.external_id == "bad" for d, _ in pending):
+            raise IntegrityError("INSERT", {}, ValueError())
+        return real(db, companies, pending, **kwargs)
+
+    monkeypatch.setattr(db_pipeline, "write_batch", write_batch)
+    spider = _DummySpider()
+    pipeline = DbPipeline(batch_size=10, flush_interval=0)
+    pipeline.open_spider(spider)
+    for external_id in ("a", "bad", "c"):
+        pipeline.process_item(_item(external_id), spider)
+    pipeline.close_spider(spider)
+    db.expire_all()
+    assert sorted(db.scalars(select(Job.external_id))) == ["a", "c"]
+    assert pipeline._stats.inserted == 2
+
+
+def _async_pipeline(monkeypatch, **kwargs) -> DbPipeline:
+    # thread escritora simulada: trabalho e callFromThread rodam na hora
+    reactor = SimpleNamespace(callFromThread=lambda fn, *args: fn(*args))
+    monkeypatch.setattr(db_pipeline, "reactor", reactor)
+    pipeline = DbPipeline(flush_interval=0, **kwargs)
+    pipeline.open_spider(_DummySpider())
+    pipeline._pool = object()
+    pipeline._submit = maybeDeferred
+    return pipeline
+
+
+def test_async_items_resolve_only_after_their_flush(db, monkeypatch):
+    pipeline = _async_pipeline(monkeypatch, batch_size=2)
+    spider = _DummySpider()
+    results = []
+    first = pipeline.process_item(_item("a"), spider)
+    first.addCallback(results.append)
+    assert not first.called and pipeline._in_flight == 1
+    second = pipeline.process_item(_item("b"), spider)
+    second.addCallback(results.append)
+    assert [r["external_id"] for r in results] == ["a", "b"]
+    assert pipeline._in_flight == 0
+    assert _count_jobs(db) == 2
+    pipeline._pool = None
+    pipeline.close_spider(spider)
+
+
+def test_async_items_fail_after_the_last_retry(db, monkeypatch):
+    _failing_writes(monkeypatch, {"left": 99}, OperationalError("INSERT", {}, ConnectionError()))
+    pipeline = _async_pipeline(monkeypatch, batch_size=1, max_retries=2, retry_backoff=0)
+    spider = _DummySpider()
+    errors = []
+    first = pipeline.process_item(_item("a"), spider)
+    first.addErrback(errors.append)
+    assert not first.called  # 1ª falha: de volta ao buffer, sem resolver
+    pipeline._flush("timer")
+    assert [e.check(DbWriteFailed) for e in errors] == [DbWriteFailed]
+    assert pipeline._buffer == [] and pipeline._in_flight == 0
+    assert pipeline._stats.written == 0
+    pipeline._pool = None
+    pipeline.close_spider(spider)
+
+
+class _LegacyEngine:
+    # Scrapy 2.13: só close_spider(spider, reason)
+    def __init__(self) -> None:
+        self.closed: list[tuple[object, str]] = []
+
+    def close_spider(self, spider, reason="cancelled"):
+        self.closed.append((spider, reason))
+        return succeed(None)
+
+
+class _AsyncEngine(_LegacyEngine):
+    async def close_spider_async(self, *, reason="cancelled"):
+        self.closed.append(("async", reason))
+
+
+@pytest.mark.parametrize("engine_cls", [_LegacyEngine, _AsyncEngine])
+def test_stop_crawl_closes_the_spider(monkeypatch, engine_cls):
+    reactor = SimpleNamespace(callFromThread=lambda fn, *args: fn(*args))
+    monkeypatch.setattr(db_pipeline, "reactor", reactor)
+    spider = _DummySpider()
+    engine = engine_cls()
+    crawler = SimpleNamespace(engine=engine, spider=spider)
+    pipeline = DbPipeline(flush_interval=0, crawler=crawler)
+
+    pipeline._stop_crawl("db_write_failed")
+    expected = "async" if engine_cls is _AsyncEngine else spider
+    assert engine.closed == [(expected, "db_write_failed")]
@@ -10,7 +10,8 @@ from job_finder.scraping.pipelines.dedupe_pipeline import DedupePipeline
 
 
 class _DummySpider:
-    name = "dummy"
+    # as spiders só emitem a própria fonte: o índice carregado no open_spider é o dela
+    name = "remoteok"
 
 
 def _existing_job(db) -> Job:
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from job_finder.api.main import app
+from job_finder.db.facets import rebuild_facets
+from job_finder.db.models.job_facet import JobFacet
+from job_finder.scraping.schemas import JobIngest
+
+client = TestClient(app)
+
+
+def _job(external_id: str, **overrides) -> JobIngest:
+    data = dict(
+        source="remoteok",
+        external_id=external_id,
+        source_url=f"https://example.com/{external_id}",
+        title=f"Job {external_id}",
+        company_name="Acme",
+        remote=True,
+        seniority="senior",
+        posted_at=datetime(2026, 10, 1, 12, tzinfo=timezone.utc),
+    )
+    return JobIngest(**(data | overrides))
+
+
+def _counts(db) -> dict[tuple[str, str], int]:
+    rows = db.execute(select(JobFacet.facet, JobFacet.value, JobFacet.count))
+    return {(f, v): n for f, v, n in rows if n}
+
+
+def test_ingestion_applies_facet_deltas(db, ingest):
+    ingest(_job("1"), _job("2"), _job("3", remote=False, seniority="junior"))
+    counts = _counts(db)
+    assert counts["source", "remoteok"] == 3
+    assert counts["remote", "true"] == 2 and counts["remote", "false"] == 1
+    assert counts["seniority", "senior"] == 2
+    assert counts["posted_day", "2026-10-01"] == 3
+
+    # vaga reescrita move a contagem; revista sem mudança não altera nada
+    ingest(_job("1", seniority="lead"), _job("2"))
+    counts = _counts(db)
+    assert counts["seniority", "senior"] == 1 and counts["seniority", "lead"] == 1
+    assert counts["source", "remoteok"] == 3
+
+    # os deltas batem com uma reconstrução do zero
+    rebuild_facets(db)
+    db.commit()
+    assert _counts(db) == counts
+
+
+def test_facet_endpoints(ingest):
+    ingest(_job("1"), _job("2"), _job("3", seniority="junior"))
+
+    body = client.get("/jobs/facets", params={"facet": ["seniority", "company"]}).json()
+    assert set(body) == {"seniority", "company"}
+    assert body["seniority"] == [
+        {"value": "senior", "count": 2, "label": None},
+        {"value": "junior", "count": 1, "label": None},
+    ]
+    assert body["company"][0]["label"] == "Acme"
+
+    stats = client.get("/stats/seniority", params={"limit": 1}).json()
+    assert stats == [{"value": "senior", "count": 2, "label": None}]
+    assert client.get("/stats/nope").status_code == 422
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+from structlog.testing import capture_logs
+
+from job_finder.obs.log_sampling import LogAggregator
+from job_finder.scraping.middlewares.policy import PolicyMiddleware
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _DummySpider:
+    name = "dummy"
+
+
+def test_samples_one_in_k_and_summarizes_every_n_items():
+    agg = LogAggregator("test", "dummy", sample_rate=3, summary_every_items=5)
+    with capture_logs() as logs:
+        for _ in range(7):
+            agg.record("item", key="ok")
+        agg.flush()
+    events = [e["event"] for e in logs]
+    # amostras nos eventos 1, 4 e 7; resumo no 5º e no flush final
+    assert events.count("item") == 3
+    summaries = [e for e in logs if e["event"] == "test_summary"]
+    assert [s["events"] for s in summaries] == [5, 2]
+    assert summaries[0]["counts"] == {"item:ok": 5}
+
+
+def test_forced_events_always_logged_and_interval_triggers_summary():
+    clock = _Clock()
+    agg = LogAggregator(
+        "test",
+        "dummy",
+        sample_rate=0,
+        summary_every_items=1000,
+        summary_interval_secs=10,
+        clock=clock,
+    )
+    with capture_logs() as logs:
+        agg.record("item")
+        agg.record("failure", force=True, level="error", reason="boom")
+        clock.now = 11
+        agg.record("item")
+    assert [e["event"] for e in logs] == ["failure", "test_summary"]
+    assert logs[0]["log_level"] == "error"
+    assert logs[1]["counts"] == {"item": 2, "failure": 1}
+
+
+def test_policy_middleware_always_logs_non_2xx():
+    settings = Settings({"LOG_SAMPLE_RATE": 0, "LOG_SUMMARY_EVERY_ITEMS": 1000})
+    mw = PolicyMiddleware(settings=settings)
+    spider = _DummySpider()
+    with capture_logs() as logs:
+        for status in (200, 200, 404, 200, 503):
+            request = Request(f"https://example.com/{status}")
+            mw.process_request(request, spider)
+            mw.process_response(request, HtmlResponse(request.url, status=status), spider)
+        mw.spider_closed(spider)
+    responses = [e for e in logs if e["event"] == "http_response"]
+    assert [e["status_code"] for e in responses] == [404, 503]
+    (summary,) = [e for e in logs if e["event"] == "http_summary"]
+    assert summary["counts"] == {
+        "http_response:200": 3,
+        "http_response:404": 1,
+        "http_response:503": 1,
+    }
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import Connection, select, text
+from sqlalchemy.orm import Session
+
+from job_finder.api.main import jobs_query
+from job_finder.api.pagination import FEED_ORDER, FeedKey
+from job_finder.db.models.job import Job
+
+# ---- Planos e latência do /jobs (somente Postgres: TEST_POSTGRES_URL, ver fixture `pg`) ----
+# O schema do banco apontado é recriado: use um banco descartável. Cada combinação de
+# filtro do /jobs roda com EXPLAIN ANALYZE sobre TEST_PLAN_ROWS vagas. O formato do plano
+# é sempre verificado: `jobs` só é lida por índice (nenhum Seq Scan) e, quando o caso
+# indica, pelo índice esperado. O tempo de execução só é cobrado com TEST_PLAN_BUDGET_MS
+# definido (depende da máquina); sem ele, vai para o log do teste.
+
+log = logging.getLogger(__name__)
+ROWS = int(os.getenv("TEST_PLAN_ROWS", "200000"))
+BUDGET_MS = float(os.environ["TEST_PLAN_BUDGET_MS"]) if os.getenv("TEST_PLAN_BUDGET_MS") else None
+PAGE = 50
+
+_SEED_COMPANIES = """
+INSERT INTO companies (id, name)
+SELECT gen_random_uuid(), 'Company ' || i FROM generate_series(0, 999) AS i
+"""
+
+# 5% remotas, 1% da fonte "niche", 10% sem posted_at, 2% com "python" no título
+_SEED_JOBS = """
+INSERT INTO jobs (
+    id, source, external_id, source_url, title, company_id, location, remote, seniority,
+    seniority_level, salary_min_usd, salary_max_usd, posted_at, scraped_at
+)
+SELECT
+    gen_random_uuid(),
+    CASE WHEN i % 100 = 0 THEN 'niche' ELSE 'board_' || (i % 4) END,
+    i::text,
+    'https://example.com/' || i,
+    CASE WHEN i % 50 = 0 THEN 'Python Engineer ' ELSE 'Job ' END || i,
+    c.id,
+    'City ' || (i % 500),
+    i % 20 = 0,
+    (ARRAY['Jr', 'Pleno', 'Sr.', 'Tech Lead'])[i % 4 + 1],
+    (ARRAY['junior', 'mid', 'senior', 'lead'])[i % 4 + 1],
+    1000 * (i % 200),
+    1000 * (i % 200) + 50000,
+    CASE WHEN i % 10 = 0 THEN NULL ELSE now() - make_interval(mins => i) END,
+    now() - make_interval(secs => i)
+FROM generate_series(1, :rows) AS i
+JOIN companies c ON c.name = 'Company ' || (i % 1000)
+"""
+
+
+def pg_seed(conn: Connection) -> None:
+    conn.execute(text(_SEED_COMPANIES))
+    conn.execute(text(_SEED_JOBS), {"rows": ROWS})
+
+
+def _nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _explain(db: Session, after: FeedKey | None = None, **filters: Any) -> dict[str, Any]:
+    """EXPLAIN ANALYZE da consulta que o /jobs monta para os filtros (2ª execução, cache quente)."""
+    params = {"q": None, "q_mode": "fts", **filters}
+    stmt, _ = jobs_query(
+        fts_available=True, sort="recent", limit=PAGE, offset=0, after=after, **params
+    )
+    compiled = stmt.compile(db.get_bind(), compile_kwargs={"render_postcompile": True})
+    conn = db.connection()
+    sql = f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"
+    conn.exec_driver_sql(sql, compiled.params)
+    out = conn.exec_driver_sql(sql, compiled.params).scalar_one()
+    db.rollback()
+    return (json.loads(out) if isinstance(out, str) else out)[0]
+
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+
+def _check(explained: dict[str, Any], index: str | None) -> None:
+    nodes = list(_nodes(explained["Plan"]))
+    plan = json.dumps(explained, indent=1)
+    jobs = [n for n in nodes if n.get("Relation Name") == "jobs"]
+    assert jobs, plan
+    assert all(n["Node Type"] in INDEX_SCANS for n in jobs), plan
+    if index is not None:
+        used = {n.get("Index Name") for n in nodes}
+        assert index in used, plan
+    elapsed_ms = explained["Execution Time"]
+    if BUDGET_MS is None:
+        log.info("plan execution time: %.2f ms", elapsed_ms)
+    else:
+        assert elapsed_ms <= BUDGET_MS, elapsed_ms
+
+
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        pytest.param({}, "ix_jobs_feed", id="feed"),
+        pytest.param({"remote": True}, "ix_jobs_remote_feed", id="remote"),
+        pytest.param(
+            {"remote": True, "seniority": "senior"}, "ix_jobs_remote_feed", id="remote+sen"
+        ),
+        pytest.param({"source": "niche"}, "ix_jobs_source_feed", id="source"),
+        pytest.param({"company": "Company 7", "match": "exact"}, None, id="company"),
+        pytest.param({"location": "City 42", "match": "exact"}, None, id="location"),
+        pytest.param({"seniority": "senior"}, None, id="seniority"),
+        pytest.param({"min_salary": 150_000}, None, id="min_salary"),
+        pytest.param({"min_salary": 50_000, "max_salary": 120_000}, None, id="salary_range"),
+        pytest.param({"q": "python"}, None, id="fts"),
+    ],
+)
+def test_jobs_filter_plans(pg, filters, index):
+    _check(_explain(pg, **filters), index)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        pytest.param({}, id="feed"),
+        pytest.param({"remote": True}, id="remote"),
+        pytest.param({"source": "niche"}, id="source"),
+    ],
+)
+def test_deep_cursor_pages_stay_index_range_scans(pg, filters):
+    # página a meio caminho do feed (do filtro): mesmo custo da primeira
+    conditions = []
+    if filters.get("remote"):
+        conditions.append(Job.remote.is_(True))
+    if "source" in filters:
+        conditions.append(Job.source == filters["source"])
+    middle = (
+        select(Job.posted_at, Job.scraped_at, Job.id)
+        .where(*conditions)
+        .order_by(*FEED_ORDER)
+        .offset(ROWS // 200)
+        .limit(1)
+    )
+    after = FeedKey.of(pg.execute(middle).one())
+    pg.rollback()
+    _check(_explain(pg, after=after, **filters), None)
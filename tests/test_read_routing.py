@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from job_finder.db import session as db_session
+from job_finder.db.session import ReadRouter, replica_lag_secs
+
+# Primário e réplica como dois arquivos SQLite: cada um sabe quem é
+
+
+def _database(path, role: str) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def setup() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE role (name TEXT)"))
+            await conn.execute(text("INSERT INTO role VALUES (:name)"), {"name": role})
+        await engine.dispose()
+
+    asyncio.run(setup())
+    return async_sessionmaker(bind=engine)
+
+
+async def _role(router: ReadRouter) -> str:
+    factory = await router.sessionmaker()
+    async with factory() as db:
+        name = await db.scalar(text("SELECT name FROM role"))
+    await db.bind.dispose()
+    return name
+
+
+def test_reads_follow_replica_lag(tmp_path):
+    primary = _database(tmp_path / "primary.db", "primary")
+    replica = _database(tmp_path / "replica.db", "replica")
+    lag = {"secs": 0.0}
+
+    async def probe(factory: async_sessionmaker[AsyncSession]) -> float:
+        if lag["secs"] < 0:
+            raise OperationalError("SELECT 1", {}, ConnectionRefusedError())
+        return lag["secs"]
+
+    async def run() -> list[str]:
+        router = ReadRouter(primary, replica, max_lag_secs=5, poll_secs=0, probe=probe)
+        seen = [await _role(router)]
+        lag["secs"] = 30
+        seen.append(await _role(router))
+        lag["secs"] = -1  # réplica fora do ar
+        seen.append(await _role(router))
+        lag["secs"] = 1
+        seen.append(await _role(router))
+        return seen
+
+    assert asyncio.run(run()) == ["replica", "primary", "primary", "replica"]
+
+
+def test_lag_is_polled_at_most_once_per_interval(tmp_path):
+    primary = _database(tmp_path / "primary.db", "primary")
+    replica = _database(tmp_path / "replica.db", "replica")
+    calls = []
+
+    async def probe(factory: async_sessionmaker[AsyncSession]) -> float:
+        calls.append(factory)
+        return 60.0
+
+    async def run() -> list[str]:
+        router = ReadRouter(primary, replica, max_lag_secs=5, poll_secs=3600, probe=probe)
+        return [await _role(router) for _ in range(3)]
+
+    assert asyncio.run(run()) == ["primary"] * 3
+    assert calls == [replica]
+
+
+def test_without_replica_everything_reads_the_primary(tmp_path):
+    primary = _database(tmp_path / "primary.db", "primary")
+    router = ReadRouter(primary, None, max_lag_secs=5, poll_secs=0)
+    assert asyncio.run(_role(router)) == "primary"
+    # configuração dos testes: sem DATABASE_READ_URL, réplica = primário
+    assert db_session.read_router.replica is None
+    assert db_session.async_read_engine is db_session.async_engine
+
+
+def test_sqlite_stand_in_reports_no_lag(tmp_path):
+    replica = _database(tmp_path / "replica.db", "replica")
+    assert asyncio.run(replica_lag_secs(replica)) == 0.0
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from job_finder.api.main import app
+from job_finder.db.facets import rebuild_facets
+from job_finder.db.fx import upsert_fx_rates
+from job_finder.db.generation import current_watermark
+from job_finder.db.models.job import Job
+from job_finder.db.models.job_facet import JobFacet
+from job_finder.scripts.seed import seed_demo
+
+client = TestClient(app)
+
+
+def test_demo_seed_is_written_like_an_ingest(db):
+    upsert_fx_rates(db, {"USD": Decimal(1)})
+    db.commit()
+    before = current_watermark(db.connection()).generation
+    db.rollback()
+
+    seed_demo(db, jobs_total=20, companies_total=3)
+
+    assert db.scalar(select(func.count()).where(Job.salary_min_usd.is_(None))) == 0
+    resp = client.get("/jobs", params={"min_salary": 50_000, "limit": 100})
+    assert len(resp.json()) == 20
+    assert current_watermark(db.connection()).generation > before
+
+    counts = {(f.facet, f.value): f.count for f in db.scalars(select(JobFacet))}
+    rebuild_facets(db)
+    rebuilt = {(f.facet, f.value): f.count for f in db.scalars(select(JobFacet))}
+    assert counts == rebuilt
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+
+import pytest
+from sqlalchemy import func, select
+
+from job_finder.db.models.job import Job
+from job_finder.scraping.pipelines.spool_pipeline import SpoolPipeline
+from job_finder.scraping.schemas import JobIngest
+from job_finder.scraping.spool import (
+    QUARANTINE_DIR,
+    SpoolCheckpoint,
+    SpoolCorruption,
+    SpoolWriter,
+    read_frames,
+    read_segment,
+    seal_orphans,
+    sealed_segments,
+)
+from job_finder.scripts.spool import SpoolLoad, drain, main
+
+
+def _data(i: int) -> JobIngest:
+    return JobIngest(
+        source="remoteok",
+        external_id=f"ext-{i}",
+        source_url=f"https://example.com/jobs/{i}",
+        title=f"Engineer {i}",
+        company_name="Acme Inc",
+    )
+
+
+def test_segments_are_sealed_on_rotation_and_close(tmp_path):
+    writer = SpoolWriter(tmp_path, prefix="remoteok", segment_bytes=400, fsync_every=2)
+    for i in range(5):
+        writer.append(_data(i))
+    writer.close()
+
+    segments = sealed_segments(tmp_path)
+    assert len(segments) > 1
+    assert not list(tmp_path.glob("*.seg.open"))
+    titles = [d.title for seg in segments for _, d, _ in read_segment(seg)]
+    assert titles == [f"Engineer {i}" for i in range(5)]
+
+
+def test_crash_tail_is_trimmed_when_the_orphan_is_sealed(tmp_path):
+    writer = SpoolWriter(tmp_path, prefix="remoteok")
+    writer.append(_data(1))
+    writer.append(_data(2))
+    assert sealed_segments(tmp_path) == []
+    writer._sync()
+    (open_segment,) = tmp_path.glob("*.seg.open")
+    # processo morto no meio do último frame
+    orphan = tmp_path / "remoteok-20260101T000000-999999999-000001.seg.open"
+    orphan.write_bytes(open_segment.read_bytes()[:-5])
+
+    (segment,) = seal_orphans(tmp_path)
+    assert [d.external_id for _, d, _ in read_segment(segment)] == ["ext-1"]
+    writer.close()
+
+
+def test_corrupt_frame_in_sealed_segment_stops_the_drain_loudly(db, tmp_path):
+    writer = SpoolWriter(tmp_path, prefix="remoteok")
+    for i in range(3):
+        writer.append(_data(i))
+    writer.close()
+    (segment,) = sealed_segments(tmp_path)
+    raw = bytearray(segment.read_bytes())
+    second = next(end for _, end, _ in read_frames(segment))
+    raw[second + 12] ^= 0xFF  # byte do payload do 2º frame: CRC não bate
+    segment.write_bytes(bytes(raw))
+
+    for _ in range(2):  # nova execução: mesmo erro, nada pulado
+        with pytest.raises(SpoolCorruption) as exc:
+            drain(str(tmp_path), batch_size=10)
+        assert exc.value.offset == second
+        assert SpoolCheckpoint(tmp_path).get(segment) == second
+    db.expire_all()
+    assert db.scalars(select(Job.external_id)).all() == ["ext-0"]
+
+
+def test_undecodable_record_is_quarantined(db, tmp_path):
+    writer = SpoolWriter(tmp_path, prefix="remoteok")
+    writer.append(_data(1))
+    writer.close()
+    (segment,) = sealed_segments(tmp_path)
+    payload = json.dumps({"scraped_at": "2026-01-01T00:00:00+00:00", "item": {"source": "x"}})
+    frame = payload.encode()
+    segment.write_bytes(
+        segment.read_bytes() + struct.pack(">II", len(frame), zlib.crc32(frame)) + frame
+    )
+
+    assert drain(str(tmp_path)) == SpoolLoad(loaded=1, quarantined=1)
+    (bad,) = (tmp_path / QUARANTINE_DIR).glob("*.ndjson")
+    record = json.loads(bad.read_text())
+    assert record["segment"] == segment.name and json.loads(record["payload"]) == json.loads(
+        payload
+    )
+    assert SpoolCheckpoint(tmp_path).get(segment) == segment.stat().st_size
+
+
+def test_orphan_segments_from_dead_processes_are_sealed(tmp_path):
+    orphan = tmp_path / "remoteok-20260101T000000-999999999-000001.seg.open"
+    orphan.write_bytes(b"")
+    live = SpoolWriter(tmp_path, prefix="remoteok")
+    live.append(_data(1))
+
+    assert seal_orphans(tmp_path) == [tmp_path / "remoteok-20260101T000000-999999999-000001.seg"]
+    assert len(list(tmp_path.glob("*.seg.open"))) == 1
+    live.close()
+
+
+def test_drain_is_checkpointed(db, tmp_path):
+    writer = SpoolWriter(tmp_path, prefix="remoteok")
+    for i in range(3):
+        writer.append(_data(i))
+    writer.close()
+
+    assert drain(str(tmp_path), batch_size=2).loaded == 3
+    assert drain(str(tmp_path), batch_size=2).loaded == 0
+
+    writer = SpoolWriter(tmp_path, prefix="remoteok")
+    writer.append(_data(3))
+    writer.close()
+    assert drain(str(tmp_path)).loaded == 1
+
+    db.expire_all()
+    assert db.scalar(select(func.count()).select_from(Job)) == 4
+
+
+class _DummySpider:
+    name = "remoteok"
+
+
+def _run_drain(monkeypatch, directory) -> int:
+    monkeypatch.setattr("sys.argv", ["spool", "drain", "--dir", str(directory)])
+    try:
+        main()
+    except SystemExit as exc:
+        return int(exc.code or 0)
+    return 0
+
+
+def test_pipeline_segments_are_drained_by_the_cli(db, tmp_path, monkeypatch):
+    pipeline = SpoolPipeline(str(tmp_path), segment_bytes=400, fsync_every=2)
+    spider = _DummySpider()
+    pipeline.open_spider(spider)
+    for i in range(5):
+        item = _data(i).model_dump()
+        assert pipeline.process_item(item, spider) is item
+    pipeline.close_spider(spider)
+    assert len(sealed_segments(tmp_path)) > 1
+
+    assert _run_drain(monkeypatch, tmp_path) == 0
+    db.expire_all()
+    assert sorted(db.scalars(select(Job.external_id)).all()) == [f"ext-{i}" for i in range(5)]
+    for segment in sealed_segments(tmp_path):
+        assert SpoolCheckpoint(tmp_path).get(segment) == segment.stat().st_size
+
+
+def test_cli_drain_exits_non_zero_on_quarantined_records(db, tmp_path, monkeypatch, capsys):
+    pipeline = SpoolPipeline(str(tmp_path))
+    spider = _DummySpider()
+    pipeline.open_spider(spider)
+    pipeline.process_item(_data(1), spider)
+    pipeline.close_spider(spider)
+    (segment,) = sealed_segments(tmp_path)
+    frame = json.dumps({"scraped_at": "2026-01-01T00:00:00+00:00", "item": {}}).encode()
+    segment.write_bytes(
+        segment.read_bytes() + struct.pack(">II", len(frame), zlib.crc32(frame)) + frame
+    )
+
+    assert _run_drain(monkeypatch, tmp_path) == 1
+    assert "1 registro(s) em quarentena" in capsys.readouterr().err
+    db.expire_all()
+    assert db.scalars(select(Job.external_id)).all() == ["ext-1"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import HttpUrl
+from scrapy.exceptions import DropItem
+
+from job_finder.obs import metrics as m
+from job_finder.scraping.pipelines.validation_pipeline import ValidationPipeline
+from job_finder.scraping.schemas import JobIngest, as_job_ingest
+
+
+class _DummySpider:
+    name = "dummy"
+
+
+class _TrustedSpider:
+    name = "trusted"
+    trusted_items = True
+
+
+def _item(**overrides) -> dict:
+    item = {
+        "source": "remoteok",
+        "external_id": "ext-1",
+        "source_url": "https://example.com/jobs/1",
+        "title": "Backend Engineer",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_validates_once_and_downstream_reuses_model():
+    out = ValidationPipeline().process_item(_item(), _DummySpider())
+    assert isinstance(out, JobIngest)
+    assert isinstance(out.source_url, HttpUrl)
+    assert as_job_ingest(out) is out
+
+
+def test_trusted_spider_skips_validation():
+    out = ValidationPipeline().process_item(_item(), _TrustedSpider())
+    assert isinstance(out, JobIngest)
+    assert out.source_url == "https://example.com/jobs/1"
+
+
+@pytest.mark.parametrize(
+    ("overrides", "field"),
+    [
+        ({"title": None}, "title"),
+        ({"external_id": None}, "external_id"),
+        ({"source_url": "/jobs/1"}, "source_url"),
+    ],
+)
+def test_trusted_spider_still_requires_key_fields(overrides, field):
+    counter = m.INGEST_INVALID_ITEMS.labels(source="remoteok", field=field)
+    before = counter._value.get()
+    with pytest.raises(DropItem):
+        ValidationPipeline().process_item(_item(**overrides), _TrustedSpider())
+    assert counter._value.get() == before + 1
+
+
+def test_seniority_keeps_raw_value_and_exposes_level():
+    for spider in (_DummySpider(), _TrustedSpider()):
+        out = ValidationPipeline().process_item(_item(seniority="Sr."), spider)
+        assert (out.seniority, out.seniority_level) == ("Sr.", "senior")
+
+
+def test_invalid_item_is_dropped_and_counted_per_field():
+    counter = m.INGEST_INVALID_ITEMS.labels(source="remoteok", field="currency")
+    before = counter._value.get()
+    with pytest.raises(DropItem):
+        ValidationPipeline().process_item(_item(currency="REAL"), _DummySpider())
+    assert counter._value.get() == before + 1